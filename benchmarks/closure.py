@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark for inspector closures (``children()`` and ``parents()``).
+
+Compare the legacy list based walk against the current one, with and without
+the memoized closure cache, on synthetic graphs.
+"""
+from graphs import synthetic_inspector, timeit
+
+from boussole.exceptions import CircularImport
+
+
+def legacy_closure(dependencies_map, sourcepath):
+    """
+    Former implementation where visited nodes were stored in a list.
+    """
+    collected = set([])
+    collected.update(dependencies_map.get(sourcepath, []))
+    sequence = collected.copy()
+    walkthrough = []
+
+    while sequence:
+        item = sequence.pop()
+        walkthrough.append(item)
+        current_item_dependancies = dependencies_map.get(item, [])
+
+        for dependency in current_item_dependancies:
+            if dependency in walkthrough:
+                continue
+            collected.add(dependency)
+            sequence.add(dependency)
+
+        if sourcepath in walkthrough:
+            raise CircularImport(current_item_dependancies)
+
+    return collected
+
+
+def run(size, queries=200):
+    inspector, paths = synthetic_inspector(size)
+    cached, paths = synthetic_inspector(size)
+    cached.closure_cache = True
+
+    # Query the most imported partials, this is the watcher common case
+    sample = paths[:queries]
+
+    # Legacy maps were plain dictionnaries
+    for name, legacy_map in (
+        ("parents", dict(inspector._PARENTS_MAP.items())),
+        ("children", dict(inspector._CHILDREN_MAP.items())),
+    ):
+        if name == "children":
+            sample = paths[-queries:]
+
+        method = getattr(inspector, name)
+        cached_method = getattr(cached, name)
+
+        # Legacy is quadratic, only measure a few queries on large graphs
+        legacy_sample = sample[:3]
+        legacy = timeit(
+            lambda: [legacy_closure(legacy_map, p) for p in legacy_sample],
+            repeat=1,
+        ) / len(legacy_sample)
+        current = timeit(lambda: [method(p) for p in sample]) / len(sample)
+        memoized = timeit(
+            lambda: [cached_method(p) for p in sample]
+        ) / len(sample)
+
+        print(
+            "{:>6} nodes {:>8}: legacy {:>9.3f}ms  current {:>8.3f}ms  "
+            "memoized {:>8.3f}ms".format(
+                size, name, legacy * 1000, current * 1000, memoized * 1000
+            )
+        )
+
+
+if __name__ == "__main__":
+    for size in (1000, 10000):
+        run(size)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Common helpers for benchmarks.
+
+Benchmarks are plain scripts to run from the project directory, like: ::
+
+    python benchmarks/closure.py
+"""
+import os
+import random
+import sys
+import time
+
+# Allow to run benchmarks without installing package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boussole.inspector import ScssInspector  # noqa: E402
+
+
+def synthetic_inspector(size, entrypoints_ratio=0.05, imports=3, seed=42,
+                        inspector=None):
+    """
+    Build an inspector with synthetic maps, without any file.
+
+    Graph is acyclic, every node only imports nodes with a lower index. The
+    last nodes are entrypoints which are not imported by any node.
+
+    Args:
+        size (int): Number of nodes.
+
+    Keyword Arguments:
+        entrypoints_ratio (float): Ratio of nodes which are entrypoints.
+        imports (int): Maximum number of imports for each node.
+        seed (int): Random seed so graphs are reproducible.
+        inspector (boussole.inspector.ScssInspector): Inspector to fill, a
+            new one is created if not given.
+
+    Returns:
+        tuple: Inspector and the list of node paths, the entrypoints are at
+        the end of list.
+    """
+    rand = random.Random(seed)
+    inspector = inspector or ScssInspector()
+
+    paths = [
+        "/project/scss/{}/_node{}.scss".format(i % 50, i) for i in range(size)
+    ]
+    first_entrypoint = size - max(1, int(size * entrypoints_ratio))
+    for i in range(first_entrypoint, size):
+        paths[i] = "/project/scss/main{}.scss".format(i)
+
+    for i, path in enumerate(paths):
+        if i == 0:
+            children = []
+        else:
+            # Entrypoints import only partials
+            upper = min(i, first_entrypoint)
+            children = sorted(set(
+                paths[rand.randrange(upper)]
+                for _ in range(rand.randint(1, imports))
+            ))
+
+        inspector._set_children(path, children)
+
+    inspector._ROOTS.update(paths[first_entrypoint:])
+
+    return inspector, paths
+
+
+def timeit(func, repeat=3):
+    """
+    Return the best duration in seconds from some runs of a function.
+    """
+    durations = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark for inspector graph memory.
+
+Compare the legacy maps (dictionnaries of path lists and path sets) against
+the interned graph on a synthetic graph. Resolver returns a new path string
+for each resolved import, so paths are built again for each relation as it
+occurs during an inspection.
+"""
+import gc
+import random
+import tracemalloc
+
+from collections import defaultdict
+
+from graphs import ScssInspector
+
+
+def synthetic_relations(size, imports=3, seed=42):
+    """
+    Return children indexes for each node, see ``graphs.synthetic_inspector``.
+    """
+    rand = random.Random(seed)
+
+    return [
+        sorted(set(rand.randrange(i) for _ in range(rand.randint(1, imports))))
+        if i else []
+        for i in range(size)
+    ]
+
+
+def node_path(i):
+    return "/project/scss/{}/_node{}.scss".format(i % 50, i)
+
+
+def build_legacy(relations):
+    children_map = {}
+    parents_map = defaultdict(set)
+
+    for i, indexes in enumerate(relations):
+        path = node_path(i)
+        children = [node_path(k) for k in indexes]
+        children_map[path] = children
+        for child in children:
+            parents_map[child].add(path)
+
+    return children_map, parents_map
+
+
+def build_interned(relations):
+    inspector = ScssInspector()
+
+    for i, indexes in enumerate(relations):
+        inspector._set_children(node_path(i), [node_path(k) for k in indexes])
+
+    return inspector
+
+
+def measure(func, *args):
+    """
+    Return the memory in bytes still allocated by the result of a function.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+
+    return current
+
+
+def run(size):
+    relations = synthetic_relations(size)
+
+    legacy = measure(build_legacy, relations)
+    interned = measure(build_interned, relations)
+
+    print(
+        "{:>6} nodes: legacy {:>8.2f}MB  interned {:>8.2f}MB  "
+        "({:.0f}% less)".format(
+            size, legacy / 1048576, interned / 1048576,
+            100 * (1 - interned / legacy)
+        )
+    )
+
+
+if __name__ == "__main__":
+    for size in (1000, 50000):
+        run(size)
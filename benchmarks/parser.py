@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark for import rules parser.
+
+Compare the legacy parser (comments removal then import rules regex) against
+the single pass scanner, in MB/s. Content without any import rule is measured
+also since scanner skips it with a cheap keyword check.
+
+Content is a synthetic vendor like stylesheet, mostly made of comments,
+declarations, strings and urls with a few import rules. Real files can be
+given as arguments instead, like Bootstrap or Foundation sources: ::
+
+    python benchmarks/parser.py node_modules/bootstrap/scss/*.scss
+"""
+import io
+import sys
+
+from graphs import timeit
+
+from boussole.parser import ScssImportsParser
+
+
+VENDOR_CHUNK = """// Buttons
+//
+// Base styles for buttons, see http://example.com/docs/buttons
+
+/*
+ * Some vendors start components with a long license or documentation comment
+ * where @import "nope"; could appear in an example.
+ */
+@import "functions", "variables";
+@import 'mixins/breakpoints';
+
+.btn-{index} {{
+  display: inline-block;
+  font-family: $btn-font-family;
+  background-image: url("data:image/svg+xml,%3csvg xmlns='http://www.w3.org'/%3e");
+  background: url(//cdn.example.com/img/{index}.png) no-repeat;
+  content: "\\201C";
+  @include transition($btn-transition);
+
+  &:hover {{
+    color: darken($body-color, 10%); // Hover color
+    text-decoration: none;
+  }}
+
+  @each $color, $value in $theme-colors {{
+    &-#{{$color}} {{
+      @include button-variant($value, $value);
+    }}
+  }}
+}}
+
+"""
+
+
+def legacy_parse(parser, content):
+    """
+    Former implementation which removed comments before searching for rules.
+    """
+    declarations = parser.REGEX_IMPORT_RULE.findall(
+        parser.remove_comments(content)
+    )
+    return parser.flatten_rules(declarations)
+
+
+def synthetic_content(size):
+    """
+    Build a synthetic vendor stylesheet.
+
+    Args:
+        size (int): Approximative content size in bytes.
+
+    Returns:
+        str: Content.
+    """
+    chunks = []
+    length = 0
+    index = 0
+    while length < size:
+        chunk = VENDOR_CHUNK.format(index=index)
+        chunks.append(chunk)
+        length += len(chunk)
+        index += 1
+
+    return "".join(chunks)
+
+
+def run(name, content):
+    parser = ScssImportsParser()
+    megabytes = len(content.encode("utf-8")) / (1024 * 1024)
+
+    legacy = timeit(lambda: legacy_parse(parser, content))
+    current = timeit(lambda: parser.parse(content))
+
+    print(
+        "{:<30} {:>7.2f}MB: legacy {:>8.2f}MB/s  scanner {:>8.2f}MB/s".format(
+            name[-30:], megabytes, megabytes / legacy, megabytes / current
+        )
+    )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:]:
+        for path in sys.argv[1:]:
+            with io.open(path, "r", encoding="utf-8") as fp:
+                run(path, fp.read())
+    else:
+        for size in (100 * 1024, 5 * 1024 * 1024):
+            run("synthetic", synthetic_content(size))
+
+        # Like variables or mixins partials, they take the fast path
+        content = synthetic_content(5 * 1024 * 1024)
+        run("synthetic without imports", content.replace("@import", "@use"))
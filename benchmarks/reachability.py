@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark for affected entrypoints queries.
+
+Compare the reachability index against repeated ``parents()`` calls to find
+entrypoints affected by many changed partials at once, on synthetic graphs.
+"""
+from graphs import synthetic_inspector, timeit
+
+from boussole.reachability import ReachabilityIndex
+
+
+def from_parents(inspector, entrypoints, paths):
+    """
+    Union of parents for every changed sources, restricted to entrypoints.
+    """
+    affected = set()
+    for path in paths:
+        affected.update(inspector.parents(path))
+        affected.add(path)
+
+    return affected & entrypoints
+
+
+def run(size, changes=50):
+    inspector, paths = synthetic_inspector(size)
+    entrypoints = set(inspector._ROOTS)
+
+    # The most imported partials
+    sample = paths[:changes]
+
+    index = ReachabilityIndex(inspector)
+    build = timeit(index.build)
+
+    assert index.affected(sample) == from_parents(inspector, entrypoints, sample)
+
+    parents = timeit(lambda: from_parents(inspector, entrypoints, sample))
+    bitsets = timeit(lambda: index.affected(sample), repeat=10)
+
+    print(
+        "{:>6} nodes, {} changes: parents {:>9.3f}ms  bitsets {:>9.3f}ms  "
+        "(index build {:>8.3f}ms)".format(
+            size, changes, parents * 1000, bitsets * 1000, build * 1000
+        )
+    )
+
+
+if __name__ == "__main__":
+    for size in (1000, 20000):
+        run(size)
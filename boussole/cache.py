@@ -0,0 +1,795 @@
+# -*- coding: utf-8 -*-
+"""
+Caches
+======
+
+Caches are used to avoid doing again some costly operations on files that have
+not changed.
+
+Cached items are validated against a file fingerprint made of its last
+modification time (in nanoseconds) and its size, so an unchanged file is never
+read again.
+
+Persistent caches are stored in a cache directory which is either the path
+from environment variable ``BOUSSOLE_CACHE_DIR`` if set, else a ``boussole``
+directory in the user cache directory (``XDG_CACHE_HOME`` or ``~/.cache``).
+
+Compile cache is different since its entries are compiled outputs addressed by
+the digest of everything they are built from, so it can be shared between
+projects, checkouts and builds.
+"""
+import io
+import json
+import os
+import shutil
+
+from collections import OrderedDict
+from hashlib import blake2b
+
+import sass
+
+from .exceptions import BoussoleBaseException
+from .finder import CONTENT_HASH
+
+
+def get_cache_dir():
+    """
+    Return the directory path where to store persistent caches.
+
+    Returns:
+        str: Cache directory path. It may not exist yet.
+    """
+    if os.environ.get("BOUSSOLE_CACHE_DIR"):
+        return os.path.abspath(
+            os.path.expanduser(os.environ["BOUSSOLE_CACHE_DIR"])
+        )
+
+    basedir = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+
+    return os.path.join(os.path.abspath(os.path.expanduser(basedir)),
+                        "boussole")
+
+
+def write_json(filepath, content):
+    """
+    Write content as JSON to a file.
+
+    File is written to a temporary file then moved to its final path, so
+    another process never read a partially written file.
+
+    Args:
+        filepath (str): File path.
+        content (object): JSON serializable content.
+    """
+    directory = os.path.dirname(filepath)
+
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    tmp_path = "{}.{}.tmp".format(filepath, os.getpid())
+    with io.open(tmp_path, "w", encoding="utf-8") as fp:
+        fp.write(json.dumps(content))
+
+    os.replace(tmp_path, filepath)
+
+
+def read_json(filepath, version):
+    """
+    Read content from a JSON file written with ``write_json()``.
+
+    Args:
+        filepath (str): File path.
+        version (int): Expected format version, from item ``version``.
+
+    Returns:
+        dict or None: File content, ``None`` if file is unreadable, invalid
+        or has not the expected version.
+    """
+    try:
+        with io.open(filepath, "r", encoding="utf-8") as fp:
+            content = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(content, dict) or content.get("version") != version:
+        return None
+
+    return content
+
+
+def file_fingerprint(path):
+    """
+    Return a fingerprint for a file.
+
+    Args:
+        path (str): File path.
+
+    Raises:
+        OSError: If file does not exist or is not readable.
+
+    Returns:
+        list: A list of file modification time in nanoseconds and file size.
+    """
+    stat = os.stat(path)
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class ParseCache(object):
+    """
+    Cache for import rules parsed from sources.
+
+    Cache entries are indexed on file paths and validated against file
+    fingerprint. When cache is full, the least recently used entries are
+    evicted.
+
+    Keyword Arguments:
+        filepath (str): Path to the file where to persist cache. If empty,
+            cache is only stored in memory and ``load()`` and ``save()`` do
+            nothing.
+        maxsize (int): Maximum number of entries to keep.
+
+    Attributes:
+        FILENAME (str): Default filename to use in cache directory.
+        VERSION (int): Cache format version. A stored cache with a different
+            version is ignored.
+        hits (int): Number of requested entries which were available.
+        misses (int): Number of requested entries which were missing or
+            outdated.
+    """
+    FILENAME = "parse-cache.json"
+    VERSION = 2
+
+    def __init__(self, filepath=None, maxsize=20000):
+        self.filepath = filepath
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path, fingerprint):
+        """
+        Get cached rules for a file.
+
+        Args:
+            path (str): File path.
+            fingerprint (list): Current file fingerprint, see
+                ``file_fingerprint()``.
+
+        Returns:
+            list or None: Cached rules if any and still valid, else ``None``.
+        """
+        entry = self._entries.get(path)
+
+        if entry is None or entry[0] != fingerprint:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(path)
+        self.hits += 1
+
+        return list(entry[1])
+
+    def peek(self, path):
+        """
+        Get fingerprint of cached rules for a file, without updating
+        counters or entries order.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            list or None: Cached fingerprint if any, else ``None``.
+        """
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+
+        return list(entry[0])
+
+    def set(self, path, fingerprint, rules):
+        """
+        Store rules for a file.
+
+        Args:
+            path (str): File path.
+            fingerprint (list): File fingerprint when it has been parsed.
+            rules (list): Parsed rules.
+        """
+        self._entries[path] = (list(fingerprint), list(rules))
+        self._entries.move_to_end(path)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, path):
+        """
+        Remove cached rules for a file if any.
+
+        Args:
+            path (str): File path.
+        """
+        self._entries.pop(path, None)
+
+    def clear(self):
+        """
+        Remove every entries and reset counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        Returns:
+            dict: Entries count, hits and misses counters.
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def load(self):
+        """
+        Load entries from cache file.
+
+        An unreadable or invalid cache file is silently ignored.
+        """
+        if not self.filepath:
+            return
+
+        content = read_json(self.filepath, self.VERSION)
+        if content is None:
+            return
+
+        # Stored entries are ordered from the least to the most recently used
+        for path, fingerprint, rules in content.get("entries", []):
+            self.set(path, fingerprint, rules)
+
+    def save(self):
+        """
+        Write entries to cache file.
+
+        File is written to a temporary file then moved to its final path, so
+        another process never read a partially written cache.
+        """
+        if not self.filepath:
+            return
+
+        write_json(self.filepath, {
+            "version": self.VERSION,
+            "entries": [
+                [path, fingerprint, rules]
+                for path, (fingerprint, rules) in self._entries.items()
+            ],
+        })
+
+
+class GraphSnapshot(object):
+    """
+    Snapshot of an inspector graph, so it can be restored on startup instead
+    of inspecting every sources again.
+
+    Snapshot stores relations between sources with the fingerprint of each
+    inspected source and a digest of each directory listed by resolver. On
+    restore, only sources which have changed are resolved again. Since a
+    new or removed file may change how any import rule is resolved, snapshot
+    is not restored at all if any listed directory has changed.
+
+    Inspector must have its directory listing cache enabled, directories
+    would be unknown else.
+
+    Keyword Arguments:
+        filepath (str): Path to the snapshot file. If empty, ``restore()`` and
+            ``save()`` do nothing.
+
+    Attributes:
+        VERSION (int): Snapshot format version. A stored snapshot with a
+            different version is ignored.
+        revalidated (int): Number of sources which have been resolved again
+            from the last restore.
+    """
+    VERSION = 1
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self.revalidated = 0
+
+    @staticmethod
+    def get_filename(key):
+        """
+        Return a snapshot filename for a project.
+
+        Args:
+            key (str): Project identifier, like its sources directory path.
+
+        Returns:
+            str: Filename to use in cache directory.
+        """
+        digest = blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+        return "graph-{}.json".format(digest)
+
+    def listing_digest(self, inspector, path):
+        """
+        Compute digest of a directory listing.
+
+        Args:
+            inspector (boussole.inspector.ScssInspector): Inspector to list
+                directory with, listing is taken from its cache if any.
+            path (str): Directory path.
+
+        Returns:
+            str: Hexadecimal digest.
+        """
+        names = "\n".join(sorted(inspector.get_directory_listing(path)))
+
+        return blake2b(names.encode("utf-8"), digest_size=16).hexdigest()
+
+    def capture(self, inspector, library_paths=None):
+        """
+        Build snapshot content from an inspector.
+
+        Source fingerprints are taken from inspector parse cache if any, so
+        they are the ones from when sources have been parsed.
+
+        Args:
+            inspector (boussole.inspector.ScssInspector): Inspector to
+                capture.
+
+        Keyword Arguments:
+            library_paths (list): Library paths inspector has been used with.
+
+        Returns:
+            dict or None: Snapshot content, ``None`` if inspector does not
+            have its directory listing cache enabled.
+        """
+        if not inspector.DIRECTORY_LISTING_CACHE:
+            return None
+
+        graph = inspector._GRAPH
+        # Nodes which have been dropped from relations are not stored, so
+        # remaining ones get new IDs
+        nodes = [
+            node for node in range(len(graph.paths))
+            if graph.children[node] is not None or
+            graph.parents[node] is not None
+        ]
+        ids = dict((node, i) for i, node in enumerate(nodes))
+
+        paths = []
+        children = []
+        fingerprints = []
+        for node in nodes:
+            path = graph.paths[node]
+            row = graph.children[node]
+            paths.append(path)
+            children.append([ids[i] for i in row] if row is not None else None)
+
+            fingerprint = None
+            if row is not None:
+                if inspector.cache is not None:
+                    fingerprint = inspector.cache.peek(path)
+                if fingerprint is None:
+                    try:
+                        fingerprint = file_fingerprint(path)
+                    except OSError:
+                        pass
+            fingerprints.append(fingerprint)
+
+        return {
+            "version": self.VERSION,
+            "library_paths": list(library_paths or []),
+            "roots": sorted(inspector._ROOTS),
+            "paths": paths,
+            "children": children,
+            "fingerprints": fingerprints,
+            "directories": dict(
+                (path, self.listing_digest(inspector, path))
+                for path in sorted(inspector._LISTED_DIRECTORIES or [])
+            ),
+        }
+
+    def save(self, inspector, library_paths=None):
+        """
+        Write snapshot of an inspector to snapshot file.
+
+        Args:
+            inspector (boussole.inspector.ScssInspector): Inspector to
+                capture.
+
+        Keyword Arguments:
+            library_paths (list): Library paths inspector has been used with.
+
+        Returns:
+            bool: True if snapshot has been written.
+        """
+        if not self.filepath:
+            return False
+
+        content = self.capture(inspector, library_paths=library_paths)
+        if content is None:
+            return False
+
+        write_json(self.filepath, content)
+
+        return True
+
+    def restore(self, inspector, library_paths=None):
+        """
+        Reset inspector then fill it from snapshot file.
+
+        Sources which have changed since snapshot are patched with
+        ``update_source()`` and removed sources with ``remove_source()``.
+        If an error occurs during these patches, inspector is reset so the
+        caller can inspect everything to get the error again.
+
+        Args:
+            inspector (boussole.inspector.ScssInspector): Inspector to
+                fill.
+
+        Keyword Arguments:
+            library_paths (list): Library paths to use with inspector.
+                Snapshot is not restored if it has been captured with
+                different ones.
+
+        Returns:
+            bool: True if snapshot has been restored.
+        """
+        self.revalidated = 0
+        inspector.reset()
+
+        if not self.filepath or not inspector.DIRECTORY_LISTING_CACHE:
+            return False
+
+        content = read_json(self.filepath, self.VERSION)
+        if (
+            content is None or
+            content.get("library_paths") != list(library_paths or [])
+        ):
+            return False
+
+        # Listings are computed in inspector cache, so resolving from
+        # revalidated sources won't list directories again
+        for path, digest in content["directories"].items():
+            if self.listing_digest(inspector, path) != digest:
+                inspector.reset()
+                return False
+
+        paths = content["paths"]
+        inspector.restore(paths, content["children"], content["roots"])
+
+        changed = []
+        removed = []
+        for path, row, fingerprint in zip(paths, content["children"],
+                                          content["fingerprints"]):
+            if row is None:
+                continue
+
+            try:
+                if file_fingerprint(path) != fingerprint:
+                    changed.append(path)
+            except OSError:
+                removed.append(path)
+
+        try:
+            for path in removed:
+                inspector.remove_source(path, library_paths=library_paths)
+
+            for path in changed:
+                if path in inspector._CHILDREN_MAP:
+                    inspector.update_source(path, library_paths=library_paths)
+
+            # Roots which could not be inspected before snapshot
+            inspector.inspect(*[
+                path for path in sorted(inspector._ROOTS)
+                if path not in inspector._CHILDREN_MAP
+            ], library_paths=library_paths)
+        except (BoussoleBaseException, OSError):
+            inspector.reset()
+            return False
+
+        self.revalidated = len(changed) + len(removed)
+
+        return True
+
+
+class CompileCache(object):
+    """
+    Content addressed cache for compiled outputs.
+
+    An entry key is a digest of the content of a source and every files it
+    imports, the compile relevant settings and the libsass version. Paths
+    are relative to the source directory, so the same sources in another
+    checkout give the same key.
+
+    Entries are files in cache directory whose modification time is updated
+    on each use. When cache is over its maximum size, the least recently used
+    entries are removed on ``save()``.
+
+    Keyword Arguments:
+        inspector (boussole.inspector.ScssInspector): Inspector to resolve
+            import closures, required to compute keys.
+        directory (str): Cache directory path. Default to a ``compile``
+            directory in cache directory from ``get_cache_dir()``.
+        max_size (int): Maximum size of entries in bytes.
+
+    Attributes:
+        VERSION (int): Entry format version. An entry with a different version
+            is ignored.
+        hits (int): Number of requested entries which were available since
+            last save.
+        misses (int): Number of requested entries which were missing since
+            last save.
+    """
+    DIRNAME = "compile"
+    STATS_FILENAME = "stats.json"
+    VERSION = 1
+    MAX_SIZE = 512 * 1024 * 1024
+
+    def __init__(self, inspector=None, directory=None, max_size=None):
+        self.inspector = inspector
+        self.directory = directory or os.path.join(get_cache_dir(),
+                                                   self.DIRNAME)
+        self.max_size = max_size or self.MAX_SIZE
+        self.hits = 0
+        self.misses = 0
+        self._digests = {}
+
+    def file_digest(self, path):
+        """
+        Compute digest of a file content.
+
+        Digest is memoized until file fingerprint changes.
+
+        Args:
+            path (str): File path.
+
+        Raises:
+            OSError: If file does not exist or is not readable.
+
+        Returns:
+            str: Hexadecimal digest.
+        """
+        fingerprint = file_fingerprint(path)
+
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        with io.open(path, "rb") as fp:
+            digest = blake2b(fp.read(), digest_size=16).hexdigest()
+
+        self._digests[path] = (fingerprint, digest)
+
+        return digest
+
+    def get_key(self, settings, sourcepath, destination):
+        """
+        Compute entry key for a source.
+
+        Args:
+            settings (boussole.conf.model.Settings): Project settings.
+            sourcepath (str): Source file path.
+            destination (str): Destination path for compiled CSS, its path
+                relative to source is used in source map.
+
+        Returns:
+            str or None: Hexadecimal key or ``None`` if source closure could
+            not be resolved, so source can not be cached.
+        """
+        try:
+            self.inspector.inspect(
+                sourcepath,
+                library_paths=settings.LIBRARY_PATHS
+            )
+            closure = self.inspector.children(sourcepath)
+            basedir = os.path.dirname(sourcepath)
+            files = sorted(
+                [os.path.relpath(path, basedir), self.file_digest(path)]
+                for path in [sourcepath] + list(closure)
+            )
+        except (BoussoleBaseException, OSError):
+            return None
+
+        payload = json.dumps({
+            "OUTPUT_STYLES": settings.OUTPUT_STYLES,
+            "SOURCE_COMMENTS": settings.SOURCE_COMMENTS,
+            "SOURCE_MAP": settings.SOURCE_MAP,
+            "LIBRARY_PATHS": [os.path.relpath(path, basedir)
+                              for path in settings.LIBRARY_PATHS],
+            "libsass": sass.__version__,
+            # Source comments contain absolute source paths
+            "basedir": basedir if settings.SOURCE_COMMENTS else None,
+            "destination": os.path.relpath(destination, basedir),
+            # Outputs refer to each other with hashed filenames
+            "content_hash": settings.HASH_SUFFIX == CONTENT_HASH,
+            "files": files,
+        }, sort_keys=True)
+
+        return blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+    def get_path(self, key):
+        """
+        Return file path of an entry.
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            str: Entry file path.
+        """
+        return os.path.join(self.directory, key[:2], "{}.json".format(key))
+
+    def get(self, key):
+        """
+        Return outputs of an entry.
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            tuple or None: Compiled CSS and source map (which may be
+            ``None``), or ``None`` if entry is missing.
+        """
+        path = self.get_path(key)
+
+        content = read_json(path, self.VERSION)
+        if content is None:
+            self.misses += 1
+            return None
+
+        # Mark entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+
+        return content["content"], content["sourcemap"]
+
+    def set(self, key, content, sourcemap=None):
+        """
+        Store outputs of an entry.
+
+        Args:
+            key (str): Entry key.
+            content (str): Compiled CSS.
+
+        Keyword Arguments:
+            sourcemap (str): Source map content if any.
+        """
+        write_json(self.get_path(key), {
+            "version": self.VERSION,
+            "content": content,
+            "sourcemap": sourcemap,
+        })
+
+    def entries(self):
+        """
+        List stored entries.
+
+        Returns:
+            list: Tuples of (modification time, size, path) for each entry
+            file, from the least to the most recently used.
+        """
+        entries = []
+
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+
+        for name in names:
+            subdirectory = os.path.join(self.directory, name)
+            if not os.path.isdir(subdirectory):
+                continue
+
+            for filename in os.listdir(subdirectory):
+                if not filename.endswith(".json"):
+                    continue
+
+                path = os.path.join(subdirectory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        return sorted(entries)
+
+    def evict(self):
+        """
+        Remove the least recently used entries until cache is under its
+        maximum size.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        entries = self.entries()
+        size = sum(item[1] for item in entries)
+
+        removed = 0
+        for mtime, filesize, path in entries:
+            if size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            size -= filesize
+            removed += 1
+
+        return removed
+
+    def read_stats(self):
+        """
+        Read counters stored by previous saves.
+
+        Returns:
+            dict: Hits and misses counters.
+        """
+        content = read_json(os.path.join(self.directory, self.STATS_FILENAME),
+                            self.VERSION) or {}
+
+        return {
+            "hits": content.get("hits", 0),
+            "misses": content.get("misses", 0),
+        }
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        Returns:
+            dict: Entries count, entries size in bytes, maximum size and the
+            hits and misses counters from every builds.
+        """
+        entries = self.entries()
+        counters = self.read_stats()
+
+        return {
+            "entries": len(entries),
+            "size": sum(item[1] for item in entries),
+            "max_size": self.max_size,
+            "hits": counters["hits"] + self.hits,
+            "misses": counters["misses"] + self.misses,
+        }
+
+    def save(self):
+        """
+        Evict entries over maximum size and add counters to stored ones.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        removed = self.evict()
+
+        counters = self.read_stats()
+        write_json(os.path.join(self.directory, self.STATS_FILENAME), {
+            "version": self.VERSION,
+            "hits": counters["hits"] + self.hits,
+            "misses": counters["misses"] + self.misses,
+        })
+        self.hits = 0
+        self.misses = 0
+
+        return removed
+
+    def clear(self):
+        """
+        Remove every entries and counters.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import click
+import logging
+
+from ..cache import CompileCache
+
+
+@click.command(
+    "cache",
+    short_help="Show or clear compile cache."
+)
+@click.option(
+    "--clear",
+    is_flag=True,
+    help="Remove every compile cache entries and statistics."
+)
+@click.pass_context
+def cache_command(context, clear):
+    """
+    Show statistics of compile cache from the Boussole cache directory.
+    """
+    logger = logging.getLogger("boussole")
+
+    compile_cache = CompileCache()
+
+    if clear:
+        compile_cache.clear()
+        logger.info("Compile cache cleared: {}".format(compile_cache.directory))
+        return
+
+    stats = compile_cache.stats()
+    requests = stats["hits"] + stats["misses"]
+
+    logger.info("Directory: {}".format(compile_cache.directory))
+    logger.info("Entries: {}".format(stats["entries"]))
+    logger.info("Size: {:.1f} MB".format(stats["size"] / (1024 * 1024)))
+    logger.info("Hits: {}".format(stats["hits"]))
+    logger.info("Misses: {}".format(stats["misses"]))
+    if requests:
+        logger.info("Hit rate: {:.1%}".format(stats["hits"] / requests))
@@ -3,12 +3,15 @@ import click
 import logging
 import os
 
+from ..cache import CompileCache, GraphSnapshot, ParseCache, get_cache_dir
 from ..compiler import SassCompileHelper
 from ..conf.discovery import Discover
 from ..conf.json_backend import SettingsBackendJson
 from ..conf.yaml_backend import SettingsBackendYaml
 from ..exceptions import BoussoleBaseException
-from ..finder import ScssFinder
+from ..finder import CONTENT_HASH, ScssFinder
+from ..inspector import ScssInspector
+from ..manifest import AssetManifest, BuildManifest
 from ..project import ProjectBase
 
 
@@ -30,8 +33,65 @@ from ..project import ProjectBase
     help="Path to a Boussole config file",
     type=click.Path(exists=True)
 )
+@click.option(
+    "--jobs",
+    default=None,
+    metavar="INTEGER",
+    type=click.IntRange(min=1),
+    help=(
+        "Number of processes to use to compile sources in parallel. Default "
+        "to setting 'JOBS' if any, else to the number of available CPUs."
+    )
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=(
+        "Only compile sources which have changed since the previous "
+        "incremental build, from a manifest stored in the target directory."
+    )
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help=(
+        "Ignore the previous incremental build manifest and compile every "
+        "source. It implies option '--incremental'."
+    )
+)
+@click.option(
+    "--inspect-workers",
+    default=None,
+    metavar="INTEGER",
+    type=click.IntRange(min=1),
+    help=(
+        "Number of threads to read and parse sources in parallel when "
+        "inspecting their imports for options '--incremental' and '--cache'. "
+        "Default to a sequential inspection."
+    )
+)
+@click.option(
+    "--cache",
+    is_flag=True,
+    help=(
+        "Take outputs of sources which have already been compiled from a "
+        "compile cache in the Boussole cache directory, it can be shared "
+        "between projects and checkouts."
+    )
+)
+@click.option(
+    "--cache-size",
+    default=512,
+    metavar="INTEGER",
+    type=click.IntRange(min=1),
+    help=(
+        "Maximum size of compile cache in megabytes, the least recently used "
+        "outputs are removed when it is exceeded. Default to 512."
+    )
+)
 @click.pass_context
-def compile_command(context, backend, config):
+def compile_command(context, backend, config, jobs, incremental, force,
+                    inspect_workers, cache, cache_size):
     """
     Compile Sass project sources to CSS
     """
@@ -75,20 +135,115 @@ def compile_command(context, backend, config):
         logger.error(str(e))
         raise click.Abort()
 
-    # Build all compilable stylesheets
+    # With content hash, filenames are only known after compile so they are
+    # published in a manifest
+    assets = None
+    hash_content = settings.HASH_SUFFIX == CONTENT_HASH
+    if hash_content:
+        assets = AssetManifest(settings)
+        assets.load()
+        assets.prune([dst for src, dst in compilable_files])
+
+    # A forced build is still an incremental one, so its manifest is written
+    # for the next builds
+    incremental = incremental or force
+
+    # In incremental mode, only compile sources that have changed
+    manifest = None
+    inspector = None
+    if incremental:
+        # Restore inspector from previous builds, so only sources which
+        # have changed are inspected again
+        parse_cache = ParseCache(
+            filepath=os.path.join(get_cache_dir(), ParseCache.FILENAME)
+        )
+        parse_cache.load()
+        inspector = ScssInspector(cache=parse_cache, listing_cache=True,
+                                  workers=inspect_workers)
+        snapshot = GraphSnapshot(filepath=os.path.join(
+            get_cache_dir(),
+            GraphSnapshot.get_filename(settings.SOURCES_PATH)
+        ))
+        if snapshot.restore(inspector, library_paths=settings.LIBRARY_PATHS):
+            logger.debug("Graph snapshot restored, {} changed".format(
+                snapshot.revalidated
+            ))
+
+        manifest = BuildManifest(settings, inspector=inspector)
+        if not force:
+            manifest.load()
+        manifest.prune([src for src, dst in compilable_files])
+
+        outdated = []
+        for src, dst in compilable_files:
+            if manifest.is_outdated(src, dst):
+                # Compressed files from another level would be kept if CSS
+                # has not changed
+                manifest.discard_compressed(src)
+                outdated.append((src, dst))
+            else:
+                logger.debug("Unchanged: {}".format(src))
+        compilable_files = outdated
+
+    if jobs is None:
+        jobs = settings.JOBS or os.cpu_count() or 1
+
+    compile_cache = None
+    if cache:
+        compile_cache = CompileCache(
+            inspector=inspector or ScssInspector(workers=inspect_workers),
+            max_size=cache_size * 1024 * 1024,
+        )
+        logger.debug("Compile cache: {}".format(compile_cache.directory))
+
+    # Build all compilable stylesheets, results are returned in source order
+    # even with parallel compiles
     compiler = SassCompileHelper()
     errors = 0
-    for src, dst in compilable_files:
+    compiled = compiler.compile_many(settings, compilable_files, jobs=jobs,
+                                     cache=compile_cache,
+                                     hash_content=hash_content)
+    for src, dst, success, message, unchanged in compiled:
         logger.debug("Compile: {}".format(src))
 
         output_opts = {}
-        success, message = compiler.safe_compile(settings, src, dst)
 
         if success:
-            logger.info("Output: {}".format(message), **output_opts)
+            if unchanged:
+                logger.info("Unchanged: {}".format(message), **output_opts)
+            else:
+                logger.info("Output: {}".format(message), **output_opts)
+            if manifest:
+                manifest.update(src, dst, output=message)
+            if assets:
+                assets.update(dst, message)
         else:
             errors += 1
             logger.error(message)
+            if manifest:
+                manifest.discard(src)
+
+    if compile_cache:
+        logger.debug("Compile cache: {hits} hits, {misses} misses".format(
+            hits=compile_cache.hits,
+            misses=compile_cache.misses,
+        ))
+        try:
+            compile_cache.save()
+        except OSError as e:
+            logger.warning("Unable to save compile cache: {}".format(e))
+
+    if assets:
+        logger.debug("Asset manifest: {}".format(assets.save()))
+
+    if manifest:
+        manifest.save()
+
+        try:
+            parse_cache.save()
+            snapshot.save(inspector, library_paths=settings.LIBRARY_PATHS)
+        except OSError as e:
+            logger.warning("Unable to save inspector caches: {}".format(e))
 
     # Ensure correct exit code if error has occured
     if errors:
@@ -5,6 +5,7 @@ import click
 
 from ..logs import init_logger
 
+from .cache import cache_command
 from .compile import compile_command
 from .startproject import startproject_command
 from .version import version_command
@@ -62,3 +63,4 @@ cli_frontend.add_command(version_command, name="version")
 cli_frontend.add_command(compile_command, name="compile")
 cli_frontend.add_command(watch_command, name="watch")
 cli_frontend.add_command(startproject_command, name="startproject")
+cli_frontend.add_command(cache_command, name="cache")
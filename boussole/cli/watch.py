@@ -7,15 +7,52 @@ import logging
 from watchdog.observers import Observer
 from watchdog.observers.polling import PollingObserver
 
+from ..cache import GraphSnapshot, ParseCache, get_cache_dir
+from ..compiler import compile_pool
 from ..conf.discovery import Discover
 from ..conf.json_backend import SettingsBackendJson
 from ..conf.yaml_backend import SettingsBackendYaml
 from ..exceptions import BoussoleBaseException
+from ..finder import CONTENT_HASH
 from ..inspector import ScssInspector
+from ..manifest import AssetManifest
 from ..project import ProjectBase
+from ..scheduler import CompilePriority, CompileScheduler
 from ..watcher import WatchdogLibraryEventHandler, WatchdogProjectEventHandler
 
 
+def parse_duration(context, param, value):
+    """
+    Click callback to convert a duration to seconds.
+
+    Duration is an integer or float number with an optional unit which can be
+    ``ms`` for milliseconds (the default unit) or ``s`` for seconds, like
+    ``150``, ``150ms`` or ``0.15s``.
+    """
+    if value is None:
+        return 0
+
+    raw = value.strip().lower()
+    multiplier = 0.001
+    if raw.endswith("ms"):
+        raw = raw[:-2]
+    elif raw.endswith("s"):
+        raw = raw[:-1]
+        multiplier = 1
+
+    try:
+        duration = float(raw) * multiplier
+    except ValueError:
+        raise click.BadParameter(
+            "Invalid duration '{}', use something like '150ms'.".format(value)
+        )
+
+    if duration < 0:
+        raise click.BadParameter("Duration can not be negative.")
+
+    return duration
+
+
 @click.command(
     "watch",
     short_help="Watch for change on your Sass project."
@@ -39,8 +76,42 @@ from ..watcher import WatchdogLibraryEventHandler, WatchdogProjectEventHandler
     is_flag=True,
     help="Use Watchdog polling observer"
 )
+@click.option(
+    "--debounce",
+    default=None,
+    metavar="DURATION",
+    callback=parse_duration,
+    help=(
+        "Quiet window to batch events, like '150ms'. Events occurring "
+        "within this window are processed together and involved sources are "
+        "compiled only once. Default to no batching."
+    )
+)
+@click.option(
+    "--jobs",
+    default=None,
+    metavar="INTEGER",
+    type=click.IntRange(min=1),
+    help=(
+        "Number of processes to compile sources in parallel when a change "
+        "involves many sources. Default to setting 'JOBS' if any, else to "
+        "the number of available CPUs."
+    )
+)
+@click.option(
+    "--priority",
+    multiple=True,
+    metavar="PATTERN",
+    help=(
+        "Glob pattern relative to sources directory for entrypoints to "
+        "compile first when a change involves many sources, like "
+        "'pages/home.scss'. Can be used many times, first patterns have "
+        "priority. Other entrypoints are compiled from the most recently "
+        "edited one."
+    )
+)
 @click.pass_context
-def watch_command(context, backend, config, poll):
+def watch_command(context, backend, config, poll, debounce, jobs, priority):
     """
     Watch for change on your Sass project sources then compile them to CSS.
 
@@ -53,6 +124,9 @@ def watch_command(context, backend, config, poll):
     * Move: When a source file is moved in watched dirs. Also occurs with
       editor transition file;
 
+    Editors and VCS commands may trigger many events in a few milliseconds,
+    use "--debounce" to batch them.
+
     Almost all errors occurring during compile won"t break watcher, so you can
     resolve them and watcher will try again to compile once a new event
     occurs.
@@ -94,9 +168,51 @@ def watch_command(context, backend, config, poll):
         "ignore_directories": False,
         "case_sensitive": True,
     }
+    if debounce:
+        logger.debug("Events debounce: {}s".format(debounce))
+
+    # Start compile workers once for all events
+    if jobs is None:
+        jobs = settings.JOBS or os.cpu_count() or 1
+    logger.debug("Compile jobs: {}".format(jobs))
+    executor = compile_pool(jobs)
+
+    # With content hash, filenames are only known after compile so they are
+    # published in a manifest updated on each compile
+    assets = None
+    if settings.HASH_SUFFIX == CONTENT_HASH:
+        assets = AssetManifest(settings)
+        assets.load()
+        logger.debug("Asset manifest: {}".format(assets.filepath))
+
+    # Shared by handlers so a compile from one can supersede a compile from
+    # the other one
+    scheduler = None
+    if executor is not None:
+        scheduler = CompileScheduler(settings, executor, assets=assets)
 
-    # Init inspector instance shared through all handlers
-    inspector = ScssInspector()
+    # Shared by handlers so an entrypoint edited in project still has priority
+    # when a library change involves it
+    if priority:
+        logger.debug("Priority patterns: {}".format(", ".join(priority)))
+    compile_priority = CompilePriority(patterns=priority,
+                                       basedir=settings.SOURCES_PATH)
+
+    # Init inspector instance shared through all handlers, with a persistent
+    # cache for parsed import rules
+    parse_cache = ParseCache(
+        filepath=os.path.join(get_cache_dir(), ParseCache.FILENAME)
+    )
+    parse_cache.load()
+    inspector = ScssInspector(cache=parse_cache, closure_cache=True,
+                              listing_cache=True)
+
+    # Inspector graph from the previous run, to restore it instead of
+    # inspecting every sources
+    snapshot = GraphSnapshot(filepath=os.path.join(
+        get_cache_dir(),
+        GraphSnapshot.get_filename(settings.SOURCES_PATH)
+    ))
 
     if not poll:
         logger.debug("Using Watchdog native platform observer")
@@ -107,11 +223,29 @@ def watch_command(context, backend, config, poll):
 
     # Init event handlers
     project_handler = WatchdogProjectEventHandler(settings, inspector,
+                                                  debounce=debounce,
+                                                  snapshot=snapshot,
+                                                  scheduler=scheduler,
+                                                  assets=assets,
+                                                  priority=compile_priority,
                                                   **watcher_templates_patterns)
 
     lib_handler = WatchdogLibraryEventHandler(settings, inspector,
+                                              debounce=debounce,
+                                              snapshot=snapshot,
+                                              scheduler=scheduler,
+                                              assets=assets,
+                                              priority=compile_priority,
                                               **watcher_templates_patterns)
 
+    # Index project before the first event, errors will be reported again
+    # from the first event
+    try:
+        project_handler.full_index()
+    except (BoussoleBaseException, OSError) as e:
+        logger.debug("Unable to index project: {}".format(e))
+        inspector.reset()
+
     # Observe source directory
     observer.schedule(project_handler, settings.SOURCES_PATH, recursive=True)
 
@@ -131,3 +265,24 @@ def watch_command(context, backend, config, poll):
         observer.stop()
 
     observer.join()
+
+    if executor is not None:
+        scheduler.wait()
+        executor.shutdown()
+        logger.debug("Superseded compiles: {}".format(scheduler.superseded))
+
+    logger.debug("Parse cache: {hits} hits, {misses} misses".format(
+        **parse_cache.stats()
+    ))
+    logger.debug("Sources without imports skipped from parsing: {}".format(
+        inspector.fast_paths
+    ))
+    try:
+        parse_cache.save()
+    except OSError as e:
+        logger.warning("Unable to save parse cache: {}".format(e))
+
+    try:
+        snapshot.save(inspector, library_paths=settings.LIBRARY_PATHS)
+    except OSError as e:
+        logger.warning("Unable to save graph snapshot: {}".format(e))
@@ -7,19 +7,141 @@ Sass compile helper
 
 This is not a real compiler, just an helper wrapping common methods to compile
 a Sass source using `libsass-python`_.
+
+Since libsass holds the GIL for the whole compile, parallel compiles are
+dispatched to a pool of processes and not threads. A long running process like
+the watcher can keep a pool started with ``compile_pool()``.
+
+Compiled CSS can be compressed to sibling files for servers which serve
+precompressed files, with gzip and also brotli if the ``brotli`` module is
+installed.
 """
+import gzip
 import os
 import io
+import re
+
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from itertools import repeat
 
 import sass
 
 from .finder import ScssFinder
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Source map comment ending compiled CSS
+SOURCE_MAP_URL = re.compile(r"/\*# sourceMappingURL=[^*\s]* \*/\s*$")
+
+# Compiled file name in source map
+SOURCE_MAP_FILE = re.compile(r'"file": "[^"]*"')
+
+
+def gzip_compress(data, level):
+    """
+    Compress data with gzip.
+
+    Compressed data does not include any modification time, so the same data
+    allways gives the same result.
+
+    Args:
+        data (bytes): Data to compress.
+        level (int): Compression level from 1 to 9.
+
+    Returns:
+        bytes: Compressed data.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=level,
+                       mtime=0) as fp:
+        fp.write(data)
+
+    return buffer.getvalue()
+
+
+def brotli_compress(data, level):
+    """
+    Compress data with brotli.
+
+    Args:
+        data (bytes): Data to compress.
+        level (int): Compression level from 1 to 9, brotli quality is two
+            more so the highest level is the best quality.
+
+    Returns:
+        bytes: Compressed data.
+    """
+    return brotli.compress(data, quality=level + 2)
+
+
+def get_compressors():
+    """
+    Return available compressions.
+
+    Returns:
+        list: Pairs of (file extension, compress function).
+    """
+    compressors = [("gz", gzip_compress)]
+    if brotli is not None:
+        compressors.append(("br", brotli_compress))
+
+    return compressors
+
+
+def warm_up():
+    """
+    Initializer for compile workers.
+
+    It does nothing itself, but a worker has to import this module (so
+    libsass) to run it.
+    """
+    return True
+
+
+def compile_pool(jobs):
+    """
+    Start a persistent pool of processes to compile sources.
+
+    Every worker is started and has imported libsass before pool is
+    returned, so the first compiles don't have to wait for them. Pool has to
+    be shut down by the caller once it is not needed anymore.
+
+    Args:
+        jobs (int): Number of worker processes.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor or None: Pool to give to
+        ``SassCompileHelper.compile_many()``. It is ``None`` if there is less
+        than two jobs, since compiles are sequential in this case.
+    """
+    if not jobs or jobs < 2:
+        return None
+
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=warm_up)
+
+    # Workers may be started on demand, so give some work to each one
+    for future in [executor.submit(warm_up) for i in range(jobs)]:
+        future.result()
+
+    return executor
+
 
 class SassCompileHelper(ScssFinder):
     """
     Sass compile helper mixin
+
+    Attributes:
+        directories (set): Directories known to exist, so they are not
+            checked again for each written file.
     """
+    def __init__(self):
+        self.directories = set()
+
     def safe_compile(self, settings, sourcepath, destination):
         """
         Safe compile
@@ -44,6 +166,134 @@ class SassCompileHelper(ScssFinder):
               message will contains returned error from libsass, if success
               just the destination path.
         """
+        success, message, unchanged = self.compile_output(settings,
+                                                          sourcepath,
+                                                          destination)
+
+        return success, message
+
+    def compile_output(self, settings, sourcepath, destination,
+                       hash_content=False):
+        """
+        Same as ``safe_compile`` but also tells if outputs have been left
+        unchanged.
+
+        Args:
+            settings (boussole.conf.model.Settings): Project settings.
+            sourcepath (str): Source file path to compile to CSS.
+            destination (str): Destination path for compiled CSS.
+
+        Keyword Arguments:
+            hash_content (bool): If ``True``, outputs are written to paths
+                hashed from their content, see ``hash_outputs()``. Default to
+                ``False``.
+
+        Returns:
+            tuple: A tuple of (success state, message, unchanged state) where
+            unchanged state is ``True`` if setting ``SKIP_UNCHANGED`` is
+            enabled and outputs were already identical to the compiled ones,
+            so nothing has been written. On success, message is the path
+            where CSS has been written.
+        """
+        success, content, sourcemap = self.compile_content(
+            settings,
+            sourcepath,
+            destination
+        )
+        if not success:
+            return False, content, False
+
+        return (True,) + self.write_compiled(settings, destination, content,
+                                             sourcemap=sourcemap,
+                                             hash_content=hash_content)
+
+    def write_compiled(self, settings, destination, content, sourcemap=None,
+                       hash_content=False):
+        """
+        Write compiled outputs to their destination.
+
+        Args:
+            settings (boussole.conf.model.Settings): Project settings.
+            destination (str): Destination path for compiled CSS.
+            content (str): Compiled CSS.
+
+        Keyword Arguments:
+            sourcemap (str): Source map content if any.
+            hash_content (bool): Same as ``compile_output()``.
+
+        Returns:
+            tuple: A tuple of (CSS path, unchanged state), see
+            ``compile_output()``.
+        """
+        if hash_content:
+            destination, content, sourcemap = self.hash_outputs(
+                destination,
+                content,
+                sourcemap=sourcemap
+            )
+
+        written = self.write_outputs(
+            destination,
+            content,
+            sourcemap=sourcemap,
+            skip_unchanged=settings.SKIP_UNCHANGED,
+            compress_level=settings.COMPRESS_LEVEL if settings.COMPRESS else None,
+        )
+
+        return destination, not written
+
+    def hash_outputs(self, destination, content, sourcemap=None):
+        """
+        Add a digest of compiled CSS to output filenames.
+
+        References between CSS and source map are updated to hashed
+        filenames. Since source map comment is ignored from digest, hashing
+        again already hashed outputs gives the same result.
+
+        Args:
+            destination (str): Destination path for compiled CSS, without any
+                hash.
+            content (str): Compiled CSS.
+
+        Keyword Arguments:
+            sourcemap (str): Source map content if any.
+
+        Returns:
+            tuple: Hashed destination path, CSS and source map.
+        """
+        css = SOURCE_MAP_URL.sub("", content)
+        hashid = blake2b(css.encode("utf-8"), digest_size=10).hexdigest()
+
+        destination = self.change_extension(destination, "css", hashid=hashid)
+
+        if sourcemap:
+            map_name = os.path.basename(
+                self.change_extension(destination, "map")
+            )
+            content = "{}/*# sourceMappingURL={} */".format(css, map_name)
+            sourcemap = SOURCE_MAP_FILE.sub(
+                '"file": "{}"'.format(os.path.basename(destination)),
+                sourcemap,
+                count=1
+            )
+
+        return destination, content, sourcemap
+
+    def compile_content(self, settings, sourcepath, destination):
+        """
+        Compile a source without writing anything.
+
+        Args:
+            settings (boussole.conf.model.Settings): Project settings.
+            sourcepath (str): Source file path to compile to CSS.
+            destination (str): Destination path for compiled CSS, it is used
+                to build source map.
+
+        Returns:
+            tuple: A tuple of (success state, content, source map). If compile
+            fails, content is the error from libsass. Source map is ``None``
+            if compile fails or if source map is disabled.
+        """
         source_map_destination = None
         if settings.SOURCE_MAP:
             source_map_destination = self.change_extension(destination, "map")
@@ -60,21 +310,373 @@ class SassCompileHelper(ScssFinder):
                 source_map_filename=source_map_destination,
             )
         except sass.CompileError as e:
-            return False, str(e)
+            return False, str(e), None
+
+        # Compiler return a tuple (css, map) if sourcemap is
+        # enabled
+        sourcemap = None
+        if settings.SOURCE_MAP:
+            content, sourcemap = content
+
+        return True, content, sourcemap
+
+    def compile_compressed(self, settings, sourcepath, destination,
+                           hash_content=False):
+        """
+        Same as ``compile_content()`` but also compress compiled CSS if
+        setting ``COMPRESS`` is enabled.
+
+        This is meant to be run in a worker, so compression does not run where
+        outputs are written. If destination already has the same CSS, only
+        missing compressed files are compressed.
+
+        Args:
+            settings (boussole.conf.model.Settings): Project settings.
+            sourcepath (str): Source file path to compile to CSS.
+            destination (str): Destination path for compiled CSS.
+
+        Keyword Arguments:
+            hash_content (bool): If ``True``, outputs are for paths hashed
+                from their content, see ``hash_outputs()``. Default to
+                ``False``.
+
+        Returns:
+            tuple: A tuple of (success state, content, source map, compressed
+            files, output path) where compressed files are pairs of (path,
+            data) to give to ``write_outputs()`` and output path is where to
+            write CSS. Compressed files are ``None`` if compile fails or if
+            compression is disabled.
+        """
+        success, content, sourcemap = self.compile_content(settings,
+                                                           sourcepath,
+                                                           destination)
+
+        if success and hash_content:
+            destination, content, sourcemap = self.hash_outputs(
+                destination,
+                content,
+                sourcemap=sourcemap
+            )
+
+        compressed = None
+        if success and settings.COMPRESS:
+            compressed = self.compress_data(
+                content,
+                destination,
+                settings.COMPRESS_LEVEL,
+                update=not self.is_unchanged(content, destination),
+            )
+
+        return success, content, sourcemap, compressed, destination
+
+    def write_outputs(self, destination, content, sourcemap=None,
+                      skip_unchanged=False, compress_level=None,
+                      compressed=None):
+        """
+        Write compiled CSS and its source map if any.
+
+        Args:
+            destination (str): Destination path for compiled CSS.
+            content (str): Compiled CSS.
+
+        Keyword Arguments:
+            sourcemap (str): Source map content, source map is written next
+                to compiled CSS.
+            skip_unchanged (bool): If ``True``, a file which already has the
+                same content is not written again, so its modification time
+                does not change. Default to ``False``.
+            compress_level (int): If given, compressed files are written next
+                to compiled CSS with this level, see ``compress_content()``.
+                They are only compressed again if CSS has changed.
+            compressed (list): Compressed files already computed, commonly
+                from ``compile_compressed()``, to write instead of compressing
+                with ``compress_level``.
+
+        Returns:
+            bool: True if at least one file has been written.
+        """
+        outputs = [(content, destination)]
+
+        # Write sourcemap if any
+        if sourcemap:
+            outputs.append((sourcemap, self.change_extension(destination, "map")))
+
+        written = False
+        for output, path in outputs:
+            compress = path == destination and (
+                compress_level or compressed is not None
+            )
+
+            unchanged = False
+            if skip_unchanged or compress:
+                unchanged = self.is_unchanged(output, path)
+
+            if not (skip_unchanged and unchanged):
+                self.write_content(output, path)
+                written = True
+
+            if not compress:
+                continue
+
+            if compressed is None:
+                if self.compress_content(output, path, compress_level,
+                                         update=not unchanged):
+                    written = True
+            elif self.write_compressed(compressed, update=not unchanged):
+                written = True
+
+        return written
+
+    def compress_content(self, content, destination, level, update=True):
+        """
+        Write compressed content to files next to destination, named from
+        destination with compression extension like ``main.css.gz``.
+
+        Args:
+            content (str): Content to compress.
+            destination (str): Destination path of uncompressed content.
+            level (int): Compression level from 1 to 9.
+
+        Keyword Arguments:
+            update (bool): If ``False``, only missing compressed files are
+                written. Default to ``True``.
+
+        Returns:
+            bool: True if at least one file has been written.
+        """
+        return self.write_compressed(
+            self.compress_data(content, destination, level, update=update),
+            update=update,
+        )
+
+    def compress_data(self, content, destination, level, update=True):
+        """
+        Compress content for files next to destination without writing
+        anything.
+
+        Args:
+            content (str): Content to compress.
+            destination (str): Destination path of uncompressed content.
+            level (int): Compression level from 1 to 9.
+
+        Keyword Arguments:
+            update (bool): If ``False``, content is only compressed for
+                missing compressed files. Default to ``True``.
+
+        Returns:
+            list: Pairs of (path, data) for compressed files.
+        """
+        data = content.encode("utf-8")
+
+        compressed = []
+        for extension, compress in get_compressors():
+            path = "{}.{}".format(destination, extension)
+            if not update and os.path.exists(path):
+                continue
+
+            compressed.append((path, compress(data, level)))
+
+        return compressed
+
+    def write_compressed(self, compressed, update=True):
+        """
+        Write compressed files.
+
+        Args:
+            compressed (list): Pairs of (path, data) for compressed files.
+
+        Keyword Arguments:
+            update (bool): If ``False``, only missing compressed files are
+                written. Default to ``True``.
+
+        Returns:
+            bool: True if at least one file has been written.
+        """
+        written = False
+        for path, data in compressed:
+            if not update and os.path.exists(path):
+                continue
+
+            self.write_binary(data, path)
+            written = True
+
+        return written
+
+    def compile_many(self, settings, sources, jobs=1, executor=None,
+                     cache=None, hash_content=False):
+        """
+        Compile many sources, possibly in parallel.
+
+        Results are allways yielded in the same order than given sources, no
+        matter the order they have been finished, so outputs stay
+        deterministic.
+
+        Args:
+            settings (boussole.conf.model.Settings): Project settings.
+            sources (iterable): Pairs of (source path, destination path) to
+                compile.
+
+        Keyword Arguments:
+            jobs (int): Number of worker processes to use. If ``1`` or if there
+                is only one source to compile, compile is done sequentially in
+                the current process. Default to ``1``.
+            executor (concurrent.futures.ProcessPoolExecutor): A started pool
+                to use instead of starting one, commonly from
+                ``compile_pool()``. Pool is left started. ``jobs`` is ignored
+                when given.
+            cache (boussole.cache.CompileCache): Cache to take outputs from
+                instead of compiling sources, successfully compiled outputs
+                are stored in it.
+            hash_content (bool): If ``True``, outputs are written to paths
+                hashed from their content, see ``hash_outputs()``. Default to
+                ``False``.
+
+        Yields:
+            tuple: A tuple of (source path, destination path, success state,
+            message, unchanged state) for each source, see
+            ``compile_output``.
+        """
+        sources = list(sources)
+
+        if cache is not None:
+            for item in self._cached_compile(cache, settings, sources,
+                                             jobs=jobs, executor=executor,
+                                             hash_content=hash_content):
+                yield item
+        elif executor is not None and len(sources) > 1:
+            for item in self._map_compile(executor, settings, sources,
+                                          hash_content=hash_content):
+                yield item
+        elif executor is None and jobs and jobs > 1 and len(sources) > 1:
+            workers = min(jobs, len(sources))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for item in self._map_compile(executor, settings, sources,
+                                              hash_content=hash_content):
+                    yield item
         else:
-            # Compiler return a tuple (css, map) if sourcemap is
-            # enabled
-            sourcemap = None
-            if settings.SOURCE_MAP:
-                content, sourcemap = content
+            for src, dst in sources:
+                yield (src, dst) + self.compile_output(
+                    settings, src, dst, hash_content=hash_content
+                )
 
-            self.write_content(content, destination)
+    def _cached_compile(self, cache, settings, sources, jobs=1,
+                        executor=None, hash_content=False):
+        """
+        Write outputs of sources from cache and compile the other ones.
+
+        Args:
+            cache (boussole.cache.CompileCache): Cache to use.
+            settings (boussole.conf.model.Settings): Project settings.
+            sources (list): Pairs of (source path, destination path) to
+                compile.
 
-            # Write sourcemap if any
-            if sourcemap:
-                self.write_content(sourcemap, source_map_destination)
+        Keyword Arguments:
+            jobs (int): Same as ``compile_many()``.
+            executor (concurrent.futures.ProcessPoolExecutor): Same as
+                ``compile_many()``.
+            hash_content (bool): Same as ``compile_many()``.
 
-            return True, destination
+        Yields:
+            tuple: Same as ``compile_many()``.
+        """
+        keys = [cache.get_key(settings, src, dst) for src, dst in sources]
+        entries = [cache.get(key) if key else None for key in keys]
+
+        compiled = self.compile_many(
+            settings,
+            [source for source, entry in zip(sources, entries) if entry is None],
+            jobs=jobs,
+            executor=executor,
+            hash_content=hash_content,
+        )
+
+        for (src, dst), key, entry in zip(sources, keys, entries):
+            if entry is None:
+                item = next(compiled)
+                # Outputs are read from where they have been written
+                if item[2] and key:
+                    self.store_outputs(cache, key, settings, item[3])
+                yield item
+                continue
+
+            content, sourcemap = entry
+            yield (src, dst, True) + self.write_compiled(
+                settings,
+                dst,
+                content,
+                sourcemap=sourcemap,
+                hash_content=hash_content,
+            )
+
+    def store_outputs(self, cache, key, settings, destination):
+        """
+        Store written outputs of a source in cache.
+
+        An output which can not be read is not stored.
+
+        Args:
+            cache (boussole.cache.CompileCache): Cache to use.
+            key (str): Entry key.
+            settings (boussole.conf.model.Settings): Project settings.
+            destination (str): Destination path for compiled CSS.
+        """
+        paths = [destination]
+        if settings.SOURCE_MAP:
+            paths.append(self.change_extension(destination, "map"))
+
+        try:
+            outputs = []
+            for path in paths:
+                with io.open(path, "r", encoding="utf-8") as f:
+                    outputs.append(f.read())
+            outputs.append(None)
+
+            cache.set(key, outputs[0], sourcemap=outputs[1])
+        except OSError:
+            pass
+
+    def _map_compile(self, executor, settings, sources, hash_content=False):
+        """
+        Compile sources with a pool of processes and yield results in the
+        same order than sources.
+
+        Args:
+            executor (concurrent.futures.ProcessPoolExecutor): Pool to use.
+            settings (boussole.conf.model.Settings): Project settings.
+            sources (list): Pairs of (source path, destination path) to
+                compile.
+
+        Keyword Arguments:
+            hash_content (bool): Same as ``compile_many()``.
+
+        Yields:
+            tuple: Same as ``compile_many()``.
+        """
+        results = executor.map(
+            self.compile_output,
+            repeat(settings),
+            [src for src, dst in sources],
+            [dst for src, dst in sources],
+            repeat(hash_content),
+        )
+        for (src, dst), result in zip(sources, results):
+            yield (src, dst) + result
+
+    def ensure_directory(self, directory):
+        """
+        Create a directory structure if it does not exists yet.
+
+        Directory is only checked the first time, then it is remembered in
+        ``directories``.
+
+        Args:
+            directory (str): Directory path.
+        """
+        if not directory or directory in self.directories:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        self.directories.add(directory)
 
     def write_content(self, content, destination):
         """
@@ -83,19 +685,88 @@ class SassCompileHelper(ScssFinder):
         It will create needed directory structure first if it contain some
         directories that does not allready exists.
 
+        Content is written to a temporary file then moved to destination, so
+        another process never read a partially written file.
+
         Args:
             content (str): Content to write to target file.
             destination (str): Destination path for target file.
 
+        Returns:
+            str: Path where target file has been written.
+        """
+        return self._write_file(destination, content, "w", encoding="utf-8")
+
+    def write_binary(self, data, destination):
+        """
+        Same as ``write_content()`` for binary content.
+
+        Args:
+            data (bytes): Content to write to target file.
+            destination (str): Destination path for target file.
+
+        Returns:
+            str: Path where target file has been written.
+        """
+        return self._write_file(destination, data, "wb")
+
+    def _write_file(self, destination, content, mode, **kwargs):
+        """
+        Write a file through a temporary file.
+
+        Args:
+            destination (str): Destination path for target file.
+            content (str or bytes): Content to write.
+            mode (str): Mode to open temporary file.
+            **kwargs: Other arguments to open temporary file.
+
         Returns:
             str: Path where target file has been written.
         """
         directory = os.path.dirname(destination)
+        self.ensure_directory(directory)
 
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory)
+        tmp_path = "{}.{}.tmp".format(destination, os.getpid())
+        try:
+            fp = io.open(tmp_path, mode, **kwargs)
+        except FileNotFoundError:
+            # Directory has been removed since it has been checked
+            self.directories.discard(directory)
+            self.ensure_directory(directory)
+            fp = io.open(tmp_path, mode, **kwargs)
 
-        with io.open(destination, "w", encoding="utf-8") as f:
-            f.write(content)
+        try:
+            with fp:
+                fp.write(content)
+            os.replace(tmp_path, destination)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
         return destination
+
+    def is_unchanged(self, content, destination):
+        """
+        Check if a file already has the given content.
+
+        Sizes are compared first, so a changed file is commonly detected
+        without reading it.
+
+        Args:
+            content (str): Content to write to target file.
+            destination (str): Destination path for target file.
+
+        Returns:
+            bool: True if file exists with the same content.
+        """
+        data = content.encode("utf-8")
+
+        try:
+            if os.stat(destination).st_size != len(data):
+                return False
+
+            with io.open(destination, "rb") as f:
+                return f.read() == data
+        except OSError:
+            return False
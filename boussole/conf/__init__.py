@@ -68,4 +68,24 @@ SETTINGS_MANIFEST = {
         "default": [],
         "postprocess": [],
     },
+    "SKIP_UNCHANGED": {
+        "default": False,
+        "postprocess": [],
+    },
+    "COMPRESS": {
+        "default": False,
+        "postprocess": [],
+    },
+    "COMPRESS_LEVEL": {
+        "default": 9,
+        "postprocess": (
+            "_validate_compress_level",
+        ),
+    },
+    "JOBS": {
+        "default": None,
+        "postprocess": (
+            "_validate_jobs",
+        ),
+    },
 }
@@ -189,6 +189,8 @@ class SettingsPostProcessor(object):
             * If value is ``:blake2``, this will return a hash from uuid4 with a
               length of 32 characters (guaranteed to be unique);
             * If True, assume it enables the default hash engine which is ``:blake2``;
+            * If value is ``:content``, it is left unchanged since each filename
+              is hashed from its compiled content;
             * A string if value is a string that do not match any hash engine name;
 
         """
@@ -207,3 +209,56 @@ class SettingsPostProcessor(object):
             value = str(uuid4()).replace("-", "")
 
         return value
+
+    def _validate_jobs(self, settings, name, value):
+        """
+        Validate a number of processes, it must be a positive integer or
+        ``None``.
+
+        Args:
+            settings (dict): Current settings.
+            name (str): Setting name.
+            value (int): Number of processes to validate.
+
+        Raises:
+            boussole.exceptions.SettingsInvalidError: If value is not a positive
+                integer.
+
+        Returns:
+            int: Validated value.
+
+        """
+        if value is None:
+            return value
+
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            msg = "Setting '{name}' must be a positive integer: {value}"
+            raise SettingsInvalidError(msg.format(name=name, value=value))
+
+        return value
+
+    def _validate_compress_level(self, settings, name, value):
+        """
+        Validate a compression level, it must be an integer from 1 to 9.
+
+        Args:
+            settings (dict): Current settings.
+            name (str): Setting name.
+            value (int): Compression level to validate.
+
+        Raises:
+            boussole.exceptions.SettingsInvalidError: If value is not an
+                integer from 1 to 9.
+
+        Returns:
+            int: Validated value.
+
+        """
+        if (
+            isinstance(value, bool) or not isinstance(value, int) or
+            not 1 <= value <= 9
+        ):
+            msg = "Setting '{name}' must be an integer from 1 to 9: {value}"
+            raise SettingsInvalidError(msg.format(name=name, value=value))
+
+        return value
@@ -17,6 +17,11 @@ import os
 from .exceptions import FinderException
 
 
+# Hash ID which means destination filenames are hashed from their compiled
+# content, so it is not known before compile
+CONTENT_HASH = ":content"
+
+
 def paths_by_depth(paths):
     """Sort list of paths by number of directories in it
 
@@ -205,13 +210,14 @@ class ScssFinder(object):
 
         Keyword Arguments:
             hashid (str): Hash ID to add between file name and extension if given.
+                It is ignored if it is ``CONTENT_HASH``.
 
         Returns:
             str: Filepath with new extension.
         """
         filename, ext = os.path.splitext(filepath)
 
-        if hashid:
+        if hashid and hashid != CONTENT_HASH:
             return '.'.join([filename, hashid, new_extension])
         else:
             return '.'.join([filename, new_extension])
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Graph
+=====
+
+Compact storage for the dependency graph of an inspector.
+
+Every source path is interned once in a node table which gives it a small
+integer ID. Relations are stored as arrays of node IDs, so a path string is
+never repeated in relations whatever the number of sources that import it.
+
+Inspector maps ``_CHILDREN_MAP`` and ``_PARENTS_MAP`` are views over this
+storage which still use source paths.
+"""
+from array import array
+from collections.abc import Mapping
+
+
+class DependencyGraph(object):
+    """
+    Node table and relations between nodes.
+
+    Node IDs are never reused until graph is reset, a node which has been
+    removed from relations keeps its ID so it can be added again.
+
+    Attributes:
+        paths (list): Path for each node ID.
+        ids (dict): Node ID for each path.
+        children (list): Array of child node IDs for each node ID, in import
+            order. It is ``None`` for a node which has not been inspected.
+        parents (list): Array of parent node IDs for each node ID, without
+            duplicates. It is ``None`` for a node without any parent.
+    """
+    __slots__ = ("paths", "ids", "children", "parents")
+
+    # Signed 32 bits integers
+    TYPECODE = "i"
+
+    def __init__(self):
+        self.paths = []
+        self.ids = {}
+        self.children = []
+        self.parents = []
+
+    def intern(self, path):
+        """
+        Return node ID for a path, a new node is created if path is unknown.
+
+        Args:
+            path (str): Source path.
+
+        Returns:
+            int: Node ID.
+        """
+        node = self.ids.get(path)
+        if node is None:
+            node = len(self.paths)
+            self.ids[path] = node
+            self.paths.append(path)
+            self.children.append(None)
+            self.parents.append(None)
+
+        return node
+
+    def get_paths(self, nodes):
+        """
+        Return paths for some node IDs.
+
+        Args:
+            nodes (iterable): Node IDs.
+
+        Returns:
+            list: Paths in the same order.
+        """
+        paths = self.paths
+        return [paths[i] for i in nodes]
+
+    def set_children(self, node, children):
+        """
+        Set children of a node.
+
+        Parents of children are not changed, this is up to the caller.
+
+        Args:
+            node (int): Node ID.
+            children (list): Child node IDs.
+        """
+        self.children[node] = array(self.TYPECODE, children)
+
+    def pop_children(self, node):
+        """
+        Remove children of a node, node is not inspected anymore.
+
+        Args:
+            node (int): Node ID.
+
+        Returns:
+            array: Removed child node IDs, empty if node was not inspected.
+        """
+        children = self.children[node]
+        self.children[node] = None
+
+        return children if children is not None else ()
+
+    def add_parent(self, node, parent):
+        """
+        Add a parent to a node if it is not already one of its parents.
+
+        Args:
+            node (int): Node ID.
+            parent (int): Parent node ID.
+        """
+        parents = self.parents[node]
+        if parents is None:
+            self.parents[node] = array(self.TYPECODE, (parent,))
+        elif parent not in parents:
+            parents.append(parent)
+
+    def discard_parent(self, node, parent):
+        """
+        Remove a parent from a node if it is one of its parents.
+
+        Args:
+            node (int): Node ID.
+            parent (int): Parent node ID.
+
+        Returns:
+            bool: True if node does not have any parent anymore, in this case
+            its parents entry is removed.
+        """
+        parents = self.parents[node]
+        if parents is None:
+            return False
+
+        if parent in parents:
+            parents.remove(parent)
+
+        if not parents:
+            self.parents[node] = None
+            return True
+
+        return False
+
+
+class RelationsView(Mapping):
+    """
+    Read-only mapping of related paths for each path, over children or
+    parents relations of a ``DependencyGraph``.
+
+    Paths without relations are not in mapping. Values are new containers
+    built on each access, modifying them does not change graph.
+
+    Args:
+        graph (DependencyGraph): Graph to read.
+        name (str): Either ``children`` or ``parents``.
+
+    Attributes:
+        graph (DependencyGraph): Filled from argument.
+        name (str): Filled from argument.
+        container (type): Type of returned values, ``list`` for children
+            since they are in import order and ``set`` for parents.
+    """
+    def __init__(self, graph, name):
+        self.graph = graph
+        self.name = name
+        self.container = list if name == "children" else set
+
+    @property
+    def rows(self):
+        """
+        Relations list from graph, indexed by node ID.
+        """
+        return getattr(self.graph, self.name)
+
+    def __getitem__(self, path):
+        node = self.graph.ids.get(path)
+        if node is not None:
+            row = self.rows[node]
+            if row is not None:
+                return self.container(self.graph.get_paths(row))
+
+        raise KeyError(path)
+
+    def __contains__(self, path):
+        node = self.graph.ids.get(path)
+        return node is not None and self.rows[node] is not None
+
+    def __iter__(self):
+        paths = self.graph.paths
+        for node, row in enumerate(self.rows):
+            if row is not None:
+                yield paths[node]
+
+    def __len__(self):
+        return sum(1 for row in self.rows if row is not None)
+
+    def __repr__(self):
+        return "<{} {}: {}>".format(self.__class__.__name__, self.name,
+                                    dict(self.items()))
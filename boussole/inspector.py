@@ -9,32 +9,116 @@ for their dependencies.
 import io
 import os
 
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 
+from .cache import file_fingerprint
 from .exceptions import CircularImport
+from .graph import DependencyGraph, RelationsView
 from .parser import ScssImportsParser, SassImportsParser
 from .resolver import ImportPathsResolver
 
 
+def parse_file(parser, sourcepath, cached=None, fingerprinted=False):
+    """
+    Read and parse a source.
+
+    This is the job of workers from a concurrent inspection, it is a module
+    function so it can be used from a process pool.
+
+    Arguments:
+        parser (boussole.parser.ScssImportsParser): Parser to use.
+        sourcepath (str): Source file path to parse.
+
+    Keyword Arguments:
+        cached (list): Fingerprint of source from parse cache if any. Source
+            is not read if it still have the same fingerprint.
+        fingerprinted (bool): Whether to compute source fingerprint.
+
+    Returns:
+        tuple: Source fingerprint (or ``None`` if not computed), finded paths
+        (or ``None`` if source is unchanged from cached fingerprint) and a
+        boolean which is ``True`` if source has been skipped from parsing
+        since it does not contain any ``@import`` keyword.
+    """
+    fingerprint = None
+    if fingerprinted or cached is not None:
+        fingerprint = file_fingerprint(sourcepath)
+        if cached is not None and fingerprint == cached:
+            return fingerprint, None, False
+
+    with io.open(sourcepath, "r", encoding="utf-8") as fp:
+        content = fp.read()
+
+    if not parser.has_imports(content):
+        return fingerprint, [], True
+
+    return fingerprint, parser.parse(content), False
+
+
 class ScssInspector(ImportPathsResolver, ScssImportsParser):
     """
     Project inspector for SCSS sources
 
     Inspector is stateful, meaning you will need to invoke ``reset()`` then
     ``inspect()`` each time a project change, else the parents and children
-    maps will be eventually incorrects.
+    maps will be eventually incorrects. Alternatively, once a project has been
+    inspected, its maps can be patched for each changed source with
+    ``update_source()``, ``add_source()`` and ``remove_source()``.
 
     ``__init__`` method use ``reset`` method to initialize some internal
     buffers.
 
+    Keyword Arguments:
+        cache (boussole.cache.ParseCache): Optional cache for parsed import
+            rules. Unchanged sources won't be read and parsed again if they
+            are in cache.
+        closure_cache (bool): If enabled, results from ``children()`` and
+            ``parents()`` are memoized until maps change. Default to
+            ``False``.
+        listing_cache (bool): If given, it overrides the resolver switch
+            ``DIRECTORY_LISTING_CACHE``.
+        workers (int): If given, ``inspect()`` reads and parses sources
+            concurrently with this number of workers. Default to ``None``
+            for a sequential inspection.
+        processes (bool): If enabled, workers are processes instead of
+            threads. Threads are enough when inspection is mostly waiting
+            on reads, processes are better for huge sources which are slow
+            to parse. Default to ``False``.
+
     Attributes:
-        _CHILDREN_MAP: Dictionnary of finded direct children for each
-            inspected sources.
-        _PARENTS_MAP: Dictionnary of finded direct parents for each inspected
-            sources.
+        _GRAPH (boussole.graph.DependencyGraph): Inspected sources and
+            their relations, where each source path is stored only once.
+        _CHILDREN_MAP: Read-only mapping of finded direct children for each
+            inspected sources, it is a view over ``_GRAPH``.
+        _PARENTS_MAP: Read-only mapping of finded direct parents for each
+            inspected sources, it is a view over ``_GRAPH``.
+        _ROOTS: Set of source paths which have been given to ``inspect()``.
+            They are kept in maps even if nothing import them.
+        _RULES: Dictionnary of finded paths in import rules for each
+            inspected source, so they can be resolved again without reading
+            sources, see ``add_source()``.
         parsers: Dictionnary of available Sass format parsers, where key is the
             file extension related to the format and value is a parser
             instance.
+        cache (boussole.cache.ParseCache): Filled from argument.
+        closure_cache (bool): Filled from argument.
+        workers (int): Filled from argument.
+        processes (bool): Filled from argument.
+        _CLOSURE_CACHE: Dictionnary of memoized dependencies, it is
+            cleared each time maps change.
+        _CYCLIC_COMPONENTS: Dictionnary of cyclic strongly connected
+            components for each source involved in a circular import, see
+            ``get_cyclic_components()``. It is ``None`` until computed and
+            each time maps change.
+        fast_paths (int): Number of parsed sources which have been skipped
+            since they don't contain any ``@import`` keyword, since last
+            reset.
+        visited (int): Number of sources which have been inspected since last
+            reset.
+        generation (int): Number incremented each time maps change, so
+            anything computed from maps can know when it is outdated.
     """
     parsers = {
         "scss": ScssImportsParser(),
@@ -42,6 +126,12 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
     }
 
     def __init__(self, *args, **kwargs):
+        self.cache = kwargs.get("cache", None)
+        self.closure_cache = kwargs.get("closure_cache", False)
+        if kwargs.get("listing_cache", None) is not None:
+            self.DIRECTORY_LISTING_CACHE = kwargs["listing_cache"]
+        self.workers = kwargs.get("workers", None)
+        self.processes = kwargs.get("processes", False)
         self.reset()
 
     def get_parser(self, path):
@@ -71,18 +161,171 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
 
     def reset(self):
         """
-        Reset internal buffers ``_CHILDREN_MAP`` and ``_PARENTS_MAP``.
+        Reset internal buffers ``_GRAPH`` (so its maps) and ``_ROOTS``.
+        Resolver directory listings and listed directories are cleared also.
+        """
+        self._GRAPH = DependencyGraph()
+        self._CHILDREN_MAP = RelationsView(self._GRAPH, "children")
+        self._PARENTS_MAP = RelationsView(self._GRAPH, "parents")
+        self._ROOTS = set()
+        self._RULES = {}
+        self._CLOSURE_CACHE = {}
+        self._CYCLIC_COMPONENTS = None
+        self.generation = getattr(self, "generation", 0) + 1
+        self.fast_paths = 0
+        self.visited = 0
+        self.clear_directory_listings()
+        self._LISTED_DIRECTORIES = set()
+
+    def parse_source(self, sourcepath):
+        """
+        Read a source and parse its import rules.
+
+        If inspector has a cache, rules are taken from cache if source has not
+        changed since it has been cached. A source without any ``@import``
+        keyword is not parsed at all and counted in ``fast_paths``.
+
+        Arguments:
+            sourcepath (str): Source file path to parse.
+
+        Returns:
+            list: Finded paths in import rules.
+        """
+        if self.cache is not None:
+            fingerprint = file_fingerprint(sourcepath)
+            rules = self.cache.get(sourcepath, fingerprint)
+            if rules is not None:
+                return rules
+
+        parser = self.get_parser(sourcepath)
+        with io.open(sourcepath, "r", encoding="utf-8") as fp:
+            content = fp.read()
+
+        # Pure variables or mixins sources are common and don't need to be
+        # scanned
+        if parser.has_imports(content):
+            rules = parser.parse(content)
+        else:
+            self.fast_paths += 1
+            rules = []
+
+        if self.cache is not None:
+            self.cache.set(sourcepath, fingerprint, rules)
+
+        return rules
+
+    def submit_source(self, executor, sourcepath):
+        """
+        Submit a source to parse to a worker pool.
+
+        Arguments:
+            executor (concurrent.futures.Executor): Worker pool.
+            sourcepath (str): Source file path to parse.
+
+        Returns:
+            concurrent.futures.Future: Future for ``parse_file()`` result.
+        """
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.peek(sourcepath)
+
+        return executor.submit(parse_file, self.get_parser(sourcepath),
+                               sourcepath, cached=cached,
+                               fingerprinted=self.cache is not None)
+
+    def collect_source(self, sourcepath, future):
+        """
+        Get finded paths for a source from its worker result.
+
+        Worker result is merged in parse cache and counters as
+        ``parse_source()`` would do. If worker has failed, its exception is
+        raised again.
+
+        Arguments:
+            sourcepath (str): Source file path.
+            future (concurrent.futures.Future): Future from
+                ``submit_source()``.
+
+        Returns:
+            list: Finded paths in import rules.
+        """
+        fingerprint, rules, skipped = future.result()
+
+        if self.cache is not None:
+            cached = self.cache.get(sourcepath, fingerprint)
+            if cached is not None:
+                return cached
+            # Cached rules have been evicted since source has been submitted
+            elif rules is None:
+                return self.parse_source(sourcepath)
+
+            self.cache.set(sourcepath, fingerprint, rules)
+
+        if skipped:
+            self.fast_paths += 1
+
+        return rules
+
+    @contextmanager
+    def worker_pool(self):
+        """
+        Context manager to start a worker pool for concurrent inspection.
+
+        Yields ``None`` if inspector has no ``workers``.
+        """
+        if not self.workers or self.workers < 2:
+            yield None
+            return
+
+        if self.processes:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        with executor:
+            yield executor
+
+    def _set_children(self, sourcepath, children):
+        """
+        Set children of a source and add source to parents of its children.
+
+        Arguments:
+            sourcepath (str): Source file path.
+            children (list): Resolved children paths.
+
+        Returns:
+            int: Source node ID.
         """
-        self._CHILDREN_MAP = {}
-        self._PARENTS_MAP = defaultdict(set)
+        graph = self._GRAPH
+        node = graph.intern(sourcepath)
+        nodes = [graph.intern(path) for path in children]
 
-    def look_source(self, sourcepath, library_paths=None):
+        # Those files that are imported by the path
+        graph.set_children(node, nodes)
+
+        # Those files that import the path
+        for child in nodes:
+            graph.add_parent(child, node)
+
+        return node
+
+    def look_source(self, sourcepath, library_paths=None, executor=None,
+                    pending=None):
         """
         Open a SCSS file (sourcepath) and find all involved files from
         import rules.
 
         This will fill internal buffers ``_CHILDREN_MAP`` and ``_PARENTS_MAP``.
 
+        Imported files are walked with a stack instead of recursion, so there
+        is no limit on import depth. They are visited in the same order than
+        a recursive walk would do.
+
+        With a worker pool, every resolved child is submitted to be parsed as
+        soon as it is known, but children are still resolved and added to
+        maps in the same order. So maps and raised exceptions are the same
+        than with a sequential inspection.
+
         Arguments:
             sourcepath (str): Source file path to start searching for imports.
 
@@ -90,31 +333,68 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
             library_paths (list): List of directory paths for libraries to
                 resolve paths if resolving fails on the base source path.
                 Default to None.
+            executor (concurrent.futures.Executor): Worker pool to parse
+                sources, see ``worker_pool()``. Default to None.
+            pending (dict): Futures of sources already submitted to the
+                worker pool, indexed on source path. If given, futures which
+                have not been used are left to the caller, else they are
+                cancelled when source has been inspected. Default to None.
         """
-        # Don't inspect again source that has allready be inspected as a
-        # children of a previous source
-        if sourcepath not in self._CHILDREN_MAP:
-            parser = self.get_parser(sourcepath)
-            with io.open(sourcepath, "r", encoding="utf-8") as fp:
-                finded_paths = parser.parse(fp.read())
-
-            children = self.resolve(sourcepath, finded_paths,
-                                    library_paths=library_paths)
-
-            # Those files that are imported by the sourcepath
-            self._CHILDREN_MAP[sourcepath] = children
-
-            # Those files that import the sourcepath
-            for p in children:
-                self._PARENTS_MAP[p].add(sourcepath)
-
-            # Start recursive finding through each resolved path that has not
-            # been collected yet
-            for path in children:
-                if path not in self._CHILDREN_MAP:
-                    self.look_source(path, library_paths=library_paths)
+        stack = [sourcepath]
+        owned = pending is None
+        if owned:
+            pending = {}
+
+        try:
+            while stack:
+                path = stack.pop()
+
+                # Don't inspect again source that has allready be inspected as
+                # a children of a previous source
+                if path in self._CHILDREN_MAP:
+                    continue
+
+                self._clear_graph_caches()
+                self.visited += 1
+
+                if executor is None:
+                    finded_paths = self.parse_source(path)
+                else:
+                    future = pending.pop(path, None)
+                    if future is None:
+                        future = self.submit_source(executor, path)
+                    finded_paths = self.collect_source(path, future)
+
+                children = self.resolve(path, finded_paths,
+                                        library_paths=library_paths)
+
+                self._set_children(path, children)
+                self._RULES[path] = finded_paths
+
+                if executor is not None:
+                    for p in children:
+                        if p not in self._CHILDREN_MAP and p not in pending:
+                            pending[p] = self.submit_source(executor, p)
+
+                # Continue through each resolved path that has not been
+                # collected yet, reversed so the first child is the next one
+                # to be visited
+                stack.extend(reversed(children))
+        finally:
+            # Results won't be used if an error occured
+            if owned:
+                self._cancel_pending(pending)
+
+    def _cancel_pending(self, pending):
+        """
+        Cancel futures of sources which have not been inspected.
 
-        return
+        Arguments:
+            pending (dict): Futures indexed on source path.
+        """
+        for future in pending.values():
+            future.cancel()
+        pending.clear()
 
     def inspect(self, *args, **kwargs):
         """
@@ -127,6 +407,13 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
             This will ignore orphan files (files that are not imported from
             any of given SCSS files).
 
+            Resolutions are cached during inspection, so a rule imported from
+            many sources in the same directory is resolved only once.
+
+            If inspector has ``workers``, every given source is submitted to
+            be read and parsed before inspection starts, then their children
+            as soon as they are resolved, see ``look_source()``.
+
         Arguments:
             *args: One or multiple arguments, each one for a source file path
                 to inspect.
@@ -138,8 +425,361 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
         """
         library_paths = kwargs.get("library_paths", None)
 
-        for sourcepath in args:
+        with self.resolution_cache(), self.worker_pool() as executor:
+            pending = {}
+
+            try:
+                if executor is not None:
+                    for sourcepath in args:
+                        if (sourcepath not in self._CHILDREN_MAP and
+                                sourcepath not in pending):
+                            pending[sourcepath] = self.submit_source(
+                                executor, sourcepath
+                            )
+
+                for sourcepath in args:
+                    self._ROOTS.add(sourcepath)
+                    self.look_source(sourcepath, library_paths=library_paths,
+                                     executor=executor, pending=pending)
+            finally:
+                self._cancel_pending(pending)
+
+    def restore(self, paths, children, roots):
+        """
+        Fill graph from stored relations, commonly from a graph snapshot.
+
+        Inspector should have been reset before, restored sources are not
+        checked against filesystem.
+
+        Arguments:
+            paths (list): Path for each node ID.
+            children (list): List of child node IDs for each node ID, or
+                ``None`` for a node which has not been inspected.
+            roots (list): Source paths which have been given to
+                ``inspect()``.
+        """
+        self._clear_graph_caches()
+        # Intern every paths first so node IDs keep the stored order
+        for path in paths:
+            self._GRAPH.intern(path)
+
+        for path, row in zip(paths, children):
+            if row is not None:
+                self._set_children(path, [paths[i] for i in row])
+
+        self._ROOTS.update(roots)
+
+    def _drop_source(self, sourcepath):
+        """
+        Remove a source from children map and remove it from parents of its
+        children. Children which are not imported anymore from any source
+        and are not inspected roots are dropped also.
+
+        Source is keeped in parents map, this is up to the caller to care
+        about sources that still import it.
+
+        Arguments:
+            sourcepath (str): Source file path to drop.
+        """
+        self._clear_graph_caches()
+        graph = self._GRAPH
+        node = graph.ids.get(sourcepath)
+        stack = [node] if node is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            self._RULES.pop(graph.paths[node], None)
+
+            for child in graph.pop_children(node):
+                # Orphan child is dropped also
+                if (
+                    graph.discard_parent(child, node) and
+                    graph.paths[child] not in self._ROOTS
+                ):
+                    stack.append(child)
+
+    def update_source(self, sourcepath, library_paths=None):
+        """
+        Patch maps for a changed source.
+
+        Only the given source is parsed again, then its children are compared
+        to the previous ones to add or remove relations. New children are
+        inspected and children that are not imported anymore by any source
+        are removed from maps.
+
+        If source has not been inspected yet, it is just inspected.
+
+        Arguments:
+            sourcepath (str): Source file path which have changed.
+
+        Keyword Arguments:
+            library_paths (list): List of directory paths for libraries to
+                resolve paths if resolving fails on the base source path.
+                Default to None.
+        """
+        if sourcepath not in self._CHILDREN_MAP:
             self.look_source(sourcepath, library_paths=library_paths)
+            return
+
+        # Resolve new children before any change so maps are left untouched
+        # if an error occurs
+        finded_paths = self.parse_source(sourcepath)
+        children = self.resolve(sourcepath, finded_paths,
+                                library_paths=library_paths)
+        previous = self._CHILDREN_MAP[sourcepath]
+        self._RULES[sourcepath] = finded_paths
+
+        # Imports have not changed, maps stay untouched
+        if children == previous:
+            return
+
+        self._clear_graph_caches()
+        graph = self._GRAPH
+        node = self._set_children(sourcepath, children)
+
+        for path in set(previous) - set(children):
+            if (
+                graph.discard_parent(graph.ids[path], node) and
+                path not in self._ROOTS
+            ):
+                self._drop_source(path)
+
+        for path in children:
+            if path not in self._CHILDREN_MAP:
+                self.look_source(path, library_paths=library_paths)
+
+    def get_candidate_importers(self, sourcepath, library_paths=None):
+        """
+        Find inspected sources with an import rule which has the given path
+        as a candidate.
+
+        Import rules are taken from the ones stored during inspection, a
+        source restored from a snapshot is parsed again (commonly from parse
+        cache).
+
+        Arguments:
+            sourcepath (str): Source file path.
+
+        Keyword Arguments:
+            library_paths (list): List of directory paths for libraries to
+                resolve paths if resolving fails on the base source path.
+                Default to None.
+
+        Returns:
+            list: Source paths, sorted.
+        """
+        importers = []
+        for path in self._CHILDREN_MAP:
+            rules = self._RULES.get(path)
+            if rules is None:
+                rules = self._RULES[path] = self.parse_source(path)
+            if not rules:
+                continue
+
+            basepaths = self.get_basepaths(path, library_paths=library_paths)
+            for rule in rules:
+                if self.is_candidate(rule, basepaths, sourcepath):
+                    importers.append(path)
+                    break
+
+        return sorted(importers)
+
+    def add_source(self, sourcepath, library_paths=None):
+        """
+        Patch maps for a new source.
+
+        A new file may change how import rules from inspected sources are
+        resolved, so every inspected source with an import rule which has the
+        new source as a candidate is resolved again. They will fail in the
+        same way a full inspection would do if their rule has become unclear.
+
+        New source itself is not inspected unless a source imports it.
+
+        Arguments:
+            sourcepath (str): Source file path which have been created.
+
+        Keyword Arguments:
+            library_paths (list): List of directory paths for libraries to
+                resolve paths if resolving fails on the base source path.
+                Default to None.
+
+        Raises:
+            boussole.exceptions.UnclearResolution: If new source makes an
+                import rule unclear.
+        """
+        importers = self.get_candidate_importers(sourcepath,
+                                                 library_paths=library_paths)
+
+        for path in importers:
+            if path in self._CHILDREN_MAP:
+                self.update_source(path, library_paths=library_paths)
+
+    def remove_source(self, sourcepath, library_paths=None):
+        """
+        Patch maps for a removed source.
+
+        Source is removed from maps with its children that are not imported
+        anymore by any other source. Then every source which imported it is
+        resolved again, so it will fail in the same way a full inspection
+        would do if they still import the removed source.
+
+        Arguments:
+            sourcepath (str): Source file path which have been removed.
+
+        Keyword Arguments:
+            library_paths (list): List of directory paths for libraries to
+                resolve paths if resolving fails on the base source path.
+                Default to None.
+
+        Raises:
+            boussole.exceptions.UnresolvablePath: If removed source is still
+                imported from another source.
+        """
+        parents = self._PARENTS_MAP.get(sourcepath, set())
+
+        self._ROOTS.discard(sourcepath)
+        self._drop_source(sourcepath)
+
+        # Parents which have been dropped as orphans are not resolved again
+        for path in sorted(parents):
+            if path in self._CHILDREN_MAP:
+                self.update_source(path, library_paths=library_paths)
+
+    def _clear_graph_caches(self):
+        """
+        Clear everything computed from maps, this have to be done each time
+        maps change.
+        """
+        self._CLOSURE_CACHE.clear()
+        self._CYCLIC_COMPONENTS = None
+        self.generation += 1
+
+    def get_cyclic_components(self):
+        """
+        Find every sources involved in circular imports.
+
+        Strongly connected components are searched in children map with an
+        iterative Tarjan's algorithm, so in linear time and without any
+        recursion limit. Result is computed once and reused until maps
+        change.
+
+        Returns:
+            dict: Cyclic component (as a frozenset of source paths) for each
+            source involved in a circular import. A component is cyclic if
+            it has more than one source or if its source imports itself.
+        """
+        if self._CYCLIC_COMPONENTS is not None:
+            return self._CYCLIC_COMPONENTS
+
+        graph = self._GRAPH
+        rows = graph.children
+        components = {}
+        index = {}
+        lowlink = {}
+        stack = []
+        onstack = set()
+
+        for root, row in enumerate(rows):
+            if row is None or root in index:
+                continue
+
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            onstack.add(root)
+            work = [(root, iter(row))]
+
+            while work:
+                node, children = work[-1]
+
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        onstack.add(child)
+                        work.append((child, iter(rows[child] or ())))
+                        break
+                    elif child in onstack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                # Every children of node have been walked
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    # Node is the root of a component
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            item = stack.pop()
+                            onstack.discard(item)
+                            component.append(item)
+                            if item == node:
+                                break
+
+                        if len(component) > 1 or node in (rows[node] or ()):
+                            component = frozenset(graph.get_paths(component))
+                            for item in component:
+                                components[item] = component
+
+        self._CYCLIC_COMPONENTS = components
+
+        return components
+
+    def get_cycle(self, sourcepath):
+        """
+        Return the shortest circular import path involving a source.
+
+        Arguments:
+            sourcepath (str): Source file path.
+
+        Returns:
+            list: Source paths in import order, starting and ending with given
+            source. It is empty if source is not involved in any circular
+            import.
+        """
+        component = self.get_cyclic_components().get(sourcepath)
+        if component is None:
+            return []
+
+        graph = self._GRAPH
+        source = graph.ids[sourcepath]
+        members = set(graph.ids[path] for path in component)
+
+        # Breadth-first walk inside component which keeps the source each
+        # one has been reached from, until source is reached again
+        previous = {}
+        queue = deque([source])
+
+        while source not in previous:
+            item = queue.popleft()
+            for child in graph.children[item]:
+                if child in members and child not in previous:
+                    previous[child] = item
+                    queue.append(child)
+
+        cycle = [source]
+        item = previous[source]
+        while item != source:
+            cycle.append(item)
+            item = previous[item]
+        cycle.append(source)
+        cycle.reverse()
+
+        return graph.get_paths(cycle)
+
+    def cycles(self):
+        """
+        Return every circular imports.
+
+        Returns:
+            list: A circular import path (see ``get_cycle()``) for each cyclic
+            component, starting from its first source in alphabetical order.
+        """
+        components = set(self.get_cyclic_components().values())
+
+        return sorted([self.get_cycle(min(k)) for k in components])
 
     def _get_recursive_dependancies(self, dependencies_map, sourcepath,
                                     recursive=True):
@@ -149,9 +789,14 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
 
         This is a common method used by ``children`` and ``parents`` methods.
 
+        Circular imports are known from ``get_cyclic_components()`` so search
+        is a simple breadth-first walk where each dependency is visited only
+        once.
+
         Arguments:
-            dependencies_map (dict): Internal buffer (internal buffers
-                ``_CHILDREN_MAP`` or ``_PARENTS_MAP``) to use for searching.
+            dependencies_map (boussole.graph.RelationsView): Internal buffer
+                (internal buffers ``_CHILDREN_MAP`` or ``_PARENTS_MAP``) to
+                use for searching.
             sourcepath (str): Source file path to start searching for
                 dependencies.
 
@@ -160,55 +805,73 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
                 Default to True.
 
         Raises:
-            CircularImport: If circular error is detected from a source.
+            CircularImport: If source is involved in a circular import.
 
         Returns:
             set: List of dependencies paths.
         """
-        # Direct dependencies
-        collected = set([])
-        collected.update(dependencies_map.get(sourcepath, []))
+        if not recursive:
+            return set(dependencies_map.get(sourcepath, []))
 
-        # Sequence of 'dependencies_map' items to explore
-        sequence = collected.copy()
-        # Exploration list
-        walkthrough = []
+        if sourcepath in self.get_cyclic_components():
+            msg = "A circular import has occured: {}"
+            raise CircularImport(msg.format(
+                " -> ".join(self.get_cycle(sourcepath))
+            ))
 
-        # Recursive search starting from direct dependencies
-        if recursive:
-            while True:
-                if not sequence:
-                    break
-                item = sequence.pop()
-
-                # Add current source to the explorated source list
-                walkthrough.append(item)
-
-                # Current item children
-                current_item_dependancies = dependencies_map.get(item, [])
-
-                for dependency in current_item_dependancies:
-                    # Allready visited item, ignore and continue to the new
-                    # item
-                    if dependency in walkthrough:
-                        continue
-                    # Unvisited item yet, add its children to dependencies and
-                    # item to explore
-                    else:
-                        collected.add(dependency)
-                        sequence.add(dependency)
-
-                # Sourcepath has allready been visited but present itself
-                # again, assume it's a circular import
-                if sourcepath in walkthrough:
-                    msg = "A circular import has occured by '{}'"
-                    raise CircularImport(msg.format(current_item_dependancies))
-
-                # No more item to explore, break loop
-                if not sequence:
-                    break
+        node = self._GRAPH.ids.get(sourcepath)
+        if node is None:
+            return set()
+
+        # Walk on node IDs, paths are only resolved for the result
+        rows = dependencies_map.rows
+        visited = set(rows[node] or ())
+        queue = deque(visited)
+
+        while queue:
+            item = queue.popleft()
+
+            for dependency in rows[item] or ():
+                if dependency not in visited:
+                    visited.add(dependency)
+                    queue.append(dependency)
+
+        return set(self._GRAPH.get_paths(visited))
+
+    def _get_closure(self, name, sourcepath, recursive=True):
+        """
+        Return dependencies from a map, possibly memoized.
+
+        Arguments:
+            name (str): Either ``children`` or ``parents``.
+            sourcepath (str): Source file path to search for.
+
+        Keyword Arguments:
+            recursive (bool): Switch to enabled recursive finding (if True).
+                Default to True.
+
+        Returns:
+            set: List of finded dependencies paths. This is allways a new set
+            that can be safely modified.
+        """
+        if name == "children":
+            dependencies_map = self._CHILDREN_MAP
+        else:
+            dependencies_map = self._PARENTS_MAP
+
+        if not self.closure_cache:
+            return self._get_recursive_dependancies(dependencies_map,
+                                                    sourcepath,
+                                                    recursive=recursive)
+
+        key = (name, sourcepath, recursive)
+        if key not in self._CLOSURE_CACHE:
+            self._CLOSURE_CACHE[key] = frozenset(
+                self._get_recursive_dependancies(dependencies_map, sourcepath,
+                                                 recursive=recursive)
+            )
 
-        return collected
+        return set(self._CLOSURE_CACHE[key])
 
     def children(self, sourcepath, recursive=True):
         """
@@ -225,11 +888,7 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
         Returns:
             set: List of finded parents path.
         """
-        return self._get_recursive_dependancies(
-            self._CHILDREN_MAP,
-            sourcepath,
-            recursive=True
-        )
+        return self._get_closure("children", sourcepath, recursive=recursive)
 
     def parents(self, sourcepath, recursive=True):
         """
@@ -245,8 +904,4 @@ class ScssInspector(ImportPathsResolver, ScssImportsParser):
         Returns:
             set: List of finded parents path.
         """
-        return self._get_recursive_dependancies(
-            self._PARENTS_MAP,
-            sourcepath,
-            recursive=True
-        )
+        return self._get_closure("parents", sourcepath, recursive=recursive)
@@ -0,0 +1,500 @@
+# -*- coding: utf-8 -*-
+"""
+Build manifest
+==============
+
+Manifest is in charge to remember what has been compiled from a previous build
+so an incremental build is able to only compile sources that have changed.
+
+For each compiled source, manifest stores:
+
+* A digest of the source and its full import closure (every file it imports
+  recursively), resolved with the inspector;
+* A digest of the compile relevant settings;
+* The destination path and a digest of written output files (CSS and
+  possibly its source map and compressed files).
+
+A source is considered as outdated if any of these items have changed since
+its last compile, including if its output have been modified or removed.
+
+Asset manifest is a different thing, it is published with compiled files to
+map their names to hashed filenames when these are hashed from their content.
+"""
+import io
+import json
+import os
+import threading
+from hashlib import blake2b
+
+import sass
+
+from .cache import read_json, write_json
+from .compiler import get_compressors
+from .exceptions import BoussoleBaseException
+from .finder import ScssFinder
+from .inspector import ScssInspector
+
+
+class BuildManifest(object):
+    """
+    Build manifest for incremental compiles.
+
+    Args:
+        settings (boussole.conf.model.Settings): Project settings.
+
+    Keyword Arguments:
+        inspector (boussole.inspector.ScssInspector): Inspector instance to use
+            to resolve import closures. If not given a new one is created.
+        filepath (str): Path to the manifest file. Default to a file named
+            from ``FILENAME`` in the settings ``TARGET_PATH`` directory.
+
+    Attributes:
+        FILENAME (str): Default manifest filename.
+        VERSION (int): Manifest format version. A stored manifest with a
+            different version is ignored.
+        entries (dict): Stored fingerprints indexed on source paths.
+    """
+    FILENAME = ".boussole-manifest.json"
+    VERSION = 1
+
+    def __init__(self, settings, inspector=None, filepath=None):
+        self.settings = settings
+        self.inspector = inspector or ScssInspector()
+        self.filepath = filepath or os.path.join(settings.TARGET_PATH,
+                                                 self.FILENAME)
+
+        self.entries = {}
+        self._fingerprints = {}
+        self._digests = {}
+
+    def load(self):
+        """
+        Load stored entries from manifest file if any.
+
+        An unreadable or invalid manifest is silently ignored, it will just
+        lead to compile everything.
+
+        Returns:
+            dict: Loaded entries.
+        """
+        self.entries = {}
+
+        content = read_json(self.filepath, self.VERSION)
+        if content is not None:
+            self.entries = content.get("entries", {})
+
+        return self.entries
+
+    def save(self):
+        """
+        Write entries to manifest file.
+
+        File is written to a temporary file then moved to its final path, so
+        an interrupted build never leaves a partially written manifest.
+
+        Returns:
+            str: Path where manifest file has been written.
+        """
+        write_json(self.filepath, {
+            "version": self.VERSION,
+            "entries": self.entries,
+        })
+
+        return self.filepath
+
+    def file_digest(self, path):
+        """
+        Compute digest of a file content.
+
+        Args:
+            path (str): File path to read.
+
+        Returns:
+            str or None: Hexadecimal digest or ``None`` if file does not
+            exists.
+        """
+        try:
+            with io.open(path, "rb") as fp:
+                return blake2b(fp.read(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+
+    def source_digest(self, path):
+        """
+        Same as ``file_digest`` but memoized for the manifest lifetime since
+        sources are commonly shared between many closures.
+
+        Args:
+            path (str): File path to read.
+
+        Returns:
+            str or None: Hexadecimal digest or ``None`` if file does not
+            exists.
+        """
+        if path not in self._digests:
+            self._digests[path] = self.file_digest(path)
+
+        return self._digests[path]
+
+    def settings_digest(self):
+        """
+        Compute digest of settings which are relevant for compile output.
+
+        Libsass version is included since a different version may produce a
+        different output.
+
+        Returns:
+            str: Hexadecimal digest.
+        """
+        payload = json.dumps({
+            "OUTPUT_STYLES": self.settings.OUTPUT_STYLES,
+            "SOURCE_COMMENTS": self.settings.SOURCE_COMMENTS,
+            "SOURCE_MAP": self.settings.SOURCE_MAP,
+            "LIBRARY_PATHS": self.settings.LIBRARY_PATHS,
+            "COMPRESS": self.settings.COMPRESS,
+            "COMPRESS_LEVEL": self.settings.COMPRESS_LEVEL,
+            "libsass": sass.__version__,
+        }, sort_keys=True)
+
+        return blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def closure_digest(self, sourcepath):
+        """
+        Compute digest of a source and all its imported files.
+
+        Args:
+            sourcepath (str): Source file path.
+
+        Returns:
+            str or None: Hexadecimal digest or ``None`` if source closure
+            could not be resolved (like with an unresolvable import), in this
+            case source is allways considered as outdated and compiler will
+            report about the error.
+        """
+        try:
+            self.inspector.inspect(
+                sourcepath,
+                library_paths=self.settings.LIBRARY_PATHS
+            )
+            closure = self.inspector.children(sourcepath)
+        except BoussoleBaseException:
+            return None
+
+        digest = blake2b(digest_size=16)
+        for path in [sourcepath] + sorted(closure):
+            digest.update(path.encode("utf-8"))
+            digest.update((self.source_digest(path) or "").encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def output_paths(self, destination):
+        """
+        Return output file paths for a destination.
+
+        Args:
+            destination (str): Destination path for compiled CSS.
+
+        Returns:
+            list: Destination path and possibly source map path and
+            compressed file paths.
+        """
+        paths = [destination]
+        if self.settings.SOURCE_MAP:
+            paths.append(ScssFinder().change_extension(destination, "map"))
+
+        return paths + self.compressed_paths(destination)
+
+    def compressed_paths(self, destination):
+        """
+        Return compressed file paths for a destination.
+
+        Args:
+            destination (str): Destination path for compiled CSS.
+
+        Returns:
+            list: Compressed file paths, it is empty if compression is not
+            enabled.
+        """
+        if not self.settings.COMPRESS:
+            return []
+
+        return [
+            "{}.{}".format(destination, extension)
+            for extension, compress in get_compressors()
+        ]
+
+    def compress_level(self):
+        """
+        Return compression level used for compressed files.
+
+        Returns:
+            int or None: Compression level or ``None`` if compression is not
+            enabled.
+        """
+        if not self.settings.COMPRESS:
+            return None
+
+        return self.settings.COMPRESS_LEVEL
+
+    def fingerprint(self, sourcepath, destination):
+        """
+        Compute fingerprint for a source.
+
+        Fingerprint is memoized during manifest lifetime so the one computed
+        before compile is the one stored after it.
+
+        Args:
+            sourcepath (str): Source file path.
+            destination (str): Destination path for compiled CSS.
+
+        Returns:
+            dict: Source fingerprint.
+        """
+        if sourcepath not in self._fingerprints:
+            self._fingerprints[sourcepath] = {
+                "destination": destination,
+                "closure": self.closure_digest(sourcepath),
+                "settings": self.settings_digest(),
+                "compress": self.compress_level(),
+            }
+
+        return self._fingerprints[sourcepath]
+
+    def is_outdated(self, sourcepath, destination):
+        """
+        Check if a source needs to be compiled.
+
+        Args:
+            sourcepath (str): Source file path.
+            destination (str): Destination path for compiled CSS.
+
+        Returns:
+            bool: ``True`` if source has to be compiled, else ``False``.
+        """
+        # Allways compute fingerprint before compile, so a change during
+        # compile won't be missed from next build
+        fingerprint = self.fingerprint(sourcepath, destination)
+
+        entry = self.entries.get(sourcepath)
+        if not entry or fingerprint["closure"] is None:
+            return True
+
+        for name in ("destination", "closure", "settings"):
+            if entry.get(name) != fingerprint[name]:
+                return True
+
+        output = entry.get("output") or destination
+        outputs = [self.file_digest(path)
+                   for path in self.output_paths(output)]
+
+        return None in outputs or entry.get("outputs") != outputs
+
+    def update(self, sourcepath, destination, output=None):
+        """
+        Store fingerprint for a successfully compiled source.
+
+        Args:
+            sourcepath (str): Source file path.
+            destination (str): Destination path for compiled CSS.
+
+        Keyword Arguments:
+            output (str): Path where CSS has been written if it is not
+                destination, like when filename is hashed from content.
+        """
+        entry = dict(self.fingerprint(sourcepath, destination))
+        if output and output != destination:
+            entry["output"] = output
+        entry["outputs"] = [self.file_digest(path)
+                            for path in self.output_paths(output or destination)]
+
+        self.entries[sourcepath] = entry
+
+    def discard_compressed(self, sourcepath):
+        """
+        Remove compressed files from previous build of a source if they have
+        been written with another compression level.
+
+        Compiler only writes missing compressed files when compiled CSS has
+        not changed, so stale ones have to be removed before compile.
+
+        Args:
+            sourcepath (str): Source file path.
+
+        Returns:
+            list: Removed file paths.
+        """
+        entry = self.entries.get(sourcepath)
+        if not entry or "compress" not in entry:
+            return []
+
+        if entry["compress"] == self.compress_level():
+            return []
+
+        removed = []
+        for path in self.compressed_paths(
+            entry.get("output") or entry["destination"]
+        ):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed.append(path)
+
+        return removed
+
+    def discard(self, sourcepath):
+        """
+        Remove stored fingerprint for a source, commonly because its compile
+        has failed.
+
+        Args:
+            sourcepath (str): Source file path.
+        """
+        self.entries.pop(sourcepath, None)
+
+    def prune(self, sourcepaths):
+        """
+        Remove stored fingerprints for sources that are not in given ones,
+        commonly because they have been removed or excluded.
+
+        Args:
+            sourcepaths (iterable): Source paths to keep.
+        """
+        sourcepaths = set(sourcepaths)
+        self.entries = {k: v for k, v in self.entries.items()
+                        if k in sourcepaths}
+
+
+class AssetManifest(object):
+    """
+    Manifest of compiled filenames hashed from their content.
+
+    It is a JSON object where each key is the path of a compiled file (CSS
+    or source map) without hash and its value is the path of the hashed file,
+    both relative to ``TARGET_PATH``. It is intended to be read by
+    applications to reference compiled files.
+
+    Args:
+        settings (boussole.conf.model.Settings): Project settings.
+
+    Keyword Arguments:
+        filepath (str): Path to the manifest file. Default to a file named
+            from ``FILENAME`` in the settings ``TARGET_PATH`` directory.
+
+    Attributes:
+        FILENAME (str): Default manifest filename.
+        paths (dict): Hashed path for each path without hash.
+        _lock (threading.Lock): Lock for paths and manifest file, since the
+            watcher may update and save manifest from many threads.
+    """
+    FILENAME = "manifest.json"
+
+    def __init__(self, settings, filepath=None):
+        self.settings = settings
+        self.filepath = filepath or os.path.join(settings.TARGET_PATH,
+                                                 self.FILENAME)
+
+        self.paths = {}
+        self._lock = threading.Lock()
+
+    def get_name(self, path):
+        """
+        Return manifest name of a path.
+
+        Args:
+            path (str): Absolute path in ``TARGET_PATH``.
+
+        Returns:
+            str: Path relative to ``TARGET_PATH`` with ``/`` separators.
+        """
+        return os.path.relpath(path, self.settings.TARGET_PATH).replace(
+            os.sep, "/"
+        )
+
+    def get_names(self, destination):
+        """
+        Return manifest names for outputs of a destination.
+
+        Args:
+            destination (str): Destination path for compiled CSS.
+
+        Returns:
+            list: Names for CSS and possibly its source map.
+        """
+        paths = [destination]
+        if self.settings.SOURCE_MAP:
+            paths.append(ScssFinder().change_extension(destination, "map"))
+
+        return [self.get_name(path) for path in paths]
+
+    def load(self):
+        """
+        Load paths from manifest file if any.
+
+        An unreadable or invalid manifest is silently ignored.
+
+        Returns:
+            dict: Loaded paths.
+        """
+        self.paths = {}
+
+        try:
+            with io.open(self.filepath, "r", encoding="utf-8") as fp:
+                content = json.load(fp)
+        except (OSError, ValueError):
+            return self.paths
+
+        if isinstance(content, dict):
+            self.paths = content
+
+        return self.paths
+
+    def update(self, destination, output):
+        """
+        Store paths of a compiled source.
+
+        Args:
+            destination (str): Destination path for compiled CSS, without
+                hash.
+            output (str): Path where CSS has been written.
+        """
+        with self._lock:
+            self.paths.update(zip(self.get_names(destination),
+                                  self.get_names(output)))
+
+    def prune(self, destinations):
+        """
+        Remove paths of sources that are not compiled anymore.
+
+        Args:
+            destinations (iterable): Destination paths to keep.
+        """
+        names = set()
+        for destination in destinations:
+            names.update(self.get_names(destination))
+
+        self.paths = {k: v for k, v in self.paths.items() if k in names}
+
+    def save(self):
+        """
+        Write paths to manifest file.
+
+        File is written to a temporary file then moved to its final path, so
+        an application never read a partially written manifest.
+
+        Returns:
+            str: Path where manifest file has been written.
+        """
+        directory = os.path.dirname(self.filepath)
+        tmp_path = "{}.{}.tmp".format(self.filepath, os.getpid())
+
+        with self._lock:
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            with io.open(tmp_path, "w", encoding="utf-8") as fp:
+                fp.write(json.dumps(self.paths, indent=4, sort_keys=True))
+
+            os.replace(tmp_path, self.filepath)
+
+        return self.filepath
@@ -35,10 +35,70 @@ class ScssImportsParser(object):
     safe enough to inherit it from another class.
 
     Attributes:
-        REGEX_IMPORT_RULE: Compiled regex used to find ``@import`` rules.
+        REGEX_IMPORT_KEYWORD: Compiled regex used to search for an
+            ``@import`` keyword in any letter case.
+        REGEX_SCANNER: Compiled regex used to scan content in a single pass.
+            It matches comments, strings, unquoted urls and ``@import`` rules
+            in order of appearance, so anything inside a comment or a string
+            is skipped without removing comments first. Every pattern is
+            written to never backtrack, a malformed rule is only matched on
+            its ``@import`` keyword then scanned with ``scan_rule()``.
+        REGEX_RULE_TOKEN: Compiled regex used to scan a malformed import rule
+            by tokens.
+        RULE_ENDINGS (str): Characters that end an import rule.
+        EOF_ENDS_RULE (bool): Whether the end of content also ends an import
+            rule.
+        REGEX_RULE_COMMENTS: Compiled regex used to find comments in an
+            import rule, strings and urls are matched also to be preserved.
+        REGEX_RULE_BODY: Compiled regex used to split an import rule content
+            into its protocole and its paths.
+        REGEX_IMPORT_RULE: Compiled regex used to find ``@import`` rules. It
+            is not used anymore by ``parse()`` but kept for compatibility.
         REGEX_COMMENTS: Compiled regex used to find and remove comments.
     """
     syntax = "scss"
+    # Only the keyword letters ignore case, so search can quickly skip to
+    # each "@" character
+    REGEX_IMPORT_KEYWORD = re.compile(r"@(?i:import)")
+    REGEX_SCANNER = re.compile(r"""
+        (?=[/"'u@])(?:
+            /\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+            |/\*.*
+            |//[^\n]*
+            |"(?:\\.|[^"\\\n])*"
+            |'(?:\\.|[^'\\\n])*'
+            |url\([^)"']*\)
+            |@import(?P<rule>(?:
+                url\([^)"']*\)
+                |"(?:\\.|[^"\\\n])*"
+                |'(?:\\.|[^'\\\n])*'
+                |/\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+                |//[^\n]*(?=\n|\Z)
+                |[^;"'/u]
+                |u(?!rl\()
+                |/(?![/*])
+            )*);
+            |(?P<keyword>@import)
+        )
+    """, re.IGNORECASE | re.DOTALL | re.VERBOSE)
+    REGEX_RULE_TOKEN = re.compile(r"""
+        /\*.*?(?:\*/|\Z)
+        |//[^\n]*
+        |"(?:\\.|[^"\\\n])*"
+        |'(?:\\.|[^'\\\n])*'
+        |url\([^)"']*\)
+        |[^;"'/u]+
+        |.
+    """, re.IGNORECASE | re.DOTALL | re.VERBOSE)
+    RULE_ENDINGS = ";"
+    EOF_ENDS_RULE = False
+    REGEX_RULE_COMMENTS = re.compile(r"""
+        ("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|url\([^)"']*\))
+        |/\*.*?(?:\*/|\Z)
+        |//[^\n]*
+    """, re.IGNORECASE | re.DOTALL | re.VERBOSE)
+    REGEX_RULE_BODY = re.compile(r'\s*(url)?\s*\(?(.+?)\)?\Z',
+                                 re.IGNORECASE | re.DOTALL)
     REGEX_IMPORT_RULE = re.compile(r'@import\s*(url)?\s*\(?([^;]+?)\)?;',
                                    re.IGNORECASE)
     # Second part (for singleline comment) contain a negative lookbehind
@@ -125,10 +185,83 @@ class ScssImportsParser(object):
 
         return list(filter(self.filter_rules, rules))
 
+    def has_imports(self, content):
+        """
+        Cheap check for any ``@import`` keyword in content.
+
+        It may be a commented rule, but a content without any keyword
+        certainly has no import rules and does not need to be parsed.
+
+        Args:
+            content (str): A Sass source.
+
+        Returns:
+            bool: True if content contains an ``@import`` keyword, else False.
+        """
+        if "@import" in content:
+            return True
+
+        return self.REGEX_IMPORT_KEYWORD.search(content) is not None
+
+    def scan_rule(self, content, position):
+        """
+        Scan an import rule content by tokens until its ending.
+
+        Args:
+            content (str): A Sass source.
+            position (int): Position just after the ``@import`` keyword.
+
+        Returns:
+            tuple: Rule content (or ``None`` if rule is not ended) and the
+            position where to continue to scan.
+        """
+        match_token = self.REGEX_RULE_TOKEN.match
+        start = position
+        length = len(content)
+
+        while position < length:
+            if content[position] in self.RULE_ENDINGS:
+                return content[start:position], position + 1
+
+            position = match_token(content, position).end()
+
+        if self.EOF_ENDS_RULE:
+            return content[start:], position
+
+        return None, position
+
+    def parse_rule(self, body, rules):
+        """
+        Extract paths from an import rule content and append them to given
+        rules.
+
+        Args:
+            body (str): Import rule content between ``@import`` and its
+                ending.
+            rules (list): List where to append paths.
+        """
+        if "/*" in body or "//" in body:
+            body = self.REGEX_RULE_COMMENTS.sub(r"\1", body)
+
+        match = self.REGEX_RULE_BODY.match(body)
+        # If there is a protocole (like 'url), drop it
+        if match is None or match.group(1):
+            return
+
+        # Unquote and possibly split multiple rule in the same declaration
+        for item in match.group(2).split(","):
+            path = self.strip_quotes(item.strip())
+            if self.filter_rules(path):
+                rules.append(path)
+
     def parse(self, content):
         """
-        Parse a stylesheet document with a regex (``REGEX_IMPORT_RULE``)
-        to extract all import rules and return them.
+        Parse a stylesheet document with a single pass scanner
+        (``REGEX_SCANNER``) to extract all import rules and return them.
+
+        Comments, strings and unquoted urls are matched by scanner so they are
+        just skipped, this avoids to catch commented import rules or to take
+        a ``//`` from a string or an url for a comment.
 
         Args:
             content (str): A SCSS source.
@@ -136,12 +269,24 @@ class ScssImportsParser(object):
         Returns:
             list: Finded paths in import rules.
         """
-        # Remove all comments before searching for import rules, to not catch
-        # commented breaked import rules
-        declarations = self.REGEX_IMPORT_RULE.findall(
-            self.remove_comments(content)
-        )
-        return self.flatten_rules(declarations)
+        rules = []
+        position = 0
+
+        if not self.has_imports(content):
+            return rules
+
+        while True:
+            for match in self.REGEX_SCANNER.finditer(content, position):
+                if match.lastgroup == "rule":
+                    self.parse_rule(match.group("rule"), rules)
+                elif match.lastgroup == "keyword":
+                    # Malformed rule, scan it then restart scanner after it
+                    body, position = self.scan_rule(content, match.end())
+                    if body is not None:
+                        self.parse_rule(body, rules)
+                    break
+            else:
+                return rules
 
 
 class SassImportsParser(ScssImportsParser):
@@ -153,8 +298,46 @@ class SassImportsParser(ScssImportsParser):
     on indentation continuation.
 
     Attributes:
+        REGEX_SCANNER: Compiled regex used to scan content in a single pass,
+            import rules end with a newline instead of a semicolon.
+        REGEX_RULE_TOKEN: Compiled regex used to scan a malformed import rule
+            by tokens, newlines are matched alone since they end the rule.
+        RULE_ENDINGS (str): Characters that end an import rule.
+        EOF_ENDS_RULE (bool): The end of content also ends an import rule.
         REGEX_IMPORT_RULE: Compiled regex used to find ``@import`` rules.
     """
     syntax = "sass"
+    REGEX_SCANNER = re.compile(r"""
+        (?=[/"'u@])(?:
+            /\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+            |/\*.*
+            |//[^\n]*
+            |"(?:\\.|[^"\\\n])*"
+            |'(?:\\.|[^'\\\n])*'
+            |url\([^)"']*\)
+            |@import(?P<rule>(?:
+                url\([^)"'\n]*\)
+                |"(?:\\.|[^"\\\n])*"
+                |'(?:\\.|[^'\\\n])*'
+                |/\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+                |//[^\n]*
+                |[^;\n"'/u]
+                |u(?!rl\()
+                |/(?![/*])
+            )*)(?=\n|\Z)
+            |(?P<keyword>@import)
+        )
+    """, re.IGNORECASE | re.DOTALL | re.VERBOSE)
+    REGEX_RULE_TOKEN = re.compile(r"""
+        /\*.*?(?:\*/|\Z)
+        |//[^\n]*
+        |"(?:\\.|[^"\\\n])*"
+        |'(?:\\.|[^'\\\n])*'
+        |url\([^)"'\n]*\)
+        |[^;"'/u\n]+
+        |.
+    """, re.IGNORECASE | re.DOTALL | re.VERBOSE)
+    RULE_ENDINGS = "\n"
+    EOF_ENDS_RULE = True
     REGEX_IMPORT_RULE = re.compile(r'@import\s*(url)?\s*\(?([^;]+?)\)?(?:\n|$)',
                                    re.IGNORECASE)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Reachability
+============
+
+Reachability index is in charge to quickly answer which entrypoints are
+affected by changes on some sources.
+
+Each entrypoint is given an integer ID and each source gets a bitset (a Python
+integer) where bits are set for every entrypoint that includes it, either
+directly or through other sources. So affected entrypoints for many sources
+are just a bitwise union of their bitsets.
+
+Bitsets are computed in a single walk of the inspector graph in topological
+order, where each source bitset is propagated to its children. Sources
+involved in circular imports are processed together since they include each
+other.
+"""
+from collections import deque
+
+
+class ReachabilityIndex(object):
+    """
+    Index of entrypoints which include each source.
+
+    Index is computed on first query and each time inspector maps change,
+    see ``is_outdated()``.
+
+    Args:
+        inspector (boussole.inspector.ScssInspector): Inspector which has
+            inspected sources.
+
+    Keyword Arguments:
+        entrypoints (iterable): Source paths to index as entrypoints. Default
+            to inspector roots, which are the sources given to
+            ``ScssInspector.inspect()``.
+
+    Attributes:
+        inspector (boussole.inspector.ScssInspector): Filled from argument.
+        entrypoints (list): Entrypoint paths, sorted so each one has a stable
+            ID which is its position in list.
+        positions (dict): Entrypoint ID for each entrypoint path.
+        bitsets (list): Bitset of entrypoints for each node ID from inspector
+            graph.
+        generation (int): Inspector generation index has been computed from.
+            It is ``None`` until computed.
+    """
+    def __init__(self, inspector, entrypoints=None):
+        self.inspector = inspector
+        self._entrypoints = entrypoints
+        self.entrypoints = []
+        self.positions = {}
+        self.bitsets = []
+        self.generation = None
+
+    def is_outdated(self):
+        """
+        Check if index has to be computed again.
+
+        Returns:
+            bool: True if index has never been computed or if inspector maps
+            have changed since.
+        """
+        return self.generation != self.inspector.generation
+
+    def build(self):
+        """
+        Compute bitset of each source.
+
+        Components are walked in topological order (Kahn's algorithm), so a
+        component is only processed once every component that imports it has
+        been processed.
+        """
+        graph = self.inspector._GRAPH
+        rows = graph.children
+        # Sources involved in circular imports are grouped in components
+        # (identified by their first node), other sources are their own
+        # component
+        components = {}
+        for component in set(self.inspector.get_cyclic_components().values()):
+            nodes = sorted(graph.ids[path] for path in component)
+            for node in nodes:
+                components[node] = nodes[0]
+        members = {}
+        for node, key in components.items():
+            members.setdefault(key, []).append(node)
+
+        entrypoints = self._entrypoints
+        if entrypoints is None:
+            entrypoints = self.inspector._ROOTS
+        self.entrypoints = sorted(entrypoints)
+        self.positions = dict((k, i) for i, k in enumerate(self.entrypoints))
+
+        bitsets = [0] * len(rows)
+        for i, path in enumerate(self.entrypoints):
+            node = graph.ids.get(path)
+            if node is not None:
+                bitsets[node] |= 1 << i
+
+        # Count parent components for each component
+        incoming = [0] * len(rows)
+        for node, children in enumerate(rows):
+            if children is None:
+                continue
+            source = components.get(node, node)
+            for child in children:
+                target = components.get(child, child)
+                if target != source:
+                    incoming[target] += 1
+
+        queue = deque(
+            node for node, children in enumerate(rows)
+            if children is not None and incoming[node] == 0 and
+            components.get(node, node) == node
+        )
+
+        while queue:
+            key = queue.popleft()
+            nodes = members.get(key, (key,))
+
+            # Sources of a cycle include each other
+            bitset = 0
+            for node in nodes:
+                bitset |= bitsets[node]
+
+            for node in nodes:
+                bitsets[node] = bitset
+
+                for child in rows[node] or ():
+                    target = components.get(child, child)
+                    if target == key:
+                        continue
+
+                    bitsets[child] |= bitset
+                    incoming[target] -= 1
+                    if incoming[target] == 0:
+                        queue.append(target)
+
+        self.bitsets = bitsets
+        self.generation = self.inspector.generation
+
+    def get_bitset(self, paths):
+        """
+        Return the union of bitsets for some sources.
+
+        Index is computed before if it is outdated.
+
+        Args:
+            paths (iterable): Source paths.
+
+        Returns:
+            int: Bitset of entrypoints which include any of given sources.
+            Unknown sources are ignored.
+        """
+        if self.is_outdated():
+            self.build()
+
+        ids = self.inspector._GRAPH.ids
+        bitsets = self.bitsets
+
+        bitset = 0
+        for path in paths:
+            # An entrypoint is affected by its own changes even if it has not
+            # been inspected
+            if path in self.positions:
+                bitset |= 1 << self.positions[path]
+
+            node = ids.get(path)
+            # Nodes created after build can not be affected by anything
+            if node is not None and node < len(bitsets):
+                bitset |= bitsets[node]
+
+        return bitset
+
+    def affected(self, paths):
+        """
+        Return entrypoints affected by changes on some sources.
+
+        Args:
+            paths (iterable): Changed source paths.
+
+        Returns:
+            set: Entrypoint paths which include any of given sources, an
+            entrypoint is included if it is itself a given source.
+        """
+        bitset = self.get_bitset(paths)
+
+        affected = set()
+        while bitset:
+            lowest = bitset & -bitset
+            affected.add(self.entrypoints[lowest.bit_length() - 1])
+            bitset ^= lowest
+
+        return affected
@@ -7,10 +7,70 @@ Resolver is in charge to resolve path in import rules. Resolving is done using
 given source directory and libraries directories paths.
 """
 import os
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
 
 from .exceptions import UnresolvablePath, UnclearResolution
 
 
+@lru_cache(maxsize=4096)
+def build_candidates(filepath, extensions):
+    """
+    Build candidate paths for a path from an import rule.
+
+    Result is memoized since the same rules are commonly imported from many
+    sources, see ``ImportPathsResolver.candidate_paths()`` for details.
+
+    Args:
+        filepath (str): Relative path as finded in an import rule.
+        extensions (tuple): Candidate extensions.
+
+    Returns:
+        tuple: Builded candidate paths (as relative paths).
+    """
+    filelead, filetail = os.path.split(filepath)
+    name, extension = os.path.splitext(filetail)
+    # Removed leading dot from extension
+    if extension:
+        extension = extension[1:]
+
+    filenames = [name]
+    # If underscore prefix is present, dont need to double underscore
+    if not name.startswith('_'):
+        filenames.append("_{}".format(name))
+
+    # If explicit extension, dont need to add more candidate extensions
+    if extension and extension in extensions:
+        filenames = [".".join([k, extension]) for k in filenames]
+    # Else if no extension or not candidate, add candidate extensions
+    else:
+        # Restore uncandidate extensions if any
+        if extension:
+            filenames = [".".join([k, extension]) for k in filenames]
+        new = []
+        for ext in extensions:
+            new.extend([".".join([k, ext]) for k in filenames])
+        filenames = new
+
+    # Return candidates with restored leading path if any
+    return tuple([os.path.join(filelead, v) for v in filenames])
+
+
+def fold_name(name):
+    """
+    Fold a file name so names which may be the same entry on a case
+    insensitive or a normalizing filesystem are equal.
+
+    Args:
+        name (str): File name.
+
+    Returns:
+        str: Case folded name in Unicode normalization form NFC.
+    """
+    return unicodedata.normalize("NFC", name).casefold()
+
+
 class ImportPathsResolver(object):
     """
     Import paths resolver.
@@ -27,9 +87,30 @@ class ImportPathsResolver(object):
         STRICT_PATH_VALIDATION (bool): A switch to enabled (``True``) or
             disable (``False``) exception raising when a path can not be
             resolved.
+        DIRECTORY_LISTING_CACHE (bool): A switch to enable (``True``) or
+            disable (``False``) the directory listing cache. When enabled,
+            each directory is listed once and candidates are checked against
+            listings instead of checking each one on filesystem. Listings
+            have to be invalidated with ``invalidate_directory()`` when
+            directory contents change.
+        _DIRECTORY_LISTINGS (dict): Directory listings cache, it is lazily
+            initialized on first usage.
+        _FOLDED_LISTINGS (dict): Directory listings cache with names folded
+            with ``fold_name()``, it is lazily filled on candidate misses.
+        _LISTED_DIRECTORIES (set): Every directory paths which have been
+            listed, even if their listing has been invalidated since. It is
+            lazily initialized on first usage and never cleared by resolver.
+        _RESOLUTIONS (dict): Existing candidates cache for each rule from
+            a directory and library paths. It is disabled when ``None``, see
+            ``resolution_cache()``.
     """
     CANDIDATE_EXTENSIONS = ["scss", "sass", "css"]
     STRICT_PATH_VALIDATION = True
+    DIRECTORY_LISTING_CACHE = False
+    _DIRECTORY_LISTINGS = None
+    _FOLDED_LISTINGS = None
+    _LISTED_DIRECTORIES = None
+    _RESOLUTIONS = None
 
     def is_allowed_source(self, path):
         """
@@ -65,33 +146,14 @@ class ImportPathsResolver(object):
 
         Returns:
             list: Builded candidate paths (as relative paths).
-        """
-        filelead, filetail = os.path.split(filepath)
-        name, extension = os.path.splitext(filetail)
-        # Removed leading dot from extension
-        if extension:
-            extension = extension[1:]
-
-        filenames = [name]
-        # If underscore prefix is present, dont need to double underscore
-        if not name.startswith('_'):
-            filenames.append("_{}".format(name))
 
-        # If explicit extension, dont need to add more candidate extensions
-        if extension and extension in self.CANDIDATE_EXTENSIONS:
-            filenames = [".".join([k, extension]) for k in filenames]
-        # Else if no extension or not candidate, add candidate extensions
-        else:
-            # Restore uncandidate extensions if any
-            if extension:
-                filenames = [".".join([k, extension]) for k in filenames]
-            new = []
-            for ext in self.CANDIDATE_EXTENSIONS:
-                new.extend([".".join([k, ext]) for k in filenames])
-            filenames = new
-
-        # Return candidates with restored leading path if any
-        return [os.path.join(filelead, v) for v in filenames]
+        Note:
+            Candidates are memoized for each rule and extensions, see
+            ``build_candidates()``.
+        """
+        return list(
+            build_candidates(filepath, tuple(self.CANDIDATE_EXTENSIONS))
+        )
 
     def check_candidate_exists(self, basepath, candidates):
         """
@@ -103,15 +165,242 @@ class ImportPathsResolver(object):
 
         Returns:
             list: List of existing candidates.
+
+        Note:
+            With directory listing cache, a candidate missing from listing
+            is still checked on filesystem if its folded name matches an
+            entry, so resolution follows case insensitive or normalizing
+            filesystems like it does without cache.
         """
         checked = []
         for item in candidates:
             abspath = os.path.join(basepath, item)
-            if os.path.exists(abspath):
+
+            if self.DIRECTORY_LISTING_CACHE:
+                directory, filename = os.path.split(abspath)
+                exists = filename in self.get_directory_listing(directory)
+                if (
+                    not exists and
+                    fold_name(filename) in self.get_folded_listing(directory)
+                ):
+                    exists = os.path.exists(abspath)
+            else:
+                exists = os.path.exists(abspath)
+
+            if exists:
                 checked.append(abspath)
 
         return checked
 
+    def get_directory_listing(self, path):
+        """
+        Return names of existing entries in a directory, from cache if it has
+        already been listed.
+
+        Names follow the same rules than ``os.path.exists``, so broken
+        symbolic links are ignored.
+
+        Args:
+            path (str): Directory path. It is used as it is for cache key.
+
+        Returns:
+            frozenset: Entry names, it is empty if directory does not exist.
+        """
+        if self._DIRECTORY_LISTINGS is None:
+            self._DIRECTORY_LISTINGS = {}
+
+        if path not in self._DIRECTORY_LISTINGS:
+            names = []
+            try:
+                with os.scandir(path or os.curdir) as entries:
+                    for entry in entries:
+                        if entry.is_symlink() and not os.path.exists(entry.path):
+                            continue
+                        names.append(entry.name)
+            except OSError:
+                pass
+
+            self._DIRECTORY_LISTINGS[path] = frozenset(names)
+
+            if self._LISTED_DIRECTORIES is None:
+                self._LISTED_DIRECTORIES = set()
+            self._LISTED_DIRECTORIES.add(path)
+
+        return self._DIRECTORY_LISTINGS[path]
+
+    def get_folded_listing(self, path):
+        """
+        Return names from directory listing folded with ``fold_name()``.
+
+        Args:
+            path (str): Directory path. It is used as it is for cache key.
+
+        Returns:
+            frozenset: Folded entry names.
+        """
+        if self._FOLDED_LISTINGS is None:
+            self._FOLDED_LISTINGS = {}
+
+        if path not in self._FOLDED_LISTINGS:
+            self._FOLDED_LISTINGS[path] = frozenset(
+                fold_name(name) for name in self.get_directory_listing(path)
+            )
+
+        return self._FOLDED_LISTINGS[path]
+
+    def invalidate_directory(self, path):
+        """
+        Remove a directory listing from cache.
+
+        Every cached paths that lead to the same directory once normalized are
+        removed also.
+
+        Args:
+            path (str): Directory path.
+        """
+        if not self._DIRECTORY_LISTINGS:
+            return
+
+        path = os.path.normpath(path)
+        for key in list(self._DIRECTORY_LISTINGS):
+            if os.path.normpath(key or os.curdir) == path:
+                del self._DIRECTORY_LISTINGS[key]
+                if self._FOLDED_LISTINGS:
+                    self._FOLDED_LISTINGS.pop(key, None)
+
+    def clear_directory_listings(self):
+        """
+        Remove every directory listings from cache.
+        """
+        self._DIRECTORY_LISTINGS = {}
+        self._FOLDED_LISTINGS = {}
+
+    def find_candidates(self, import_rule, basepaths):
+        """
+        Search existing candidates for an import rule in every base paths.
+
+        If resolution cache is enabled, the result is taken from it when the
+        same rule has allready been searched in the same base paths.
+
+        Args:
+            import_rule (str): Relative path as finded in an import rule.
+            basepaths (list): Directory paths where to search for candidates.
+
+        Returns:
+            list: Existing candidate paths.
+        """
+        if self._RESOLUTIONS is not None:
+            key = (import_rule, tuple(basepaths))
+            if key not in self._RESOLUTIONS:
+                self._RESOLUTIONS[key] = tuple(
+                    self.find_candidates_uncached(import_rule, basepaths)
+                )
+
+            return list(self._RESOLUTIONS[key])
+
+        return self.find_candidates_uncached(import_rule, basepaths)
+
+    def find_candidates_uncached(self, import_rule, basepaths):
+        """
+        Same as ``find_candidates()`` without resolution cache.
+
+        Args:
+            import_rule (str): Relative path as finded in an import rule.
+            basepaths (list): Directory paths where to search for candidates.
+
+        Returns:
+            list: Existing candidate paths.
+        """
+        candidates = self.candidate_paths(import_rule)
+
+        stack = []
+        for basepath in basepaths:
+            stack.extend(self.check_candidate_exists(basepath, candidates))
+
+        return stack
+
+    def is_candidate(self, import_rule, basepaths, path):
+        """
+        Check if a path is a candidate for an import rule in some base paths,
+        whether it exists or not.
+
+        Paths are compared folded with ``fold_name()``, so a path which may
+        be a candidate on a case insensitive filesystem is a candidate.
+
+        Args:
+            import_rule (str): Relative path as finded in an import rule.
+            basepaths (list): Directory paths where to search for candidates.
+            path (str): Path to search for.
+
+        Returns:
+            bool: True if path is a candidate, else False.
+        """
+        path = fold_name(os.path.normpath(path))
+        filename = os.path.basename(path)
+
+        for candidate in self.candidate_paths(import_rule):
+            # Cheap check on filename before building full paths
+            if fold_name(os.path.basename(candidate)) != filename:
+                continue
+
+            for basepath in basepaths:
+                abspath = os.path.normpath(os.path.join(basepath, candidate))
+                if fold_name(abspath) == path:
+                    return True
+
+        return False
+
+    @contextmanager
+    def resolution_cache(self):
+        """
+        Context manager to enable resolution cache.
+
+        Every rule searched in the same base paths is resolved only once
+        during context. Filesystem is assumed to not change during context, so
+        it is meant to be used for a single inspection pass. Cache is dropped
+        when exiting the outermost context.
+        """
+        if self._RESOLUTIONS is not None:
+            yield
+            return
+
+        self._RESOLUTIONS = {}
+        try:
+            yield
+        finally:
+            self._RESOLUTIONS = None
+
+    def get_basepaths(self, sourcepath, library_paths=None):
+        """
+        Return directory paths where to search for candidates of import rules
+        from a source.
+
+        Args:
+            sourcepath (str): Source file path.
+            library_paths (list): List of directory paths for libraries.
+                Default to None.
+
+        Returns:
+            list: Source directory path then library paths.
+        """
+        basepaths = [os.path.dirname(sourcepath)]
+
+        # Add given library paths to the basepaths for resolving
+        # Accept a string if not allready in basepaths
+        if (
+            library_paths and
+            isinstance(library_paths, str) and
+            library_paths not in basepaths
+        ):
+            basepaths.append(library_paths)
+        # Add path item from list if not allready in basepaths
+        elif library_paths:
+            for k in list(library_paths):
+                if k not in basepaths:
+                    basepaths.append(k)
+
+        return basepaths
+
     def resolve(self, sourcepath, paths, library_paths=None):
         """
         Resolve given paths from given base paths
@@ -151,36 +440,19 @@ class ImportPathsResolver(object):
         # basepath is the sourcepath directory, then the optionnal
         # given libraries
         basedir, filename = os.path.split(sourcepath)
-        basepaths = [basedir]
         resolved_paths = []
 
         if paths:
-            # Add given library paths to the basepaths for resolving
-            # Accept a string if not allready in basepaths
-            if (
-                library_paths and
-                isinstance(library_paths, str) and
-                library_paths not in basepaths
-            ):
-                basepaths.append(library_paths)
-            # Add path item from list if not allready in basepaths
-            elif library_paths:
-                for k in list(library_paths):
-                    if k not in basepaths:
-                        basepaths.append(k)
+            basepaths = self.get_basepaths(sourcepath,
+                                           library_paths=library_paths)
 
             for import_rule in paths:
-                candidates = self.candidate_paths(import_rule)
+                stack = self.find_candidates(import_rule, basepaths)
 
                 # Search all existing candidates:
                 # * If more than one candidate raise an error;
                 # * If only one, accept it;
                 # * If no existing candidate raise an error;
-                stack = []
-                for i, basepath in enumerate(basepaths):
-                    checked = self.check_candidate_exists(basepath, candidates)
-                    if checked:
-                        stack.extend(checked)
 
                 # More than one existing candidate
                 if len(stack) > 1:
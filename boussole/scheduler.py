@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Compile scheduler
+=================
+
+Scheduler is in charge to compile entrypoints for the watcher with a pool of
+processes, without waiting for compiles to be finished.
+
+When a new compile of an entrypoint is requested while a previous one is
+still queued or running, the previous one is superseded: it is cancelled if
+not started yet, else its result is discarded. Workers only return compiled
+(and possibly compressed) content, which is written by scheduler if it comes
+from the latest requested compile, so an outdated output never reaches
+destination.
+
+Results are reported (written and logged) in the same order than compiles
+have been requested.
+
+Since pool workers pick compiles in request order, watcher orders entrypoints
+with a ``CompilePriority`` so the ones a developer is looking at are compiled
+first.
+"""
+import fnmatch
+import itertools
+import logging
+import os
+import threading
+
+from collections import deque, namedtuple
+from concurrent.futures import BrokenExecutor, wait
+
+from .compiler import SassCompileHelper
+from .finder import CONTENT_HASH
+
+
+CompileJob = namedtuple(
+    "CompileJob",
+    ["sourcepath", "destination", "generation", "future"]
+)
+
+
+class CompilePriority(object):
+    """
+    Order entrypoints to compile.
+
+    Pinned entrypoints come first in the order of their patterns, then
+    entrypoints from the most recently touched to the oldest one, then every
+    other ones in alphabetical order.
+
+    Keyword Arguments:
+        patterns (list): Glob patterns of pinned entrypoints, relative to
+            ``basedir``.
+        basedir (string): Directory patterns are relative to, commonly the
+            project sources directory.
+
+    Attributes:
+        patterns (list): Filled from argument.
+        basedir (string): Filled from argument.
+        touched (dict): Last touch number for each touched entrypoint, the
+            greater the more recent.
+    """
+    def __init__(self, patterns=None, basedir=None):
+        self.patterns = list(patterns or [])
+        self.basedir = basedir
+        self.touched = {}
+        self._counter = itertools.count()
+
+    def touch(self, sourcepath):
+        """
+        Mark an entrypoint as the most recently touched one.
+
+        Args:
+            sourcepath (string): Source path.
+        """
+        self.touched[sourcepath] = next(self._counter)
+
+    def get_pin(self, sourcepath):
+        """
+        Return position of the first pattern matching a source.
+
+        Args:
+            sourcepath (string): Source path.
+
+        Returns:
+            int: Pattern position, or the number of patterns if none matches.
+        """
+        if self.patterns:
+            filepath = sourcepath
+            if self.basedir:
+                filepath = os.path.relpath(sourcepath, self.basedir)
+
+            for i, pattern in enumerate(self.patterns):
+                if fnmatch.fnmatch(filepath, pattern):
+                    return i
+
+        return len(self.patterns)
+
+    def sort(self, sourcepaths):
+        """
+        Order entrypoints to compile.
+
+        Args:
+            sourcepaths (iterable): Source paths.
+
+        Returns:
+            list: Source paths in compile order.
+        """
+        return sorted(sourcepaths, key=lambda path: (
+            self.get_pin(path),
+            -self.touched.get(path, -1),
+            path,
+        ))
+
+
+class CompileScheduler(object):
+    """
+    Schedule compiles of entrypoints to a pool of processes.
+
+    Args:
+        settings (boussole.conf.model.Settings): Project settings.
+        executor (concurrent.futures.ProcessPoolExecutor): Pool of processes,
+            commonly from ``boussole.compiler.compile_pool()``.
+
+    Keyword Arguments:
+        assets (boussole.manifest.AssetManifest): Asset manifest to update
+            and save each time outputs are written, when setting
+            ``HASH_SUFFIX`` is ``CONTENT_HASH``.
+
+    Attributes:
+        settings (boussole.conf.model.Settings): Filled from argument.
+        executor (concurrent.futures.ProcessPoolExecutor): Filled from
+            argument.
+        compiler (boussole.compiler.SassCompileHelper): Sass compile helper
+            object.
+        logger (logging.Logger): Boussole logger.
+        assets (boussole.manifest.AssetManifest): Filled from argument.
+        hash_content (bool): Whether outputs are written to paths hashed from
+            their content.
+        generations (dict): Latest requested compile number for each source.
+        superseded (int): Number of compiles which have been cancelled or
+            discarded since a newer one has been requested.
+        _queue (collections.deque): Compile jobs waiting to be reported, in
+            request order.
+        _lock (threading.RLock): Lock for generations and queue, since
+            results are reported from executor thread.
+        _report_lock (threading.Lock): Lock to write results one at a time
+            in request order, it is not held when requesting compiles.
+    """
+    def __init__(self, settings, executor, assets=None):
+        self.settings = settings
+        self.executor = executor
+        self.assets = assets
+        self.hash_content = settings.HASH_SUFFIX == CONTENT_HASH
+        self.compiler = SassCompileHelper()
+        self.logger = logging.getLogger("boussole")
+
+        self.generations = {}
+        self.superseded = 0
+        self._queue = deque()
+        self._latest = {}
+        self._lock = threading.RLock()
+        self._report_lock = threading.Lock()
+
+    def submit(self, sources):
+        """
+        Request compiles, superseding previous ones for the same sources.
+
+        Args:
+            sources (list): Pairs of (source path, destination path) to
+                compile.
+
+        Returns:
+            list: Requested compile jobs.
+        """
+        jobs = []
+
+        with self._lock:
+            for sourcepath, destination in sources:
+                generation = self.generations.get(sourcepath, 0) + 1
+                self.generations[sourcepath] = generation
+
+                # Previous compile is useless if not started yet
+                previous = self._latest.get(sourcepath)
+                if previous is not None:
+                    previous.future.cancel()
+
+                self.logger.debug("Compile: {}".format(sourcepath))
+                future = self.executor.submit(
+                    self.compiler.compile_compressed,
+                    self.settings,
+                    sourcepath,
+                    destination,
+                    hash_content=self.hash_content,
+                )
+                job = CompileJob(sourcepath, destination, generation, future)
+                self._latest[sourcepath] = job
+                self._queue.append(job)
+                jobs.append(job)
+
+        # Callback is directly called from here if job is already finished
+        for job in jobs:
+            job.future.add_done_callback(self.report)
+
+        return jobs
+
+    def is_superseded(self, job):
+        """
+        Check if a newer compile has been requested for the same source.
+
+        Args:
+            job (CompileJob): Compile job.
+
+        Returns:
+            bool: True if job is not the latest one for its source.
+        """
+        return self.generations.get(job.sourcepath) != job.generation
+
+    def report(self, future=None, blocking=False):
+        """
+        Report every finished jobs from the start of queue, so jobs are
+        allways reported in request order.
+
+        This is called each time a job is finished. Outputs are written
+        without holding the lock used to request compiles, so a compile can
+        be requested (and its job reported) while another thread reports.
+
+        Keyword Arguments:
+            future (concurrent.futures.Future): Finished future, not used.
+            blocking (bool): If ``False``, nothing is done when another
+                thread is already reporting since it will report finished
+                jobs. Default to ``False``.
+        """
+        acquired = self._report_lock.acquire(blocking)
+
+        while acquired:
+            try:
+                while True:
+                    with self._lock:
+                        if not self._queue or not self._queue[0].future.done():
+                            break
+
+                        job = self._queue.popleft()
+                        if self._latest.get(job.sourcepath) is job:
+                            del self._latest[job.sourcepath]
+
+                    self.finish(job)
+            finally:
+                self._report_lock.release()
+
+            # A job may have finished after the last check, while another
+            # thread could not report it
+            with self._lock:
+                finished = bool(self._queue) and self._queue[0].future.done()
+
+            acquired = finished and self._report_lock.acquire(blocking)
+
+    def finish(self, job):
+        """
+        Write outputs of a finished job if it is not superseded and log
+        about it.
+
+        Args:
+            job (CompileJob): Finished compile job.
+        """
+        if job.future.cancelled() or self.is_superseded(job):
+            self.superseded += 1
+            self.logger.debug("Superseded: {}".format(job.sourcepath))
+            return
+
+        try:
+            success, content, sourcemap, compressed, output = (
+                job.future.result()
+            )
+            if success:
+                written = self.compiler.write_outputs(
+                    output,
+                    content,
+                    sourcemap=sourcemap,
+                    skip_unchanged=self.settings.SKIP_UNCHANGED,
+                    compressed=compressed,
+                )
+                if self.assets is not None:
+                    self.assets.update(job.destination, output)
+                    self.assets.save()
+        except (BrokenExecutor, OSError) as e:
+            self.logger.error("Unable to compile {}: {}".format(
+                job.sourcepath, e
+            ))
+            return
+
+        if success and not written:
+            self.logger.info("Unchanged: {}".format(output))
+        elif success:
+            self.logger.info("Output: {}".format(output))
+        else:
+            self.logger.error(content)
+
+    def wait(self):
+        """
+        Wait until every requested compiles have been reported.
+        """
+        while True:
+            with self._lock:
+                futures = [job.future for job in self._queue]
+
+            if not futures:
+                return
+
+            wait(futures)
+            self.report(blocking=True)
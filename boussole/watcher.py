@@ -10,13 +10,16 @@ infinite loop, so note that handlers directly output some informations on a
 """
 import os
 import logging
+import threading
 
 
 from watchdog.events import PatternMatchingEventHandler
 
 from .compiler import SassCompileHelper
 from .exceptions import BoussoleBaseException
-from .finder import ScssFinder
+from .finder import CONTENT_HASH, ScssFinder
+from .reachability import ReachabilityIndex
+from .scheduler import CompilePriority, CompileScheduler
 from .utils import match_path
 
 
@@ -32,6 +35,35 @@ class SassLibraryEventHandler(object):
         settings (boussole.conf.model.Settings): Project settings.
         inspector (boussole.inspector.ScssInspector): Inspector instance.
 
+    Keyword Arguments:
+        debounce (float): Quiet window in seconds. If not empty, events are
+            not processed as soon as they occur, instead they are collected
+            until no other event occurs during the quiet window. Then all
+            collected events are processed as a batch and every involved
+            sources are compiled only once. Default to ``0`` which disable
+            batching.
+        snapshot (boussole.cache.GraphSnapshot): Optional graph snapshot to
+            restore inspector from on full index, instead of inspecting
+            every sources.
+        executor (concurrent.futures.ProcessPoolExecutor): Optional
+            persistent pool of processes from
+            ``boussole.compiler.compile_pool()``. If given, entrypoints to
+            compile for an event are compiled concurrently with a scheduler
+            which does not wait for them, so a newer event supersedes
+            compiles that are still running. Default to ``None`` to compile
+            them sequentially in observer thread.
+        scheduler (boussole.scheduler.CompileScheduler): Scheduler to use
+            instead of creating one from ``executor``, so handlers can share
+            the same one.
+        priority (boussole.scheduler.CompilePriority): Order of entrypoints
+            to compile for an event. Default to a new one without pinned
+            entrypoints, so the most recently touched entrypoints are compiled
+            first. Handlers may share the same one.
+        assets (boussole.manifest.AssetManifest): Asset manifest to update
+            and save each time sources are compiled, when setting
+            ``HASH_SUFFIX`` is ``CONTENT_HASH``. Handlers and scheduler may
+            share the same one.
+
     Attributes:
         settings (boussole.conf.model.Settings): Filled from argument.
         logger (logging.Logger): Boussole logger.
@@ -46,6 +78,29 @@ class SassLibraryEventHandler(object):
         _event_error (bool): Internal flag setted to ``True`` if error has
             occured within an event. ``index()`` will reboot it to ``False``
             each time a new event occurs.
+        _indexed (bool): Internal flag setted to ``True`` once a full index
+            has been done so next events only patch the index.
+        _entrypoints (boussole.reachability.ReachabilityIndex): Index of
+            compilable files which include each source, see
+            ``get_entrypoints()``. It is ``None`` until needed and each time
+            compilable files change.
+        debounce (float): Filled from argument.
+        snapshot (boussole.cache.GraphSnapshot): Filled from argument.
+        executor (concurrent.futures.ProcessPoolExecutor): Filled from
+            argument.
+        scheduler (boussole.scheduler.CompileScheduler): Filled from
+            argument or created from ``executor``. It is ``None`` if handler
+            does not have any executor.
+        priority (boussole.scheduler.CompilePriority): Filled from argument.
+        assets (boussole.manifest.AssetManifest): Filled from argument.
+        _pending (list): Collected events waiting for the quiet window end.
+        _local (threading.local): Thread local storage where ``batch`` is the
+            set of sources to compile collected during a batch. It is only
+            set for the thread processing a batch, so events coming from
+            other threads meanwhile are still collected for the next batch.
+        _FLUSH_LOCK (threading.RLock): Lock shared by all handlers to ensure
+            batches are never processed concurrently since handlers share the
+            same inspector.
     """
     SUPPORTED_EVENTS = (
         "moved",
@@ -53,10 +108,20 @@ class SassLibraryEventHandler(object):
         "modified",
         "deleted",
     )
+    _FLUSH_LOCK = threading.RLock()
 
     def __init__(self, settings, inspector, *args, **kwargs):
         self.settings = settings
         self.inspector = inspector
+        self.debounce = kwargs.pop("debounce", 0)
+        self.snapshot = kwargs.pop("snapshot", None)
+        self.executor = kwargs.pop("executor", None)
+        self.assets = kwargs.pop("assets", None)
+        self.scheduler = kwargs.pop("scheduler", None)
+        if self.scheduler is None and self.executor is not None:
+            self.scheduler = CompileScheduler(settings, self.executor,
+                                              assets=self.assets)
+        self.priority = kwargs.pop("priority", None) or CompilePriority()
 
         self.logger = logging.getLogger("boussole")
         self.finder = ScssFinder()
@@ -65,6 +130,13 @@ class SassLibraryEventHandler(object):
         self.compilable_files = {}
         self.source_files = []
         self._event_error = False
+        self._indexed = False
+        self._entrypoints = None
+
+        self._pending = []
+        self._local = threading.local()
+        self._timer = None
+        self._pending_lock = threading.Lock()
 
         super(SassLibraryEventHandler, self).__init__(*args, **kwargs)
 
@@ -99,12 +171,36 @@ class SassLibraryEventHandler(object):
 
         return True
 
+    def is_moved_away(self, event):
+        """
+        Check if event is a source moved to a path which is not an allowed
+        source, like a backup file.
+
+        Args:
+            event (watchdog.events.FileSystemEvent): Watchdog file system event.
+
+        Returns:
+            bool: True if source has been moved away, else False.
+        """
+        return (
+            event.event_type == "moved" and
+            not event.is_directory and
+            self.inspector.is_allowed_source(event.src_path) and
+            not self.inspector.is_allowed_source(event.dest_path)
+        )
+
     def index(self, event):
         """
-        Reset inspector buffers and index project sources dependencies.
+        Index project sources dependencies.
 
         This have to be executed each time an event occurs.
 
+        The first time, every project sources are searched and inspected.
+        Then inspector maps are only patched for paths involved in event, see
+        ``patch_index()``. However a full index is done again if inspector
+        is not in sync with handler anymore, like after an error or if
+        another handler sharing the same inspector has changed its roots.
+
         Args:
             event (watchdog.events.FileSystemEvent): Watchdog file system event.
 
@@ -116,31 +212,268 @@ class SassLibraryEventHandler(object):
             and an error flag will be set to ``True`` so event operation will
             be stopped without blocking or breaking watchdog observer.
         """
+        self.index_batch([event])
+
+    def index_batch(self, events):
+        """
+        Index project sources dependencies for many events at once.
+
+        Directory listings are invalidated for every events first. Then a full
+        index is done at most once, since it already includes changes from
+        every events, else inspector maps are patched for each event.
+
+        Args:
+            events (list): Watchdog file system events, in the order they
+                occured.
+
+        Note:
+            Like with ``index()``, a Boussole exception is catched and set the
+            error flag, then every remaining events are ignored.
+        """
         self._event_error = False
 
-        # Don't continue for non valid event
-        if not self.is_valid_event(event):
+        # Directory listings may have changed even for an event to ignore
+        for event in events:
+            self.invalidate_listings(event)
+
+        patches = []
+        for event in events:
+            # A moved or removed directory may involve any source under it,
+            # so everything will have to be indexed again
+            if event.is_directory and event.event_type in ("moved", "deleted"):
+                self._indexed = False
+            # Don't continue for non valid event, except for a source moved to
+            # a path to ignore which is patched like a removed source
+            elif self.is_moved_away(event) or self.is_valid_event(event):
+                patches.append(event)
+
+        if not patches:
             return
 
         try:
-            compilable_files = self.finder.mirror_sources(
-                self.settings.SOURCES_PATH,
-                targetdir=self.settings.TARGET_PATH,
-                excludes=self.settings.EXCLUDES,
-                hashid=self.settings.HASH_SUFFIX,
-            )
-            self.compilable_files = dict(compilable_files)
-            self.source_files = self.compilable_files.keys()
+            if not self.is_indexed():
+                self.full_index()
+                return
+
+            for event in patches:
+                if self.is_moved_away(event):
+                    self.patch_source(event.src_path)
+                # Full index includes changes from remaining events
+                elif self.patch_index(event):
+                    break
+        except (BoussoleBaseException, OSError) as e:
+            self._event_error = True
+            self.logger.error(str(e))
+            # Inspector may be partially patched so next event will have to
+            # index everything again
+            self._indexed = False
+            self.inspector.reset()
 
-            # Init inspector and do first inspect
+    def invalidate_listings(self, event):
+        """
+        Invalidate resolver directory listings for directories involved in
+        event.
+
+        Since a directory event may change listings from every directory
+        under it, they all are invalidated in this case.
+
+        Args:
+            event (watchdog.events.FileSystemEvent): Watchdog file system event.
+        """
+        if event.is_directory:
+            self.inspector.clear_directory_listings()
+            return
+
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if path:
+                self.inspector.invalidate_directory(os.path.dirname(path))
+
+    def is_indexed(self):
+        """
+        Check if inspector is indexed and in sync with handler compilable
+        files.
+
+        Returns:
+            bool: True if inspector can be patched, else False.
+        """
+        return (
+            self._indexed and
+            self.inspector._ROOTS == set(self.compilable_files)
+        )
+
+    def full_index(self):
+        """
+        Reset inspector buffers then search and inspect every project sources.
+
+        If handler has a snapshot which can be restored, inspector is filled
+        from it and only changed sources are inspected again.
+        """
+        compilable_files = self.finder.mirror_sources(
+            self.settings.SOURCES_PATH,
+            targetdir=self.settings.TARGET_PATH,
+            excludes=self.settings.EXCLUDES,
+            hashid=self.settings.HASH_SUFFIX,
+        )
+        self.compilable_files = dict(compilable_files)
+        self.source_files = self.compilable_files.keys()
+        self._entrypoints = None
+
+        library_paths = self.settings.LIBRARY_PATHS
+
+        if self.snapshot is not None and self.snapshot.restore(
+            self.inspector,
+            library_paths=library_paths
+        ):
+            self.logger.debug("Graph snapshot restored, {} changed".format(
+                self.snapshot.revalidated
+            ))
+            # Compilable files may have changed since snapshot
+            for sourcepath in self.inspector._ROOTS - set(self.source_files):
+                self.inspector.remove_source(sourcepath,
+                                             library_paths=library_paths)
+        else:
+            # Init inspector
             self.inspector.reset()
-            self.inspector.inspect(
-                *self.source_files,
-                library_paths=self.settings.LIBRARY_PATHS
+
+        # Do first inspect, sources restored from snapshot are skipped
+        self.inspector.inspect(
+            *self.source_files,
+            library_paths=library_paths
+        )
+
+        self._indexed = True
+
+    def patch_index(self, event):
+        """
+        Patch inspector maps for paths involved in an event.
+
+        A modify event on a path which does not exist means handler is not in
+        sync with the filesystem, so a full index is done instead.
+
+        Args:
+            event (watchdog.events.FileSystemEvent): Watchdog file system event.
+
+        Returns:
+            bool: True if a full index has been done instead of a patch.
+        """
+        if (
+            event.event_type == "modified" and
+            not os.path.exists(event.src_path)
+        ):
+            self.full_index()
+            return True
+
+        if event.event_type == "moved" and event.dest_path != event.src_path:
+            self.patch_source(event.src_path)
+            self.patch_source(event.dest_path, created=True)
+        else:
+            self.patch_source(event.src_path,
+                              created=event.event_type == "created")
+
+        return False
+
+    def patch_source(self, sourcepath, created=False):
+        """
+        Patch inspector maps and compilable files for a single path depending
+        it exists or not.
+
+        Note:
+            Only sources that are already known by inspector are parsed again.
+            A new path may change how import rules from known sources are
+            resolved, these sources are resolved again, see
+            ``boussole.inspector.ScssInspector.add_source()``.
+
+        Args:
+            sourcepath (string): Sass source path.
+
+        Keyword Arguments:
+            created (bool): If ``True``, path is a new one (from a create or
+                a move) if it is not already known by inspector.
+        """
+        library_paths = self.settings.LIBRARY_PATHS
+
+        if os.path.exists(sourcepath):
+            if sourcepath in self.inspector._CHILDREN_MAP:
+                self.inspector.update_source(sourcepath,
+                                             library_paths=library_paths)
+            elif created:
+                self.inspector.add_source(sourcepath,
+                                          library_paths=library_paths)
+
+            if sourcepath not in self.compilable_files:
+                destination = self.get_compilable_destination(sourcepath)
+                if destination:
+                    self.compilable_files[sourcepath] = destination
+                    self._entrypoints = None
+                    self.inspector.inspect(sourcepath,
+                                           library_paths=library_paths)
+        else:
+            if self.compilable_files.pop(sourcepath, None):
+                self._entrypoints = None
+
+            if (
+                sourcepath in self.inspector._CHILDREN_MAP or
+                sourcepath in self.inspector._ROOTS
+            ):
+                self.inspector.remove_source(sourcepath,
+                                             library_paths=library_paths)
+
+    def get_compilable_destination(self, sourcepath):
+        """
+        Get destination for a source if it is a compilable project source.
+
+        This follows the same conditions than
+        ``boussole.finder.ScssFinder.mirror_sources``.
+
+        Args:
+            sourcepath (string): Absolute Sass source path.
+
+        Returns:
+            string or None: Destination path if source is compilable, else
+            ``None``.
+        """
+        sourcedir = os.path.join(self.settings.SOURCES_PATH, "")
+        if not sourcepath.startswith(sourcedir):
+            return None
+
+        conditions = {
+            "sourcedir": self.settings.SOURCES_PATH,
+            "nopartial": True,
+            "exclude_patterns": self.settings.EXCLUDES,
+            "excluded_libdirs": [],
+        }
+        if not self.finder.match_conditions(sourcepath, **conditions):
+            return None
+
+        return self.finder.get_destination(
+            os.path.relpath(sourcepath, self.settings.SOURCES_PATH),
+            targetdir=self.settings.TARGET_PATH,
+            hashid=self.settings.HASH_SUFFIX,
+        )
+
+    def get_entrypoints(self, sourcepath):
+        """
+        Get compilable files which include a source.
+
+        Answer comes from a reachability index over inspector maps for
+        compilable files, it is computed again only when maps or compilable
+        files change.
+
+        Args:
+            sourcepath (string): Sass source path.
+
+        Returns:
+            set: Compilable files which include the source, either directly
+            or through other sources. Source itself is included if it is a
+            compilable file.
+        """
+        if self._entrypoints is None:
+            self._entrypoints = ReachabilityIndex(
+                self.inspector,
+                entrypoints=self.compilable_files.keys()
             )
-        except BoussoleBaseException as e:
-            self._event_error = True
-            self.logger.error(str(e))
+
+        return self._entrypoints.affected([sourcepath])
 
     def compile_source(self, sourcepath):
         """
@@ -158,8 +491,6 @@ class SassLibraryEventHandler(object):
             been compiled (or at least tried). If the source was not
             eligible to compile, return will be ``None``.
         """
-        relpath = os.path.relpath(sourcepath, self.settings.SOURCES_PATH)
-
         conditions = {
             "sourcedir": None,
             "nopartial": True,
@@ -167,31 +498,92 @@ class SassLibraryEventHandler(object):
             "excluded_libdirs": self.settings.LIBRARY_PATHS,
         }
         if self.finder.match_conditions(sourcepath, **conditions):
-            destination = self.finder.get_destination(
-                relpath,
-                targetdir=self.settings.TARGET_PATH
-            )
+            return self.compile_entrypoint(sourcepath)
 
-            self.logger.debug("Compile: {}".format(sourcepath))
-            success, message = self.compiler.safe_compile(
-                self.settings,
+        return None
+
+    def compile_entrypoint(self, sourcepath):
+        """
+        Compile a compilable file to its destination, without checking if it
+        is eligible to compile.
+
+        Args:
+            sourcepath (string): Sass source path to compile to its
+                destination using project settings.
+
+        Returns:
+            tuple: A pair of (sourcepath, destination).
+        """
+        return self.compile_entrypoints([sourcepath])[0]
+
+    def compile_entrypoints(self, sourcepaths):
+        """
+        Compile many compilable files to their destination, without checking
+        if they are eligible to compile.
+
+        If handler has a scheduler, files are just submitted to it and
+        compiled concurrently, see ``boussole.scheduler.CompileScheduler``.
+        Results are allways logged in the given order.
+
+        Args:
+            sourcepaths (list): Sass source paths to compile to their
+                destination using project settings.
+
+        Returns:
+            list: Pairs of (sourcepath, destination), in the given order.
+        """
+        sources = [
+            (
                 sourcepath,
-                destination
+                self.finder.get_destination(
+                    os.path.relpath(sourcepath, self.settings.SOURCES_PATH),
+                    targetdir=self.settings.TARGET_PATH
+                )
             )
+            for sourcepath in sourcepaths
+        ]
 
-            if success:
+        if self.scheduler is not None:
+            self.scheduler.submit(sources)
+            return sources
+
+        compiled = self.compiler.compile_many(
+            self.settings,
+            sources,
+            hash_content=self.settings.HASH_SUFFIX == CONTENT_HASH,
+        )
+        updated = False
+        for sourcepath, destination, success, message, unchanged in compiled:
+            self.logger.debug("Compile: {}".format(sourcepath))
+
+            if success and unchanged:
+                self.logger.info("Unchanged: {}".format(message))
+            elif success:
                 self.logger.info("Output: {}".format(message))
             else:
                 self.logger.error(message)
 
-            return sourcepath, destination
+            if success and self.assets is not None:
+                self.assets.update(destination, message)
+                updated = True
 
-        return None
+        if updated:
+            self.assets.save()
+
+        return sources
 
     def compile_dependencies(self, sourcepath, include_self=False):
         """
         Register source(s) for compile and possibly its dependencies.
 
+        Only compilable files which include the source are compiled, they are
+        directly known from ``get_entrypoints()``. They are compiled in order
+        from ``priority``, where a compiled source is the most recently
+        touched one.
+
+        During a batch, sources are only collected to be compiled at the end
+        of batch.
+
         Args:
             sourcepath (string): Sass source path to compile to its
                 destination using project settings.
@@ -200,13 +592,100 @@ class SassLibraryEventHandler(object):
             include_self (bool): If ``True`` the given sourcepath is added to
                 items to compile, else only its dependencies are compiled.
         """
-        items = self.inspector.parents(sourcepath)
+        items = self.get_entrypoints(sourcepath)
+
+        # Source is an entrypoint itself
+        if not include_self:
+            items.discard(sourcepath)
+        elif sourcepath in items:
+            self.priority.touch(sourcepath)
+
+        if self.is_flushing():
+            self._local.batch.update(items)
+            return []
 
-        # Also add the current event related path
-        if include_self:
-            items.add(sourcepath)
+        return self.compile_entrypoints(self.priority.sort(items))
+
+    def is_flushing(self):
+        """
+        Check if current thread is processing a batch.
 
-        return filter(None, [self.compile_source(item) for item in items])
+        Returns:
+            bool: True if current thread is processing a batch.
+        """
+        return getattr(self._local, "batch", None) is not None
+
+    def is_deferred(self):
+        """
+        Check if events have to be collected instead of being processed.
+
+        Returns:
+            bool: True if events are batched and current thread is not the
+            one processing a batch.
+        """
+        return bool(self.debounce) and not self.is_flushing()
+
+    def defer(self, event):
+        """
+        Collect an event and (re)start the quiet window timer.
+
+        Args:
+            event: Watchdog event ``watchdog.events.FileSystemEvent``.
+        """
+        with self._pending_lock:
+            self._pending.append(event)
+
+            if self._timer is not None:
+                self._timer.cancel()
+
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """
+        Process every collected events as a single batch.
+
+        Events are indexed at once, see ``index_batch()``. Then each event is
+        handled like it would be without batching, except sources to compile
+        are collected. Finally the union of collected sources is compiled
+        once, ignoring sources that do not exist anymore.
+
+        Events coming from other threads while batch is processing are
+        collected for the next batch.
+
+        Returns:
+            list: Pairs of (sourcepath, destination) for compiled sources.
+        """
+        with self._pending_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            events = self._pending
+            self._pending = []
+
+        if not events:
+            return []
+
+        with self._FLUSH_LOCK:
+            self.logger.debug("Processing {} event(s)".format(len(events)))
+
+            self._local.batch = set()
+            try:
+                self.index_batch(events)
+                for event in events:
+                    handler = getattr(
+                        self, "on_{}".format(event.event_type), None
+                    )
+                    if handler is not None:
+                        handler(event)
+            finally:
+                items = self._local.batch
+                self._local.batch = None
+
+            return self.compile_entrypoints(self.priority.sort(
+                item for item in items if os.path.exists(item)
+            ))
 
     def on_any_event(self, event):
         """
@@ -215,9 +694,19 @@ class SassLibraryEventHandler(object):
         Before any event, we index project to have the right and current
         dependencies map.
 
+        If events are batched, event is just collected to be processed later.
+        Events dispatched again from a batch have already been indexed.
+
         Args:
             event: Watchdog event ``watchdog.events.FileSystemEvent``.
         """
+        if self.is_deferred():
+            self.defer(event)
+            return
+
+        if self.is_flushing():
+            return
+
         self.index(event)
 
     def on_moved(self, event):
@@ -231,7 +720,7 @@ class SassLibraryEventHandler(object):
             event: Watchdog event, either ``watchdog.events.DirMovedEvent`` or
                 ``watchdog.events.FileModifiedEvent``.
         """
-        if not self._event_error:
+        if not self._event_error and not self.is_deferred():
             # We are only interested for final file, not transitional file
             # from editors (like *.part)
             pathtools_options = {
@@ -262,7 +751,7 @@ class SassLibraryEventHandler(object):
             event: Watchdog event, either ``watchdog.events.DirCreatedEvent``
                 or ``watchdog.events.FileCreatedEvent``.
         """
-        if not self._event_error:
+        if not self._event_error and not self.is_deferred():
             self.logger.info(
                 "Change detected from a create on: {}".format(event.src_path)
             )
@@ -277,7 +766,7 @@ class SassLibraryEventHandler(object):
             event: Watchdog event, ``watchdog.events.DirModifiedEvent`` or
                 ``watchdog.events.FileModifiedEvent``.
         """
-        if not self._event_error:
+        if not self._event_error and not self.is_deferred():
             self.logger.info(
                 "Change detected from an edit on: {}".format(event.src_path)
             )
@@ -292,7 +781,7 @@ class SassLibraryEventHandler(object):
             event: Watchdog event, ``watchdog.events.DirDeletedEvent`` or
                 ``watchdog.events.FileDeletedEvent``.
         """
-        if not self._event_error:
+        if not self._event_error and not self.is_deferred():
             self.logger.info(
                 "Change detected from deletion of: {}".format(event.src_path)
             )
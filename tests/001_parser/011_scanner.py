@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from boussole.exceptions import InvalidImportRule
+
+
+@pytest.mark.parametrize("source,expected", [
+    # Double slash in strings and urls are not comments
+    (
+        (
+            """$url: "http://foo.bar/baz"; @import "a";\n"""
+            """.foo{ background: url(//cdn.bar/img.png); }\n"""
+            """@import 'b';"""
+        ),
+        ["a", "b"],
+    ),
+    # Import rule inside a string is ignored
+    (
+        """.foo:before{ content: "@import 'nope';"; }\n@import "a";""",
+        ["a"],
+    ),
+    # Comments inside a multiline rule
+    (
+        (
+            """@import "a", // first\n"""
+            """    /* second; */ "b",\n"""
+            """    "c";"""
+        ),
+        ["a", "b", "c"],
+    ),
+    # Semicolon in a string does not end rule
+    (
+        """@import "a;b", "c";""",
+        ["a;b", "c"],
+    ),
+    # Unterminated multiline comment hides everything after it
+    (
+        """@import "a";\n/* @import "b";""",
+        ["a"],
+    ),
+    # Url and css imports are ignored
+    (
+        """@import url("//foo/bar");\n@import "foo.css", "c";""",
+        ["c"],
+    ),
+    # Unterminated rule is ignored
+    (
+        """@import "a\"""",
+        [],
+    ),
+])
+def test_scss_scanner(parser, source, expected):
+    assert parser.parse(source) == expected
+
+
+def test_scss_badly_quoted(parser):
+    with pytest.raises(InvalidImportRule):
+        parser.parse("""@import "a;\n""")
+
+
+@pytest.mark.parametrize("source,expected", [
+    (
+        (
+            """$url: "http://foo.bar/baz"\n"""
+            """@import a // comment\n"""
+            """@import "b", 'c'\n"""
+            """.foo\n"""
+            """  background: url(//cdn.bar/img.png)"""
+        ),
+        ["a", "b", "c"],
+    ),
+    (
+        """// @import nope\n@import a""",
+        ["a"],
+    ),
+])
+def test_sass_scanner(sass_parser, source, expected):
+    assert sass_parser.parse(source) == expected
+
+
+@pytest.mark.parametrize("source,expected", [
+    ("""$foo: 42px;\n@mixin bar { color: red; }""", False),
+    ("""@import "a";""", True),
+    ("""@IMPORT "a";""", True),
+    # Commented keyword is not excluded from the cheap check
+    ("""// @Import "a";""", True),
+])
+def test_has_imports(parsers, source, expected):
+    for parser in parsers.values():
+        assert parser.has_imports(source) is expected
@@ -10,6 +10,7 @@ import pytest
     ("foo.scss", "css", "hash", "foo.hash.css"),
     ("foo.backup.scss", "css", "hash", "foo.backup.hash.css"),
     ("/home/bar/foo.backup.scss", "css", "hash", "/home/bar/foo.backup.hash.css"),
+    ("foo.scss", "css", ":content", "foo.css"),
 ])
 def test_change_extension(settings, finder, source, new, hashid, expected):
     result = finder.change_extension(source, new, hashid)
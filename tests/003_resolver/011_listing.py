@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from boussole.exceptions import UnclearResolution
+from boussole.resolver import ImportPathsResolver
+
+
+@pytest.fixture
+def listing_resolver():
+    resolver = ImportPathsResolver()
+    resolver.DIRECTORY_LISTING_CACHE = True
+    return resolver
+
+
+@pytest.mark.parametrize("path", [
+    "vendor",
+    "components/_filename_test_2",
+    "components/filename_test_6.plop.scss",
+    "nope",
+])
+def test_check_same_results(settings, resolver, listing_resolver, path):
+    """
+    Candidate checks from directory listings should have the same results than
+    checks on filesystem
+    """
+    candidates = resolver.candidate_paths(path)
+
+    expected = resolver.check_candidate_exists(settings.sample_path, candidates)
+    results = listing_resolver.check_candidate_exists(settings.sample_path,
+                                                      candidates)
+
+    assert results == expected
+
+
+def test_resolve_unclear(settings, parser, listing_resolver):
+    """
+    Unclear resolution is still detected from directory listings
+    """
+    sourcepath = os.path.join(settings.sample_path, "main_twins_1.scss")
+    with open(sourcepath) as fp:
+        finded_paths = parser.parse(fp.read())
+
+    with pytest.raises(UnclearResolution):
+        listing_resolver.resolve(
+            sourcepath,
+            finded_paths,
+            library_paths=settings.libraries_fixture_paths
+        )
+
+
+def test_listing_invalidate(temp_builds_dir, listing_resolver):
+    """
+    Directory listing is reused until it has been invalidated
+    """
+    basedir = temp_builds_dir.join("resolver_listing_invalidate").strpath
+    os.makedirs(basedir)
+
+    candidates = listing_resolver.candidate_paths("foo")
+
+    assert listing_resolver.check_candidate_exists(basedir, candidates) == []
+
+    with open(os.path.join(basedir, "_foo.scss"), "w") as fp:
+        fp.write("")
+
+    # Listing is still the cached one
+    assert listing_resolver.check_candidate_exists(basedir, candidates) == []
+
+    listing_resolver.invalidate_directory(basedir + os.sep)
+
+    assert listing_resolver.check_candidate_exists(basedir, candidates) == [
+        os.path.join(basedir, "_foo.scss"),
+    ]
+
+
+def test_listing_case_insensitive(monkeypatch, temp_builds_dir, resolver,
+                                  listing_resolver):
+    """
+    A candidate missing from listing but matching an entry once folded is
+    checked on filesystem, so resolution still follows a case insensitive
+    filesystem
+    """
+    basedir = temp_builds_dir.join("resolver_listing_insensitive").strpath
+    os.makedirs(basedir)
+
+    with open(os.path.join(basedir, "_mixins.scss"), "w") as fp:
+        fp.write("")
+
+    # Emulate a case insensitive filesystem
+    real_exists = os.path.exists
+    checked = []
+
+    def insensitive_exists(path):
+        checked.append(path)
+        directory, filename = os.path.split(path)
+        return real_exists(directory) and filename.lower() in [
+            name.lower() for name in os.listdir(directory)
+        ]
+
+    monkeypatch.setattr(os.path, "exists", insensitive_exists)
+
+    candidates = resolver.candidate_paths("Mixins")
+
+    expected = resolver.check_candidate_exists(basedir, candidates)
+    del checked[:]
+    results = listing_resolver.check_candidate_exists(basedir, candidates)
+
+    assert expected == [os.path.join(basedir, "_Mixins.scss")]
+    assert results == expected
+    # Only the candidate with a folded match has been checked on filesystem
+    assert checked == [os.path.join(basedir, "_Mixins.scss")]
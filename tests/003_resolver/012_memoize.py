@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import os
+
+from boussole.resolver import build_candidates
+
+
+def test_candidates_memoized(resolver):
+    """
+    Candidates are memoized but returned list is a new one each time
+    """
+    build_candidates.cache_clear()
+
+    first = resolver.candidate_paths("components/settings")
+    first.append("foo")
+    second = resolver.candidate_paths("components/settings")
+
+    assert "foo" not in second
+    assert second == [
+        "components/settings.scss",
+        "components/_settings.scss",
+        "components/settings.sass",
+        "components/_settings.sass",
+        "components/settings.css",
+        "components/_settings.css",
+    ]
+    assert build_candidates.cache_info().hits == 1
+
+
+def test_candidates_extensions(resolver):
+    """
+    Candidates are memoized per extensions
+    """
+    resolver.CANDIDATE_EXTENSIONS = ["scss"]
+
+    assert resolver.candidate_paths("settings") == [
+        "settings.scss",
+        "_settings.scss",
+    ]
+
+
+def test_resolution_cache(settings, resolver):
+    """
+    Same rule from the same directory is searched only once during resolution
+    cache context
+    """
+    calls = []
+    find_candidates_uncached = resolver.find_candidates_uncached
+
+    def counted(*args):
+        calls.append(args)
+        return find_candidates_uncached(*args)
+
+    resolver.find_candidates_uncached = counted
+
+    sourcepath = os.path.join(settings.sample_path, "main_basic.scss")
+    expected = [os.path.join(settings.sample_path, "_vendor.scss")]
+
+    with resolver.resolution_cache():
+        with resolver.resolution_cache():
+            assert resolver.resolve(sourcepath, ["vendor"]) == expected
+        assert resolver.resolve(sourcepath, ["vendor"]) == expected
+
+    assert len(calls) == 1
+    assert resolver._RESOLUTIONS is None
+
+    # Cache is disabled outside of context
+    assert resolver.resolve(sourcepath, ["vendor"]) == expected
+    assert len(calls) == 2
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import os
+
+from boussole.cache import ParseCache, file_fingerprint, get_cache_dir
+
+
+def test_get_set():
+    """
+    Cached rules are only returned for the same fingerprint
+    """
+    cache = ParseCache()
+
+    assert cache.get("/foo.scss", [1, 42]) is None
+
+    cache.set("/foo.scss", [1, 42], ["bar", "ping"])
+
+    assert cache.get("/foo.scss", [1, 42]) == ["bar", "ping"]
+    assert cache.get("/foo.scss", [2, 42]) is None
+    assert cache.get("/foo.scss", [1, 43]) is None
+
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 3}
+
+
+def test_lru_eviction():
+    """
+    Least recently used entries are evicted first
+    """
+    cache = ParseCache(maxsize=2)
+
+    cache.set("/a.scss", [1, 1], [])
+    cache.set("/b.scss", [1, 1], [])
+    # Touch 'a' so 'b' becomes the least recently used
+    cache.get("/a.scss", [1, 1])
+    cache.set("/c.scss", [1, 1], [])
+
+    assert len(cache) == 2
+    assert cache.get("/b.scss", [1, 1]) is None
+    assert cache.get("/a.scss", [1, 1]) == []
+    assert cache.get("/c.scss", [1, 1]) == []
+
+
+def test_persistence(temp_builds_dir):
+    """
+    Entries are saved to and loaded from cache file, keeping their usage order
+    """
+    filepath = temp_builds_dir.join("parse_cache/persistence.json").strpath
+
+    cache = ParseCache(filepath=filepath, maxsize=2)
+    cache.set("/a.scss", [1, 1], ["foo"])
+    cache.set("/b.scss", [1, 1], ["bar"])
+    cache.get("/a.scss", [1, 1])
+    cache.save()
+
+    loaded = ParseCache(filepath=filepath, maxsize=2)
+    loaded.load()
+
+    assert loaded.stats() == {"entries": 2, "hits": 0, "misses": 0}
+    assert loaded.get("/b.scss", [1, 1]) == ["bar"]
+
+    # 'a' is now the least recently used
+    loaded.set("/c.scss", [1, 1], [])
+    assert loaded.get("/a.scss", [1, 1]) is None
+
+
+def test_invalid_file(temp_builds_dir):
+    """
+    Invalid cache file is ignored
+    """
+    filepath = temp_builds_dir.join("parse_cache_invalid.json").strpath
+    with open(filepath, "w") as fp:
+        fp.write("Not JSON")
+
+    cache = ParseCache(filepath=filepath)
+    cache.load()
+
+    assert len(cache) == 0
+
+
+def test_fingerprint(temp_builds_dir):
+    """
+    Fingerprint is made from modification time and size
+    """
+    filepath = temp_builds_dir.join("parse_cache_fingerprint.scss").strpath
+    with open(filepath, "w") as fp:
+        fp.write("foo")
+
+    mtime, size = file_fingerprint(filepath)
+
+    assert size == 3
+    assert mtime == os.stat(filepath).st_mtime_ns
+
+
+def test_cache_dir(monkeypatch):
+    """
+    Cache directory can be set from environment
+    """
+    monkeypatch.setenv("BOUSSOLE_CACHE_DIR", "/foo/bar")
+    assert get_cache_dir() == "/foo/bar"
+
+    monkeypatch.delenv("BOUSSOLE_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/ping")
+    assert get_cache_dir() == "/ping/boussole"
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+
+from boussole.cache import GraphSnapshot, ParseCache
+from boussole.inspector import ScssInspector
+
+
+def write(basedir, path, content):
+    with io.open(os.path.join(basedir, path), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def build_snapshot(basedir):
+    """
+    Build a small structure, inspect it and save its snapshot.
+
+    Return the snapshot, the inspected roots and a function to join path to
+    basedir.
+    """
+    os.makedirs(basedir)
+
+    write(basedir, "main.scss", """@import "a";\n@import "b";""")
+    write(basedir, "other.scss", """@import "b";""")
+    write(basedir, "_a.scss", """@import "c";""")
+    write(basedir, "_b.scss", """/* B */""")
+    write(basedir, "_c.scss", """/* C */""")
+
+    def join(path):
+        return os.path.join(basedir, path)
+
+    roots = [join("main.scss"), join("other.scss")]
+
+    inspector = ScssInspector(listing_cache=True)
+    inspector.inspect(*roots)
+
+    # Snapshot is not stored in a listed directory since it would change it
+    snapshot = GraphSnapshot(filepath=basedir + ".json")
+    assert snapshot.save(inspector) is True
+
+    return snapshot, roots, join
+
+
+def assert_same_as_full(inspector, roots):
+    """
+    Restored maps should be identical to the ones from a full inspection
+    """
+    expected = ScssInspector()
+    expected.inspect(*roots)
+
+    assert inspector._CHILDREN_MAP == expected._CHILDREN_MAP
+    assert inspector._PARENTS_MAP == expected._PARENTS_MAP
+    assert inspector._ROOTS == set(roots)
+
+
+def test_restore(temp_builds_dir):
+    """
+    Unchanged sources are restored without being parsed
+    """
+    basedir = temp_builds_dir.join("snapshot_restore").strpath
+    snapshot, roots, join = build_snapshot(basedir)
+
+    cache = ParseCache()
+    inspector = ScssInspector(cache=cache, listing_cache=True)
+
+    assert snapshot.restore(inspector) is True
+    assert snapshot.revalidated == 0
+    assert inspector.visited == 0
+    assert cache.stats()["misses"] == 0
+    assert_same_as_full(inspector, roots)
+
+
+def test_restore_changed(temp_builds_dir):
+    """
+    Changed sources are inspected again
+    """
+    basedir = temp_builds_dir.join("snapshot_changed").strpath
+    snapshot, roots, join = build_snapshot(basedir)
+
+    write(basedir, "_b.scss", """@import "c";""")
+
+    inspector = ScssInspector(listing_cache=True)
+
+    assert snapshot.restore(inspector) is True
+    assert snapshot.revalidated == 1
+    assert inspector.children(join("other.scss")) == set([
+        join("_b.scss"), join("_c.scss")
+    ])
+    assert_same_as_full(inspector, roots)
+
+
+def test_restore_invalid(temp_builds_dir):
+    """
+    Snapshot is not restored if a listed directory has changed or with other
+    library paths
+    """
+    basedir = temp_builds_dir.join("snapshot_invalid").strpath
+    snapshot, roots, join = build_snapshot(basedir)
+
+    inspector = ScssInspector(listing_cache=True)
+
+    assert snapshot.restore(inspector, library_paths=[basedir]) is False
+    assert inspector._CHILDREN_MAP == {}
+
+    # A new file may change resolution of any rule
+    write(basedir, "_d.scss", """/* D */""")
+
+    assert snapshot.restore(inspector) is False
+    assert inspector._CHILDREN_MAP == {}
+
+    # Snapshot requires listing cache
+    assert snapshot.restore(ScssInspector()) is False
+    assert snapshot.save(ScssInspector()) is False
+
+    # Missing snapshot
+    snapshot = GraphSnapshot(filepath=basedir + "-nope.json")
+    assert snapshot.restore(inspector) is False
+
+
+def test_filename():
+    """
+    Snapshot filename depends on given key
+    """
+    assert GraphSnapshot.get_filename("/foo") == GraphSnapshot.get_filename("/foo")
+    assert GraphSnapshot.get_filename("/foo") != GraphSnapshot.get_filename("/bar")
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+
+import sass
+
+from boussole.cache import CompileCache
+from boussole.compiler import SassCompileHelper
+from boussole.conf.model import Settings
+from boussole.inspector import ScssInspector
+
+
+def write(basedir, path, content):
+    with io.open(os.path.join(basedir, path), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def build_project(basedir):
+    """
+    Build a small project and return its settings and sources
+    """
+    os.makedirs(os.path.join(basedir, "scss"))
+
+    write(basedir, "scss/main.scss", """@import "vars";\n#main{ color: $c; }""")
+    write(basedir, "scss/other.scss", """#other{ color: red; }""")
+    write(basedir, "scss/_vars.scss", """$c: red;""")
+
+    settings = Settings(initial={
+        "SOURCES_PATH": os.path.join(basedir, "scss"),
+        "TARGET_PATH": os.path.join(basedir, "css"),
+        "SOURCE_MAP": True,
+        "OUTPUT_STYLES": "compact",
+    })
+
+    sources = [
+        (
+            os.path.join(basedir, "scss", "{}.scss".format(name)),
+            os.path.join(basedir, "css", "{}.css".format(name)),
+        )
+        for name in ("main", "other")
+    ]
+
+    return settings, sources
+
+
+def test_key(temp_builds_dir):
+    """
+    Key only depends on closure contents, not on checkout location
+    """
+    first = temp_builds_dir.join("compile_cache_key_1").strpath
+    second = temp_builds_dir.join("compile_cache_key_2").strpath
+
+    cache = CompileCache(inspector=ScssInspector(),
+                         directory=temp_builds_dir.join("compile_cache_key").strpath)
+
+    settings, sources = build_project(first)
+    other_settings, other_sources = build_project(second)
+
+    keys = [cache.get_key(settings, src, dst) for src, dst in sources]
+    assert keys[0] != keys[1]
+    assert [
+        cache.get_key(other_settings, src, dst) for src, dst in other_sources
+    ] == keys
+
+    # Imported source has changed
+    write(second, "scss/_vars.scss", """$c: blue;""")
+    assert cache.get_key(other_settings, *other_sources[0]) != keys[0]
+    assert cache.get_key(other_settings, *other_sources[1]) == keys[1]
+
+    # Compile relevant setting has changed
+    settings.OUTPUT_STYLES = "expanded"
+    assert cache.get_key(settings, *sources[1]) != keys[1]
+
+    # Unresolvable import
+    write(first, "scss/other.scss", """@import "nope";""")
+    cache.inspector.reset()
+    assert cache.get_key(settings, *sources[1]) is None
+
+
+def test_compile_many(temp_builds_dir, monkeypatch):
+    """
+    Cached outputs are written instead of compiling again
+    """
+    first = temp_builds_dir.join("compile_cache_many_1").strpath
+    second = temp_builds_dir.join("compile_cache_many_2").strpath
+    directory = temp_builds_dir.join("compile_cache_many").strpath
+
+    compiler = SassCompileHelper()
+
+    settings, sources = build_project(first)
+    cache = CompileCache(inspector=ScssInspector(), directory=directory)
+    results = list(compiler.compile_many(settings, sources, cache=cache))
+    assert [item[2] for item in results] == [True, True]
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    def compile(*args, **kwargs):
+        raise AssertionError("Cached sources should not be compiled")
+
+    monkeypatch.setattr(sass, "compile", compile)
+
+    # Another checkout of the same sources
+    other_settings, other_sources = build_project(second)
+    cache = CompileCache(inspector=ScssInspector(), directory=directory)
+    results = list(compiler.compile_many(other_settings, other_sources,
+                                         cache=cache))
+    assert [item[:4] for item in results] == [
+        (src, dst, True, dst) for src, dst in other_sources
+    ]
+    assert (cache.hits, cache.misses) == (2, 0)
+
+    for name in ("main.css", "main.map", "other.css", "other.map"):
+        with io.open(os.path.join(first, "css", name)) as f:
+            expected = f.read()
+        with io.open(os.path.join(second, "css", name)) as f:
+            assert f.read() == expected
+
+
+def test_evict(temp_builds_dir):
+    """
+    Least recently used entries are removed when cache is too big and
+    counters are cumulated over saves
+    """
+    directory = temp_builds_dir.join("compile_cache_evict").strpath
+    cache = CompileCache(directory=directory, max_size=2048)
+
+    for i, key in enumerate(("aa01", "bb02", "cc03")):
+        cache.set(key, "x" * 900)
+        os.utime(cache.get_path(key), (1000 + i, 1000 + i))
+
+    # Oldest one becomes the most recently used
+    assert cache.get("aa01") == ("x" * 900, None)
+    assert cache.get("dd04") is None
+
+    assert cache.save() == 1
+    assert cache.get("aa01") is not None
+    assert cache.get("bb02") is None
+    assert cache.get("cc03") is not None
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["hits"] == 3
+    assert stats["misses"] == 2
+
+    cache.clear()
+    assert cache.stats() == {
+        "entries": 0,
+        "size": 0,
+        "max_size": 2048,
+        "hits": 0,
+        "misses": 0,
+    }
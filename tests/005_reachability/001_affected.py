@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import os
+
+from boussole.inspector import ScssInspector
+from boussole.reachability import ReachabilityIndex
+
+
+def test_same_as_parents(settings):
+    """
+    Affected entrypoints should be the same than from parents
+    """
+    sources = [
+        os.path.join(settings.sample_path, k)
+        for k in (
+            "main_basic.scss",
+            "main_depth_import-1.scss",
+            "main_depth_import-2.scss",
+            "main_depth_import-3.scss",
+            "main_syntax.scss",
+            "main_using_libs.scss",
+            "main_with_subimports.scss",
+        )
+    ]
+
+    inspector = ScssInspector()
+    inspector.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+
+    index = ReachabilityIndex(inspector)
+
+    for path in inspector._CHILDREN_MAP:
+        expected = (inspector.parents(path) | set([path])) & set(sources)
+        assert index.affected([path]) == expected
+
+    # Union for many sources at once
+    partials = [
+        os.path.join(settings.sample_path, "_vendor.scss"),
+        os.path.join(settings.sample_path, "main_depth_import-1.scss"),
+    ]
+    expected = (
+        inspector.parents(partials[0]) | inspector.parents(partials[1]) |
+        set([partials[1]])
+    ) & set(sources)
+    assert index.affected(partials) == expected
+
+    assert index.affected(["/nope.scss"]) == set()
+
+
+def test_circular(settings):
+    """
+    Sources involved in a circular import include each other
+    """
+    def path(name):
+        return os.path.join(settings.sample_path, name)
+
+    inspector = ScssInspector()
+    inspector.inspect(path("main_circular_3.scss"), path("main_circular_5.scss"))
+
+    index = ReachabilityIndex(inspector, entrypoints=[
+        path("main_circular_4.scss"),
+        path("main_circular_5.scss"),
+    ])
+
+    assert index.affected([path("main_circular_3.scss")]) == set([
+        path("main_circular_4.scss"),
+        path("main_circular_5.scss"),
+    ])
+    assert index.affected([path("main_circular_5.scss")]) == set([
+        path("main_circular_5.scss"),
+    ])
+
+
+def test_outdated(settings):
+    """
+    Index is computed again only when inspector maps change
+    """
+    def path(name):
+        return os.path.join(settings.sample_path, name)
+
+    inspector = ScssInspector()
+    inspector.inspect(path("main_basic.scss"))
+
+    index = ReachabilityIndex(inspector)
+    assert index.affected([path("_vendor.scss")]) == set([
+        path("main_basic.scss"),
+    ])
+    bitsets = index.bitsets
+
+    inspector.update_source(path("main_basic.scss"))
+    assert index.is_outdated() is False
+
+    inspector.inspect(path("main_with_subimports.scss"))
+    assert index.is_outdated() is True
+    assert index.affected([path("_vendor.scss")]) == set([
+        path("main_basic.scss"),
+        path("main_with_subimports.scss"),
+    ])
+    assert index.bitsets is not bitsets
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from boussole.graph import DependencyGraph, RelationsView
+from boussole.inspector import ScssInspector
+
+
+def test_intern():
+    """
+    Each path should be interned once with its own node ID
+    """
+    graph = DependencyGraph()
+
+    assert graph.intern("/a.scss") == 0
+    assert graph.intern("/b.scss") == 1
+    assert graph.intern("/a.scss") == 0
+
+    assert graph.paths == ["/a.scss", "/b.scss"]
+    assert graph.get_paths([1, 0]) == ["/b.scss", "/a.scss"]
+
+
+def test_parents():
+    """
+    Parents should not have duplicates and be removed once empty
+    """
+    graph = DependencyGraph()
+    a, b, c = [graph.intern(k) for k in ("/a.scss", "/b.scss", "/c.scss")]
+
+    graph.add_parent(c, a)
+    graph.add_parent(c, b)
+    graph.add_parent(c, a)
+    assert list(graph.parents[c]) == [a, b]
+
+    assert graph.discard_parent(c, a) is False
+    assert graph.discard_parent(c, a) is False
+    assert graph.discard_parent(c, b) is True
+    assert graph.parents[c] is None
+    assert graph.discard_parent(c, b) is False
+
+
+def test_views():
+    """
+    Views should behave like the former dictionnaries of paths
+    """
+    graph = DependencyGraph()
+    children = RelationsView(graph, "children")
+    parents = RelationsView(graph, "parents")
+
+    a, b, c = [graph.intern(k) for k in ("/a.scss", "/b.scss", "/c.scss")]
+    graph.set_children(a, [c, b])
+    graph.set_children(c, [])
+    graph.add_parent(c, a)
+    graph.add_parent(b, a)
+
+    assert children == {"/a.scss": ["/c.scss", "/b.scss"], "/c.scss": []}
+    assert parents == {"/b.scss": {"/a.scss"}, "/c.scss": {"/a.scss"}}
+    assert list(children) == ["/a.scss", "/c.scss"]
+    assert len(children) == 2
+    assert "/b.scss" not in children
+    assert "/nope.scss" not in children
+    assert children.get("/b.scss") is None
+
+    with pytest.raises(KeyError):
+        children["/b.scss"]
+
+    # Values are copies
+    children["/a.scss"].append("/nope.scss")
+    assert children["/a.scss"] == ["/c.scss", "/b.scss"]
+
+    assert list(graph.pop_children(a)) == [c, b]
+    assert list(graph.pop_children(a)) == []
+    assert children == {"/c.scss": []}
+
+
+def test_inspector_shares_paths(settings):
+    """
+    Inspector should store each path once whatever the number of relations
+    """
+    sources = [
+        os.path.join(settings.sample_path, k)
+        for k in ("main_basic.scss", "main_with_subimports.scss")
+    ]
+
+    inspector = ScssInspector()
+    inspector.inspect(*sources)
+
+    graph = inspector._GRAPH
+    assert len(graph.paths) == len(set(graph.paths)) == len(graph.ids)
+
+    for path in inspector._CHILDREN_MAP:
+        for child in inspector._CHILDREN_MAP[path]:
+            assert path in inspector._PARENTS_MAP[child]
@@ -123,3 +123,74 @@ def test_indirect(settings, inspector):
 
     # with pytest.raises(CircularImport):
         # parents = list(inspector.parents(sourcepath_5))
+
+
+def test_cycle_path(settings, inspector):
+    """
+    Circular import error should report the full cycle path in import order
+    """
+    sourcepath_3 = os.path.join(settings.sample_path, 'main_circular_3.scss')
+    sourcepath_4 = os.path.join(settings.sample_path, 'main_circular_4.scss')
+    sourcepath_bridge = os.path.join(settings.sample_path, 'main_circular_bridge.scss')
+
+    inspector.inspect(sourcepath_3)
+
+    expected = "A circular import has occured: {}".format(" -> ".join([
+        sourcepath_3,
+        sourcepath_bridge,
+        sourcepath_4,
+        sourcepath_3,
+    ]))
+
+    with pytest.raises(CircularImport) as excinfo:
+        inspector.children(sourcepath_3)
+    assert str(excinfo.value) == expected
+
+    with pytest.raises(CircularImport) as excinfo:
+        inspector.parents(sourcepath_3)
+    assert str(excinfo.value) == expected
+
+
+def test_cycles(settings, inspector):
+    """
+    Every circular imports should be reported once with their full path,
+    sources only importing a cycle are not involved
+    """
+    def path(name):
+        return os.path.join(settings.sample_path, name)
+
+    inspector.inspect(
+        path('main_basic.scss'),
+        path('main_circular_0.scss'),
+        path('main_circular_1.scss'),
+        path('main_circular_5.scss'),
+    )
+
+    assert inspector.cycles() == [
+        [path('main_circular_0.scss'), path('main_circular_0.scss')],
+        [
+            path('main_circular_1.scss'),
+            path('main_circular_2.scss'),
+            path('main_circular_1.scss'),
+        ],
+        [
+            path('main_circular_3.scss'),
+            path('main_circular_bridge.scss'),
+            path('main_circular_4.scss'),
+            path('main_circular_3.scss'),
+        ],
+    ]
+
+    # Importing a cycle is not an error for a source out of the cycle
+    assert inspector.get_cycle(path('main_circular_5.scss')) == []
+    assert path('main_circular_3.scss') in inspector.children(
+        path('main_circular_5.scss')
+    )
+
+    # Components are computed once until maps change
+    components = inspector.get_cyclic_components()
+    assert inspector.get_cyclic_components() is components
+
+    inspector.remove_source(path('main_circular_1.scss'))
+    assert inspector.get_cyclic_components() is not components
+    assert len(inspector.cycles()) == 2
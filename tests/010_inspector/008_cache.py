@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import os
+
+from boussole.cache import ParseCache
+from boussole.inspector import ScssInspector
+
+
+def test_cache(settings):
+    """
+    Inspector with a cache should only parse sources once until they change
+    """
+    sources = [
+        os.path.join(settings.sample_path, "main_basic.scss"),
+        os.path.join(settings.sample_path, "main_with_subimports.scss"),
+    ]
+
+    cache = ParseCache()
+
+    inspector = ScssInspector(cache=cache)
+    inspector.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+    expected = inspector._CHILDREN_MAP
+
+    stats = cache.stats()
+    assert stats["hits"] == 0
+    assert stats["misses"] == stats["entries"]
+
+    inspector = ScssInspector(cache=cache)
+    inspector.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+
+    assert inspector._CHILDREN_MAP == expected
+    assert cache.stats()["hits"] == stats["entries"]
+    assert cache.stats()["misses"] == stats["misses"]
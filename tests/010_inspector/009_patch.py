@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+
+import pytest
+
+from boussole.exceptions import UnclearResolution, UnresolvablePath
+from boussole.inspector import ScssInspector
+
+
+def write(basedir, path, content):
+    with io.open(os.path.join(basedir, path), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def build_structure(basedir):
+    """
+    Build a small structure and return a function to join path to basedir
+    """
+    os.makedirs(basedir)
+
+    write(basedir, "main.scss", """@import "a";\n@import "b";""")
+    write(basedir, "other.scss", """@import "b";""")
+    write(basedir, "_a.scss", """@import "c";""")
+    write(basedir, "_b.scss", """/* B */""")
+    write(basedir, "_c.scss", """@import "d";""")
+    write(basedir, "_d.scss", """/* D */""")
+    write(basedir, "_e.scss", """/* E */""")
+
+    def join(path):
+        return os.path.join(basedir, path)
+
+    return join
+
+
+def assert_same_as_full(inspector, roots):
+    """
+    Patched maps should be identical to the ones from a full inspection
+    """
+    expected = ScssInspector()
+    expected.inspect(*roots)
+
+    assert inspector._CHILDREN_MAP == expected._CHILDREN_MAP
+    assert inspector._PARENTS_MAP == expected._PARENTS_MAP
+
+
+def test_update(temp_builds_dir):
+    """
+    Changed children are added or removed from maps
+    """
+    basedir = temp_builds_dir.join("inspector_patch_update").strpath
+    join = build_structure(basedir)
+    roots = [join("main.scss"), join("other.scss")]
+
+    inspector = ScssInspector()
+    inspector.inspect(*roots)
+
+    # Replace import of 'a' (and so its subtree) by 'e'
+    write(basedir, "main.scss", """@import "e";\n@import "b";""")
+    inspector.update_source(join("main.scss"))
+
+    assert join("_a.scss") not in inspector._CHILDREN_MAP
+    assert join("_d.scss") not in inspector._CHILDREN_MAP
+    assert inspector.parents(join("_e.scss")) == {join("main.scss")}
+    assert_same_as_full(inspector, roots)
+
+    # Remove the last import of 'b'
+    write(basedir, "other.scss", """/* Other */""")
+    inspector.update_source(join("other.scss"))
+    assert inspector.parents(join("_b.scss")) == {join("main.scss")}
+    assert_same_as_full(inspector, roots)
+
+
+def test_remove(temp_builds_dir):
+    """
+    Removed source is dropped from maps, its importers are resolved again
+    """
+    basedir = temp_builds_dir.join("inspector_patch_remove").strpath
+    join = build_structure(basedir)
+    roots = [join("main.scss"), join("other.scss")]
+
+    inspector = ScssInspector()
+    inspector.inspect(*roots)
+
+    # Removed root not imported by anything
+    os.remove(join("other.scss"))
+    inspector.remove_source(join("other.scss"))
+    roots = [join("main.scss")]
+    assert_same_as_full(inspector, roots)
+
+    # Removed partial still imported
+    os.remove(join("_d.scss"))
+    with pytest.raises(UnresolvablePath):
+        inspector.remove_source(join("_d.scss"))
+
+    # Removed partial not imported anymore
+    write(basedir, "_c.scss", """/* C */""")
+    inspector.update_source(join("_c.scss"))
+    inspector.remove_source(join("_d.scss"))
+    assert_same_as_full(inspector, roots)
+
+
+def test_update_error(temp_builds_dir):
+    """
+    Maps are left unchanged when resolving fails
+    """
+    basedir = temp_builds_dir.join("inspector_patch_error").strpath
+    join = build_structure(basedir)
+
+    inspector = ScssInspector()
+    inspector.inspect(join("main.scss"))
+
+    write(basedir, "main.scss", """@import "nope";""")
+    with pytest.raises(UnresolvablePath):
+        inspector.update_source(join("main.scss"))
+
+    write(basedir, "main.scss", """@import "a";\n@import "b";""")
+    assert_same_as_full(inspector, [join("main.scss")])
+
+
+def test_add(temp_builds_dir):
+    """
+    Only sources with a rule which may resolve to a new source are resolved
+    again
+    """
+    basedir = temp_builds_dir.join("inspector_patch_add").strpath
+    join = build_structure(basedir)
+    os.makedirs(join("lib"))
+    write(basedir, "lib/_f.scss", """/* F */""")
+    write(basedir, "_b.scss", """@import "f";""")
+    roots = [join("main.scss"), join("other.scss")]
+
+    inspector = ScssInspector()
+    inspector.inspect(*roots, library_paths=[join("lib")])
+
+    assert inspector.get_candidate_importers(
+        join("_f.scss"), library_paths=[join("lib")]
+    ) == [join("_b.scss")]
+    assert inspector.get_candidate_importers(
+        join("_new.scss"), library_paths=[join("lib")]
+    ) == []
+
+    # New source shadowing the library one
+    write(basedir, "_f.scss", """/* Shadow F */""")
+    with pytest.raises(UnclearResolution):
+        inspector.add_source(join("_f.scss"), library_paths=[join("lib")])
+
+    # New source not imported from anything leaves maps untouched
+    os.remove(join("_f.scss"))
+    inspector.reset()
+    inspector.inspect(*roots, library_paths=[join("lib")])
+    children = dict(inspector._CHILDREN_MAP)
+
+    write(basedir, "_new.scss", """/* New */""")
+    inspector.add_source(join("_new.scss"), library_paths=[join("lib")])
+    assert dict(inspector._CHILDREN_MAP) == children
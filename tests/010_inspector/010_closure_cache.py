@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import os
+
+from boussole.inspector import ScssInspector
+
+
+def test_closure_cache(settings):
+    """
+    Memoized closures should be identical to computed ones and invalidated
+    when maps change
+    """
+    sourcepath = os.path.join(settings.sample_path, "main_basic.scss")
+    partial = os.path.join(settings.sample_path, "_vendor.scss")
+    other = os.path.join(settings.sample_path, "main_with_subimports.scss")
+
+    reference = ScssInspector()
+    reference.inspect(sourcepath)
+
+    inspector = ScssInspector(closure_cache=True)
+    inspector.inspect(sourcepath)
+
+    assert inspector.children(sourcepath) == reference.children(sourcepath)
+    assert inspector.parents(partial) == reference.parents(partial)
+    assert ("parents", partial, True) in inspector._CLOSURE_CACHE
+
+    # Returned closures can be modified without altering cache
+    inspector.parents(partial).add("foo")
+    assert inspector.parents(partial) == reference.parents(partial)
+
+    # Inspecting a new source clear cache
+    inspector.inspect(other)
+    assert inspector._CLOSURE_CACHE == {}
+
+    reference.inspect(other)
+    assert inspector.parents(partial) == reference.parents(partial)
+
+
+def test_not_recursive(settings, inspector):
+    """
+    Non recursive closure only returns direct dependencies
+    """
+    sourcepath = os.path.join(settings.sample_path, "main_with_subimports.scss")
+
+    inspector.inspect(sourcepath)
+
+    assert inspector.children(sourcepath, recursive=False) == set(
+        inspector._CHILDREN_MAP[sourcepath]
+    )
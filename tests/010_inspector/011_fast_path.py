@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+import os
+
+from boussole.inspector import ScssInspector
+
+
+def test_fast_path(settings):
+    """
+    Sources without any import keyword are counted as fast path
+    """
+    inspector = ScssInspector()
+    inspector.inspect(
+        os.path.join(settings.sample_path, "main_basic.scss"),
+        library_paths=settings.libraries_fixture_paths,
+    )
+
+    with_imports = [k for k, v in inspector._CHILDREN_MAP.items() if v]
+
+    assert inspector.fast_paths > 0
+    assert inspector.fast_paths == len(inspector._CHILDREN_MAP) - len(with_imports)
+
+    inspector.reset()
+    assert inspector.fast_paths == 0
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+
+from boussole.inspector import ScssInspector
+
+
+def test_deep_chain(temp_builds_dir):
+    """
+    A very deep import chain is inspected without hitting recursion limit
+    """
+    basedir = temp_builds_dir.join("inspector_deep_chain").strpath
+    os.makedirs(basedir)
+
+    depth = 10000
+    for i in range(depth):
+        with io.open(os.path.join(basedir, "_chain_{}.scss".format(i)), "w") as fp:
+            if i < depth - 1:
+                fp.write('@import "chain_{}";\n'.format(i + 1))
+
+    entrypoint = os.path.join(basedir, "_chain_0.scss")
+    last = os.path.join(basedir, "_chain_{}.scss".format(depth - 1))
+
+    inspector = ScssInspector()
+    inspector.inspect(entrypoint)
+
+    assert inspector.visited == depth
+    assert len(inspector._CHILDREN_MAP) == depth
+    assert inspector._CHILDREN_MAP[last] == []
+    assert inspector._PARENTS_MAP[last] == set([
+        os.path.join(basedir, "_chain_{}.scss".format(depth - 2)),
+    ])
+    assert len(inspector.children(entrypoint)) == depth - 1
+    assert len(inspector.parents(last)) == depth - 1
+
+    # Inspecting again does not visit anything
+    inspector.inspect(entrypoint)
+    assert inspector.visited == depth
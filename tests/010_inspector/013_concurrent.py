@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from boussole.cache import ParseCache
+from boussole.exceptions import UnclearResolution, UnresolvablePath
+from boussole.inspector import ScssInspector
+
+
+SOURCES = [
+    "main_basic.scss",
+    "main_depth_import-3.scss",
+    "main_syntax.scss",
+    "main_using_libs.scss",
+    "main_with_subimports.scss",
+]
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_same_maps(settings, processes):
+    """
+    Concurrent inspection should fill the same maps than sequential one
+    """
+    sources = [os.path.join(settings.sample_path, k) for k in SOURCES]
+
+    sequential = ScssInspector()
+    sequential.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+
+    inspector = ScssInspector(workers=4, processes=processes)
+    inspector.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+
+    assert list(inspector._CHILDREN_MAP.items()) == list(
+        sequential._CHILDREN_MAP.items()
+    )
+    assert inspector._PARENTS_MAP == sequential._PARENTS_MAP
+    assert inspector.visited == sequential.visited
+    assert inspector.fast_paths == sequential.fast_paths
+
+
+@pytest.mark.parametrize("source,exception", [
+    ("main_error.scss", UnresolvablePath),
+    ("main_twins_1.scss", UnclearResolution),
+])
+def test_same_errors(settings, source, exception):
+    """
+    Concurrent inspection should raise the same errors than sequential one
+    """
+    sourcepath = os.path.join(settings.sample_path, source)
+
+    with pytest.raises(exception) as sequential:
+        ScssInspector().inspect(
+            sourcepath,
+            library_paths=settings.libraries_fixture_paths
+        )
+
+    with pytest.raises(exception) as concurrent:
+        ScssInspector(workers=4).inspect(
+            sourcepath,
+            library_paths=settings.libraries_fixture_paths
+        )
+
+    assert str(concurrent.value) == str(sequential.value)
+
+
+def test_cache(settings):
+    """
+    Concurrent inspection should use and fill parse cache
+    """
+    sources = [os.path.join(settings.sample_path, k) for k in SOURCES]
+    cache = ParseCache()
+
+    inspector = ScssInspector(cache=cache, workers=4)
+    inspector.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+    expected = inspector._CHILDREN_MAP
+
+    stats = cache.stats()
+    assert stats["hits"] == 0
+    assert stats["misses"] == stats["entries"]
+
+    inspector = ScssInspector(cache=cache, workers=4)
+    inspector.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+
+    assert inspector._CHILDREN_MAP == expected
+    assert cache.stats()["hits"] == stats["entries"]
+    assert cache.stats()["misses"] == stats["misses"]
+
+
+def test_roots_submitted(settings):
+    """
+    Every given source should be submitted before the first one is inspected
+    """
+    sources = [os.path.join(settings.sample_path, k) for k in SOURCES]
+
+    class RecordingInspector(ScssInspector):
+        def submit_source(self, executor, sourcepath):
+            self.submitted.append(sourcepath)
+            return super(RecordingInspector, self).submit_source(executor,
+                                                                 sourcepath)
+
+    inspector = RecordingInspector(workers=4)
+    inspector.submitted = []
+    inspector.inspect(*sources, library_paths=settings.libraries_fixture_paths)
+
+    assert inspector.submitted[:len(sources)] == sources
+    # Sources are still submitted only once
+    assert len(inspector.submitted) == len(set(inspector.submitted))
@@ -13,6 +13,7 @@ from boussole.conf.json_backend import SettingsBackendJson
     (":", ":"),
     (":foo", ":foo"),
     ("blake2", "blake2"),
+    (":content", ":content"),
 ])
 def test_postprocessor_patch_hash_suffix_nonhash(value, expected):
     """
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from boussole.exceptions import SettingsInvalidError
+from boussole.conf.post_processor import SettingsPostProcessor
+
+
+@pytest.mark.parametrize("value", [None, 1, 8])
+def test_validate_jobs_success(value):
+    """
+    Validate number of processes
+    """
+    processor = SettingsPostProcessor()
+
+    assert processor._validate_jobs({}, "DUMMY_NAME", value) == value
+
+
+@pytest.mark.parametrize("value", [0, -2, "4", 2.5, True])
+def test_validate_jobs_fail(value):
+    """
+    Number of processes must be a positive integer
+    """
+    processor = SettingsPostProcessor()
+
+    with pytest.raises(SettingsInvalidError):
+        processor._validate_jobs({}, "DUMMY_NAME", value)
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from boussole.exceptions import SettingsInvalidError
+from boussole.conf.post_processor import SettingsPostProcessor
+
+
+@pytest.mark.parametrize("value", [1, 6, 9])
+def test_validate_compress_level_success(value):
+    """
+    Validate compression level
+    """
+    processor = SettingsPostProcessor()
+
+    assert processor._validate_compress_level({}, "DUMMY_NAME", value) == value
+
+
+@pytest.mark.parametrize("value", [None, 0, 10, "9", 2.5, True])
+def test_validate_compress_level_fail(value):
+    """
+    Compression level must be an integer from 1 to 9
+    """
+    processor = SettingsPostProcessor()
+
+    with pytest.raises(SettingsInvalidError):
+        processor._validate_compress_level({}, "DUMMY_NAME", value)
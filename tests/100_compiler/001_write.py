@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 import io
+import os
+import shutil
 
 
 def test_001(compiler, temp_builds_dir):
@@ -51,3 +53,29 @@ def test_003(compiler, temp_builds_dir):
         result = f.read()
 
     assert content == result
+
+
+def test_004(compiler, temp_builds_dir):
+    """
+    File is replaced without leaving temporary file and directories are
+    created again if removed since they have been checked
+    """
+    basedir = temp_builds_dir.join("compiler_write_004")
+    filepath = basedir.join("foo/home.txt")
+
+    compiler.write_content("Foo", filepath.strpath)
+    inode = os.stat(filepath.strpath).st_ino
+
+    compiler.write_content("Bar", filepath.strpath)
+
+    # A new file has been moved to destination instead of writing in place
+    assert os.stat(filepath.strpath).st_ino != inode
+    assert os.listdir(basedir.join("foo").strpath) == ["home.txt"]
+    assert basedir.join("foo").strpath in compiler.directories
+
+    shutil.rmtree(basedir.strpath)
+
+    compiler.write_content("Ping", filepath.strpath)
+
+    with io.open(filepath.strpath, "r", encoding="utf-8") as f:
+        assert f.read() == "Ping"
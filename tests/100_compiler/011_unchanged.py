@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os
+import io
+
+from boussole.conf.model import Settings
+
+
+def test_is_unchanged(compiler, temp_builds_dir):
+    """
+    Only a file with the exact same content is unchanged
+    """
+    filepath = temp_builds_dir.join("compiler_is_unchanged").strpath
+
+    assert compiler.is_unchanged("フランス", filepath) is False
+
+    compiler.write_content("フランス", filepath)
+
+    assert compiler.is_unchanged("フランス", filepath) is True
+    assert compiler.is_unchanged("フランソ", filepath) is False
+    assert compiler.is_unchanged("フランス Furansu", filepath) is False
+
+
+def test_skip_unchanged(compiler, temp_builds_dir):
+    """
+    Outputs with the same content are not written again when enabled
+    """
+    basic_settings = Settings(initial={
+        "SOURCES_PATH": ".",
+        "TARGET_PATH": "css",
+        "SOURCE_MAP": True,
+        "OUTPUT_STYLES": "compact",
+        "SKIP_UNCHANGED": True,
+    })
+
+    basedir = temp_builds_dir.join("compiler_skip_unchanged").strpath
+    targetdir = os.path.join(basedir, basic_settings.TARGET_PATH)
+    os.makedirs(targetdir)
+
+    src = os.path.join(basedir, "app.scss")
+    dst = os.path.join(targetdir, "app.css")
+    src_map = os.path.join(targetdir, "app.map")
+
+    with io.open(src, "w", encoding="utf-8") as f:
+        f.write("""#content{ color: red; }""")
+
+    assert compiler.compile_output(basic_settings, src, dst) == (
+        True, dst, False
+    )
+
+    # Make outputs older so a write would be noticed
+    for path in (dst, src_map):
+        os.utime(path, (1000, 1000))
+
+    assert compiler.compile_output(basic_settings, src, dst) == (
+        True, dst, True
+    )
+    assert os.stat(dst).st_mtime == 1000
+    assert os.stat(src_map).st_mtime == 1000
+
+    with io.open(src, "w", encoding="utf-8") as f:
+        f.write("""#content{ color: blue; }""")
+
+    assert compiler.safe_compile(basic_settings, src, dst) == (True, dst)
+    assert os.stat(dst).st_mtime != 1000
+
+    with io.open(dst, "r", encoding="utf-8") as f:
+        assert "blue" in f.read()
+
+    # Disabled, outputs are allways written
+    basic_settings.SKIP_UNCHANGED = False
+    os.utime(dst, (1000, 1000))
+
+    assert compiler.compile_output(basic_settings, src, dst) == (
+        True, dst, False
+    )
+    assert os.stat(dst).st_mtime != 1000
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import os
+import io
+import json
+
+from boussole.conf.model import Settings
+
+
+def test_hash_outputs(compiler):
+    """
+    Filenames are hashed from CSS and references between CSS and source map
+    are updated, hashing again gives the same outputs
+    """
+    content = """#a { color: red; }\n\n/*# sourceMappingURL=app.map */"""
+    sourcemap = """{\n\t"version": 3,\n\t"file": "app.css",\n\t"sources": []\n}"""
+
+    destination, hashed, hashed_map = compiler.hash_outputs(
+        "/css/app.css",
+        content,
+        sourcemap=sourcemap,
+    )
+
+    name = os.path.basename(destination)
+    assert destination.startswith("/css/app.")
+    assert len(name) == len("app..css") + 20
+    assert hashed == (
+        """#a { color: red; }\n\n/*# sourceMappingURL=""" +
+        name[:-4] + ".map */"
+    )
+    assert json.loads(hashed_map)["file"] == name
+
+    assert compiler.hash_outputs("/css/app.css", hashed,
+                                 sourcemap=hashed_map) == (
+        destination, hashed, hashed_map
+    )
+
+    # Without source map
+    assert compiler.hash_outputs("/css/app.css", "#a { color: red; }\n\n") == (
+        destination, "#a { color: red; }\n\n", None
+    )
+
+    # Another content
+    assert compiler.hash_outputs("/css/app.css", "#a { color: blue; }")[0] != (
+        destination
+    )
+
+
+def test_compile_output(compiler, temp_builds_dir):
+    """
+    Outputs are written to hashed paths and message is the hashed CSS path
+    """
+    basic_settings = Settings(initial={
+        "SOURCES_PATH": ".",
+        "TARGET_PATH": "css",
+        "SOURCE_MAP": True,
+        "OUTPUT_STYLES": "compact",
+        "HASH_SUFFIX": ":content",
+    })
+
+    basedir = temp_builds_dir.join("compiler_hash_content").strpath
+    targetdir = os.path.join(basedir, "css")
+    os.makedirs(targetdir)
+
+    src = os.path.join(basedir, "app.scss")
+    dst = os.path.join(targetdir, "app.css")
+
+    with io.open(src, "w", encoding="utf-8") as f:
+        f.write("""#content{ color: red; }""")
+
+    success, output, unchanged = compiler.compile_output(basic_settings, src,
+                                                         dst,
+                                                         hash_content=True)
+
+    assert success is True
+    assert output != dst
+    assert sorted(os.listdir(targetdir)) == [
+        os.path.basename(output),
+        os.path.basename(output)[:-4] + ".map",
+    ]
+
+    with io.open(output, "r", encoding="utf-8") as f:
+        assert f.read().endswith("/*# sourceMappingURL={} */".format(
+            os.path.basename(output)[:-4] + ".map"
+        ))
+
+    # Same content gives the same path
+    assert compiler.compile_output(basic_settings, src, dst,
+                                   hash_content=True)[1] == output
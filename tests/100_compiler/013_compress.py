@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import gzip
+import os
+import io
+
+from boussole import compiler as compiler_module
+from boussole.compiler import get_compressors, gzip_compress
+from boussole.conf.model import Settings
+
+
+class DummyBrotli(object):
+    """
+    Brotli module which does not compress anything.
+    """
+    @staticmethod
+    def compress(data, quality=11):
+        return b"br" + data
+
+
+def test_gzip_compress():
+    """
+    Gzip compression is deterministic
+    """
+    data = "#content { color: red; }".encode("utf-8")
+
+    assert gzip_compress(data, 9) == gzip_compress(data, 9)
+    assert gzip.decompress(gzip_compress(data, 1)) == data
+
+
+def test_get_compressors(monkeypatch):
+    """
+    Brotli is only used if module is available
+    """
+    monkeypatch.setattr(compiler_module, "brotli", None)
+    assert [name for name, compress in get_compressors()] == ["gz"]
+
+    monkeypatch.setattr(compiler_module, "brotli", DummyBrotli)
+    assert [name for name, compress in get_compressors()] == ["gz", "br"]
+
+
+def test_compress(compiler, temp_builds_dir, monkeypatch):
+    """
+    Compressed files are written next to CSS and only compressed again when
+    CSS has changed
+    """
+    monkeypatch.setattr(compiler_module, "brotli", DummyBrotli)
+
+    basic_settings = Settings(initial={
+        "SOURCES_PATH": ".",
+        "TARGET_PATH": "css",
+        "SOURCE_MAP": True,
+        "OUTPUT_STYLES": "compact",
+        "COMPRESS": True,
+        "COMPRESS_LEVEL": 6,
+    })
+
+    basedir = temp_builds_dir.join("compiler_compress").strpath
+    targetdir = os.path.join(basedir, "css")
+    os.makedirs(targetdir)
+
+    src = os.path.join(basedir, "app.scss")
+    dst = os.path.join(targetdir, "app.css")
+
+    with io.open(src, "w", encoding="utf-8") as f:
+        f.write("""#content{ color: red; }""")
+
+    assert compiler.compile_output(basic_settings, src, dst) == (
+        True, dst, False
+    )
+    assert sorted(os.listdir(targetdir)) == [
+        "app.css", "app.css.br", "app.css.gz", "app.map",
+    ]
+
+    with io.open(dst, "rb") as f:
+        css = f.read()
+    with io.open(dst + ".gz", "rb") as f:
+        assert gzip.decompress(f.read()) == css
+    with io.open(dst + ".br", "rb") as f:
+        assert f.read() == b"br" + css
+
+    # Unchanged CSS is not compressed again
+    for path in (dst + ".gz", dst + ".br"):
+        os.utime(path, (1000, 1000))
+    os.remove(dst + ".br")
+
+    compiler.compile_output(basic_settings, src, dst)
+    assert os.stat(dst + ".gz").st_mtime == 1000
+    assert os.path.exists(dst + ".br")
+
+    # Changed CSS is compressed again
+    with io.open(src, "w", encoding="utf-8") as f:
+        f.write("""#content{ color: blue; }""")
+
+    compiler.compile_output(basic_settings, src, dst)
+    assert os.stat(dst + ".gz").st_mtime != 1000
+
+    with io.open(dst + ".gz", "rb") as f:
+        assert b"blue" in gzip.decompress(f.read())
+
+
+def test_compile_compressed(compiler, temp_builds_dir, monkeypatch):
+    """
+    Compressed files can be computed apart from writes, like in a worker
+    """
+    monkeypatch.setattr(compiler_module, "brotli", DummyBrotli)
+
+    basic_settings = Settings(initial={
+        "SOURCES_PATH": ".",
+        "TARGET_PATH": "css",
+        "OUTPUT_STYLES": "compact",
+        "COMPRESS": True,
+        "COMPRESS_LEVEL": 6,
+    })
+
+    basedir = temp_builds_dir.join("compiler_compile_compressed").strpath
+    targetdir = os.path.join(basedir, "css")
+    os.makedirs(targetdir)
+
+    src = os.path.join(basedir, "app.scss")
+    dst = os.path.join(targetdir, "app.css")
+
+    with io.open(src, "w", encoding="utf-8") as f:
+        f.write("""#content{ color: red; }""")
+
+    success, content, sourcemap, compressed, output = (
+        compiler.compile_compressed(basic_settings, src, dst)
+    )
+    assert success is True
+    # Nothing written yet
+    assert os.listdir(targetdir) == []
+    assert [path for path, data in compressed] == [dst + ".gz", dst + ".br"]
+    assert output == dst
+
+    assert compiler.write_outputs(dst, content, compressed=compressed) is True
+    assert sorted(os.listdir(targetdir)) == [
+        "app.css", "app.css.br", "app.css.gz",
+    ]
+    with io.open(dst + ".br", "rb") as f:
+        assert f.read() == b"br" + content.encode("utf-8")
+
+    # Only missing compressed files are computed for unchanged CSS
+    os.remove(dst + ".br")
+    success, content, sourcemap, compressed, output = (
+        compiler.compile_compressed(basic_settings, src, dst)
+    )
+    assert [path for path, data in compressed] == [dst + ".br"]
+
+    # Compression is disabled
+    basic_settings.update({"COMPRESS": False})
+    assert compiler.compile_compressed(basic_settings, src, dst)[3] is None
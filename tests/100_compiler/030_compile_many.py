@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import os
+import io
+
+import pytest
+
+from boussole.compiler import compile_pool
+from boussole.conf.model import Settings
+
+
+@pytest.mark.parametrize("jobs,pooled", [(1, False), (3, False), (2, True)])
+def test_order(compiler, temp_builds_dir, jobs, pooled):
+    """
+    Results should be returned in source order, either from sequential,
+    parallel or persistent pool compile, and compile errors should not stop
+    other compiles
+    """
+    basedir = temp_builds_dir.join(
+        "compiler_compile_many_{}_{}".format(jobs, pooled)
+    ).strpath
+
+    basic_settings = Settings(initial={
+        "SOURCES_PATH": "scss",
+        "TARGET_PATH": "css",
+        "SOURCE_MAP": False,
+        "OUTPUT_STYLES": "compact",
+    })
+
+    sourcedir = os.path.join(basedir, basic_settings.SOURCES_PATH)
+    targetdir = os.path.join(basedir, basic_settings.TARGET_PATH)
+
+    os.makedirs(sourcedir)
+    os.makedirs(targetdir)
+
+    sources = []
+    for name in ("foo", "bar", "error", "ping"):
+        src = os.path.join(sourcedir, "{}.scss".format(name))
+        dst = os.path.join(targetdir, "{}.css".format(name))
+        sources.append((src, dst))
+
+        with io.open(src, "w", encoding="utf-8") as f:
+            if name == "error":
+                f.write("""#content{ color: red;""")
+            else:
+                f.write("""#{}{{ color: red; }}""".format(name))
+
+    if pooled:
+        executor = compile_pool(jobs)
+        results = list(compiler.compile_many(basic_settings, sources,
+                                             executor=executor))
+        # Pool is left started for next compiles
+        assert len(list(compiler.compile_many(basic_settings, sources[:2],
+                                              executor=executor))) == 2
+        executor.shutdown()
+    else:
+        results = list(compiler.compile_many(basic_settings, sources,
+                                             jobs=jobs))
+
+    assert [result[:2] for result in results] == sources
+    assert [result[2] for result in results] == [True, True, False, True]
+    assert [result[4] for result in results] == [False] * 4
+    assert results[0][3] == os.path.join(targetdir, "foo.css")
+    assert "Invalid CSS after" in results[2][3]
+
+    assert sorted(os.listdir(targetdir)) == ["bar.css", "foo.css", "ping.css"]
+
+
+def test_compile_pool():
+    """
+    Pool is only started for many jobs
+    """
+    assert compile_pool(None) is None
+    assert compile_pool(1) is None
+
+    executor = compile_pool(2)
+    assert executor.submit(sum, [1, 2]).result() == 3
+    executor.shutdown()
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
+import json
 import os
+import threading
 import uuid
 
 import pytest
@@ -9,6 +11,13 @@ from watchdog.events import (
     FileMovedEvent,
 )
 
+from boussole.cache import GraphSnapshot
+from boussole.compiler import compile_pool
+from boussole.finder import CONTENT_HASH
+from boussole.inspector import ScssInspector
+from boussole.manifest import AssetManifest
+from boussole.scheduler import CompilePriority
+
 from utils import (
     DummyCreatedEvent, DummyModifiedEvent, DummyDeletedEvent, DummyMoveEvent,
     DummyBaseEvent,
@@ -484,3 +493,650 @@ def test_library_modified_101(temp_builds_dir):
     assert results == [
         'main_usinglib.css',
     ]
+
+
+def test_incremental_index_060(temp_builds_dir):
+    """
+    After the first full index, events only patch the inspector which stay
+    identical to a full index
+    """
+    basedir = temp_builds_dir.join('watcher_success_060')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        **watcher_opts
+    )
+
+    def assert_full_index():
+        expected = ScssInspector()
+        expected.inspect(
+            *project_handler.compilable_files.keys(),
+            library_paths=settings_object.LIBRARY_PATHS
+        )
+        assert inspector._CHILDREN_MAP == expected._CHILDREN_MAP
+        assert inspector._PARENTS_MAP == expected._PARENTS_MAP
+
+    project_handler.on_modified(
+        DummyModifiedEvent(bdir('sass/_toinclude.scss'))
+    )
+    assert project_handler._indexed is True
+    assert_full_index()
+
+    # Patch on the next events, full index would fail on an orphan
+    # unresolvable source
+    with open(bdir('sass/_orphan.scss'), 'w') as f:
+        f.write("""@import "idontexist";""")
+
+    with open(bdir('sass/main_usinglib.scss'), 'w') as f:
+        f.write("""@import "toinclude";""")
+    project_handler.on_modified(
+        DummyModifiedEvent(bdir('sass/main_usinglib.scss'))
+    )
+    assert project_handler._event_error is False
+    assert bdir('lib/components/_buttons.scss') not in inspector._CHILDREN_MAP
+
+    with open(bdir('sass/new_main.scss'), 'w') as f:
+        f.write("""@import "toinclude";""")
+    project_handler.on_created(DummyCreatedEvent(bdir('sass/new_main.scss')))
+    assert bdir('sass/new_main.scss') in project_handler.compilable_files
+
+    os.rename(bdir('sass/new_main.scss'), bdir('sass/renamed.scss'))
+    project_handler.on_moved(
+        DummyMoveEvent(bdir('sass/new_main.scss'), bdir('sass/renamed.scss'))
+    )
+    assert bdir('sass/new_main.scss') not in project_handler.compilable_files
+    assert bdir('sass/renamed.scss') in project_handler.compilable_files
+
+    os.remove(bdir('sass/_orphan.scss'))
+    assert_full_index()
+
+
+def test_incremental_index_new_path_065(temp_builds_dir):
+    """
+    A new path may change how already known imports are resolved, so create
+    and move events make the same error than a full index would do
+    """
+    basedir = temp_builds_dir.join('watcher_success_065')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        **watcher_opts
+    )
+
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+    assert project_handler._event_error is False
+    assert set(inspector._CHILDREN_MAP[bdir('sass/main_usinglib.scss')]) == {
+        bdir('sass/_toinclude.scss'),
+        bdir('lib/components/_buttons.scss'),
+    }
+
+    # New partial with the same import path than the library one
+    os.makedirs(bdir('sass/components'))
+    with open(bdir('sass/components/_buttons.scss'), 'w') as f:
+        f.write(""".button{ color: red; }""")
+    project_handler.on_created(
+        DummyCreatedEvent(bdir('sass/components/_buttons.scss'))
+    )
+    assert project_handler._event_error is True
+
+    # Back to a resolvable project
+    os.remove(bdir('sass/components/_buttons.scss'))
+    project_handler.on_deleted(
+        DummyDeletedEvent(bdir('sass/components/_buttons.scss'))
+    )
+    assert project_handler._event_error is False
+
+    # Same new partial but from a move
+    with open(bdir('sass/components/_buttons.part'), 'w') as f:
+        f.write(""".button{ color: red; }""")
+    os.rename(bdir('sass/components/_buttons.part'),
+              bdir('sass/components/_buttons.scss'))
+    project_handler.on_moved(DummyMoveEvent(
+        bdir('sass/components/_buttons.part'),
+        bdir('sass/components/_buttons.scss'),
+    ))
+    assert project_handler._event_error is True
+
+
+def test_incremental_index_atomic_save_066(temp_builds_dir):
+    """
+    A save through a temporary file only patches the saved source and a new
+    file only resolves again the sources which may import it
+    """
+    basedir = temp_builds_dir.join('watcher_success_066')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        **watcher_opts
+    )
+
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+    assert project_handler._event_error is False
+
+    resets = []
+    reset = inspector.reset
+    inspector.reset = lambda: resets.append(True) or reset()
+    visited = inspector.visited
+    updated = []
+    update_source = inspector.update_source
+    inspector.update_source = lambda path, **kw: (
+        updated.append(path) or update_source(path, **kw)
+    )
+
+    # Editor save through a temporary file
+    with open(bdir('sass/_toinclude.scss.tmp'), 'w') as f:
+        f.write(""".included-partial{ color: blue; }""")
+    os.rename(bdir('sass/_toinclude.scss.tmp'), bdir('sass/_toinclude.scss'))
+    project_handler.on_moved(DummyMoveEvent(
+        bdir('sass/_toinclude.scss.tmp'),
+        bdir('sass/_toinclude.scss'),
+    ))
+    assert project_handler._event_error is False
+    assert updated == [bdir('sass/_toinclude.scss')]
+
+    # New partial only imported from a new main source
+    del updated[:]
+    with open(bdir('sass/_new.scss'), 'w') as f:
+        f.write(""".new{ color: blue; }""")
+    project_handler.on_created(DummyCreatedEvent(bdir('sass/_new.scss')))
+    assert updated == []
+
+    with open(bdir('sass/main_new.scss'), 'w') as f:
+        f.write("""@import "new";""")
+    project_handler.on_created(DummyCreatedEvent(bdir('sass/main_new.scss')))
+    assert project_handler._event_error is False
+    assert inspector._CHILDREN_MAP[bdir('sass/main_new.scss')] == [
+        bdir('sass/_new.scss'),
+    ]
+
+    assert resets == []
+    assert inspector.visited == visited + 2
+
+    expected = ScssInspector()
+    expected.inspect(
+        *project_handler.compilable_files.keys(),
+        library_paths=settings_object.LIBRARY_PATHS
+    )
+    assert inspector._CHILDREN_MAP == expected._CHILDREN_MAP
+    assert inspector._PARENTS_MAP == expected._PARENTS_MAP
+
+    # A moved directory makes a full index on next event
+    event = DummyMoveEvent(bdir('lib/components'), bdir('lib/moved'))
+    event.is_directory = True
+    project_handler.on_any_event(event)
+    assert project_handler._indexed is False
+
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+    assert resets == [True]
+
+
+def test_incremental_index_moved_away_067(temp_builds_dir):
+    """
+    A source moved to a path to ignore is patched like a removed source
+    """
+    basedir = temp_builds_dir.join('watcher_success_067')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        **watcher_opts
+    )
+
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+    assert bdir('sass/main_usinglib.scss') in project_handler.compilable_files
+
+    os.rename(bdir('sass/main_usinglib.scss'),
+              bdir('sass/main_usinglib.scss.bak'))
+    project_handler.on_moved(DummyMoveEvent(
+        bdir('sass/main_usinglib.scss'),
+        bdir('sass/main_usinglib.scss.bak'),
+    ))
+    assert project_handler._event_error is False
+    assert bdir('sass/main_usinglib.scss') not in (
+        project_handler.compilable_files
+    )
+    assert bdir('sass/main_usinglib.scss') not in inspector._ROOTS
+
+    compiled = project_handler.compile_dependencies(
+        bdir('sass/_toinclude.scss')
+    )
+    assert sorted(src for src, dst in compiled) == [
+        bdir('sass/main.scss'),
+        bdir('sass/main_importing.scss'),
+    ]
+
+
+def test_debounce_070(temp_builds_dir):
+    """
+    With debounce, events are collected then processed as a single batch
+    where every involved sources are compiled only once
+    """
+    basedir = temp_builds_dir.join('watcher_success_070')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    # A long window so only the manual flush process the batch
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        debounce=60,
+        **watcher_opts
+    )
+
+    project_handler.on_modified(
+        DummyModifiedEvent(bdir('sass/_toinclude.scss'))
+    )
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+    project_handler.on_created(DummyCreatedEvent(bdir('sass/main.scss')))
+
+    # Nothing processed yet
+    assert os.listdir(basedir.join("css").strpath) == []
+    assert len(project_handler._pending) == 3
+
+    compiled = project_handler.flush()
+
+    assert project_handler._pending == []
+    assert project_handler._timer is None
+    assert sorted(src for src, dst in compiled) == [
+        bdir('sass/main.scss'),
+        bdir('sass/main_importing.scss'),
+        bdir('sass/main_usinglib.scss'),
+    ]
+
+    results = os.listdir(basedir.join("css").strpath)
+    results.sort()
+    assert results == [
+        'main.css',
+        'main_importing.css',
+        'main_usinglib.css',
+    ]
+
+    # Nothing more to process
+    assert project_handler.flush() == []
+
+
+def test_entrypoints_080(temp_builds_dir):
+    """
+    Entrypoints for each source are computed once until maps change and
+    sources to compile are not checked again
+    """
+    basedir = temp_builds_dir.join('watcher_success_080')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        **watcher_opts
+    )
+
+    project_handler.on_modified(
+        DummyModifiedEvent(bdir('sass/_toinclude.scss'))
+    )
+
+    assert project_handler.get_entrypoints(bdir('sass/_toinclude.scss')) == {
+        bdir('sass/main.scss'),
+        bdir('sass/main_importing.scss'),
+        bdir('sass/main_usinglib.scss'),
+    }
+    assert project_handler.get_entrypoints(bdir('sass/main.scss')) == {
+        bdir('sass/main.scss'),
+        bdir('sass/main_importing.scss'),
+    }
+    assert project_handler.get_entrypoints(bdir('sass/_notincluded.scss')) == set()
+    bitsets = project_handler._entrypoints.bitsets
+
+    def match_conditions(*args, **kwargs):
+        raise AssertionError("Sources to compile should not be checked")
+
+    project_handler.finder.match_conditions = match_conditions
+
+    # Imports have not changed, entrypoints are not computed again
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+    assert project_handler._entrypoints.bitsets is bitsets
+
+    results = os.listdir(basedir.join("css").strpath)
+    results.sort()
+
+    assert results == [
+        'main.css',
+        'main_importing.css',
+        'main_usinglib.css',
+    ]
+
+    # Imports have changed
+    with open(bdir('sass/main_usinglib.scss'), 'w') as f:
+        f.write("""@import "main";""")
+    project_handler.on_modified(
+        DummyModifiedEvent(bdir('sass/main_usinglib.scss'))
+    )
+
+    assert project_handler.get_entrypoints(bdir('sass/main.scss')) == {
+        bdir('sass/main.scss'),
+        bdir('sass/main_importing.scss'),
+        bdir('sass/main_usinglib.scss'),
+    }
+
+
+def test_snapshot_090(temp_builds_dir):
+    """
+    Full index restores inspector from snapshot and syncs its roots with
+    compilable files
+    """
+    basedir = temp_builds_dir.join('watcher_success_090')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+    inspector.DIRECTORY_LISTING_CACHE = True
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    snapshot = GraphSnapshot(
+        filepath=temp_builds_dir.join('watcher_success_090.json').strpath
+    )
+
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        snapshot=snapshot,
+        **watcher_opts
+    )
+    project_handler.full_index()
+    expected = dict(inspector._CHILDREN_MAP.items())
+
+    snapshot.save(inspector, library_paths=settings_object.LIBRARY_PATHS)
+
+    restored = ScssInspector(listing_cache=True)
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        restored,
+        snapshot=snapshot,
+        **watcher_opts
+    )
+    project_handler.full_index()
+
+    assert restored.visited == 0
+    assert restored._CHILDREN_MAP == expected
+    assert restored._ROOTS == set(project_handler.compilable_files)
+
+
+def test_executor_100(temp_builds_dir):
+    """
+    Entrypoints are compiled with the given pool and returned in order
+    """
+    basedir = temp_builds_dir.join('watcher_success_100')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    executor = compile_pool(2)
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        executor=executor,
+        **watcher_opts
+    )
+
+    try:
+        project_handler.on_modified(
+            DummyModifiedEvent(bdir('sass/_toinclude.scss'))
+        )
+
+        compiled = project_handler.compile_dependencies(
+            bdir('sass/_toinclude.scss')
+        )
+        project_handler.scheduler.wait()
+    finally:
+        executor.shutdown()
+
+    assert compiled == [
+        (bdir('sass/main.scss'), bdir('css/main.css')),
+        (bdir('sass/main_importing.scss'), bdir('css/main_importing.css')),
+        (bdir('sass/main_usinglib.scss'), bdir('css/main_usinglib.css')),
+    ]
+
+    results = os.listdir(basedir.join("css").strpath)
+    results.sort()
+
+    assert results == [
+        'main.css',
+        'main_importing.css',
+        'main_usinglib.css',
+    ]
+
+
+def test_priority_110(temp_builds_dir):
+    """
+    Entrypoints are compiled from pinned ones then from the most recently
+    edited one
+    """
+    basedir = temp_builds_dir.join('watcher_success_110')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        priority=CompilePriority(patterns=["main_using*.scss"],
+                                 basedir=bdir('sass')),
+        **watcher_opts
+    )
+
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+
+    compiled = project_handler.compile_dependencies(
+        bdir('sass/_toinclude.scss')
+    )
+
+    assert compiled == [
+        (bdir('sass/main_usinglib.scss'), bdir('css/main_usinglib.css')),
+        (bdir('sass/main.scss'), bdir('css/main.css')),
+        (bdir('sass/main_importing.scss'), bdir('css/main_importing.css')),
+    ]
+
+
+def test_debounce_concurrent_120(temp_builds_dir):
+    """
+    With debounce, events coming from another thread while a batch is
+    processing are collected for the next batch instead of being indexed
+    concurrently
+    """
+    basedir = temp_builds_dir.join('watcher_success_120')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    started = threading.Event()
+    release = threading.Event()
+    indexed = []
+
+    class BlockingHandler(UnitTestableProjectEventHandler):
+        def index_batch(self, events):
+            indexed.extend([
+                (event.src_path, threading.current_thread().name)
+                for event in events
+            ])
+            started.set()
+            release.wait(5)
+            return super(BlockingHandler, self).index_batch(events)
+
+    # A long window so only the manual flushes process the batches
+    project_handler = BlockingHandler(
+        settings_object,
+        inspector,
+        debounce=60,
+        **watcher_opts
+    )
+
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+
+    results = []
+    flusher = threading.Thread(
+        target=lambda: results.append(project_handler.flush()),
+        name="flusher",
+    )
+    flusher.start()
+    assert started.wait(5)
+
+    # Event sent while the first batch is still processing
+    project_handler.on_modified(
+        DummyModifiedEvent(bdir('sass/_toinclude.scss'))
+    )
+
+    assert len(project_handler._pending) == 1
+    assert project_handler._timer is not None
+
+    release.set()
+    flusher.join(5)
+
+    # Only the flushing thread has indexed and compiled the first event
+    assert set(name for path, name in indexed) == {"flusher"}
+    assert len(results) == 1
+    assert sorted(src for src, dst in results[0]) == [
+        bdir('sass/main.scss'),
+        bdir('sass/main_importing.scss'),
+    ]
+
+    # Event sent meanwhile is processed with the next batch
+    compiled = project_handler.flush()
+
+    assert project_handler._pending == []
+    assert sorted(src for src, dst in compiled) == [
+        bdir('sass/main.scss'),
+        bdir('sass/main_importing.scss'),
+        bdir('sass/main_usinglib.scss'),
+    ]
+    assert set(name for path, name in indexed) == {"flusher", "MainThread"}
+
+
+def test_debounce_index_130(temp_builds_dir):
+    """
+    With debounce, a batch is indexed at once with at most one full index
+    """
+    basedir = temp_builds_dir.join('watcher_success_130')
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    full_indexes = []
+
+    class CountingHandler(UnitTestableProjectEventHandler):
+        def full_index(self):
+            full_indexes.append(True)
+            return super(CountingHandler, self).full_index()
+
+    project_handler = CountingHandler(
+        settings_object,
+        inspector,
+        debounce=60,
+        **watcher_opts
+    )
+
+    def create_partials(names):
+        for name in names:
+            path = bdir('sass/_{}.scss'.format(name))
+            with open(path, 'w') as f:
+                f.write(""".{}{{ color: red; }}""".format(name))
+            project_handler.on_created(DummyCreatedEvent(path))
+
+    # First batch is not indexed yet
+    create_partials(["first_{}".format(i) for i in range(10)])
+    project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+    project_handler.flush()
+    assert full_indexes == [True]
+    assert project_handler._event_error is False
+
+    # Next batch is only patched
+    names = ["second_{}".format(i) for i in range(10)]
+    create_partials(names)
+    with open(bdir('sass/main_new.scss'), 'w') as f:
+        f.write("\n".join(
+            """@import "{}";""".format(name) for name in names
+        ))
+    project_handler.on_created(DummyCreatedEvent(bdir('sass/main_new.scss')))
+
+    compiled = project_handler.flush()
+    assert full_indexes == [True]
+    assert project_handler._event_error is False
+    assert compiled == [
+        (bdir('sass/main_new.scss'), bdir('css/main_new.css')),
+    ]
+    assert os.path.exists(bdir('css/main_new.css'))
+
+    # Batch with many events requiring a full index only does it once
+    for i in range(5):
+        path = bdir('sass/_temporary_{}.scss'.format(i))
+        project_handler.on_modified(DummyModifiedEvent(path))
+        project_handler.on_deleted(DummyDeletedEvent(path))
+
+    project_handler.flush()
+    assert full_indexes == [True, True]
+    assert project_handler._event_error is False
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_content_hash_140(temp_builds_dir, jobs):
+    """
+    With content hash, entrypoints are written to hashed filenames and asset
+    manifest is updated, either from handler or scheduler
+    """
+    basedir = temp_builds_dir.join('watcher_success_140_{}'.format(jobs))
+
+    bdir, inspector, settings_object, watcher_opts = start_env(basedir)
+    settings_object.update({"HASH_SUFFIX": CONTENT_HASH})
+
+    build_scss_sample_structure(settings_object, basedir)
+
+    assets = AssetManifest(settings_object)
+    executor = compile_pool(jobs)
+    project_handler = UnitTestableProjectEventHandler(
+        settings_object,
+        inspector,
+        executor=executor,
+        assets=assets,
+        **watcher_opts
+    )
+
+    try:
+        project_handler.on_modified(DummyModifiedEvent(bdir('sass/main.scss')))
+        if project_handler.scheduler:
+            project_handler.scheduler.wait()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    with open(assets.filepath) as fp:
+        paths = json.load(fp)
+
+    assert sorted(paths.keys()) == ["main.css", "main_importing.css"]
+    assert paths["main.css"] != "main.css"
+    assert sorted(os.listdir(basedir.join("css").strpath)) == sorted([
+        paths["main.css"], paths["main_importing.css"], "manifest.json",
+    ])
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+
+import pytest
+
+from boussole import cache as cache_module
+from boussole.compiler import gzip_compress
+from boussole.conf.model import Settings
+from boussole.manifest import BuildManifest
+
+
+def build_structure(basedir):
+    """
+    Build a minimal project structure and return its settings
+    """
+    settings = Settings(initial={
+        "SOURCES_PATH": os.path.join(basedir, "scss"),
+        "TARGET_PATH": os.path.join(basedir, "css"),
+        "LIBRARY_PATHS": [os.path.join(basedir, "lib")],
+        "OUTPUT_STYLES": "compact",
+    })
+
+    os.makedirs(settings.SOURCES_PATH)
+    os.makedirs(settings.TARGET_PATH)
+    os.makedirs(settings.LIBRARY_PATHS[0])
+
+    files = {
+        "scss/main.scss": """@import "vars";\n#main{ color: $color; }""",
+        "scss/other.scss": """#other{ color: red; }""",
+        "scss/_vars.scss": """@import "mixins";\n$color: red;""",
+        "lib/_mixins.scss": """/* Mixins */""",
+    }
+    for path, content in files.items():
+        with io.open(os.path.join(basedir, path), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    return settings
+
+
+def compile_outdated(compiler, settings, sources):
+    """
+    Load a manifest, compile outdated sources then save manifest.
+
+    Return the list of compiled source paths.
+    """
+    manifest = BuildManifest(settings)
+    manifest.load()
+
+    compiled = []
+    for src, dst in sources:
+        if manifest.is_outdated(src, dst):
+            success, message = compiler.safe_compile(settings, src, dst)
+            assert success is True
+            manifest.update(src, dst)
+            compiled.append(os.path.basename(src))
+
+    manifest.save()
+
+    return compiled
+
+
+def test_outdated(compiler, temp_builds_dir):
+    """
+    Only sources with a change in their closure, settings or outputs should
+    be outdated
+    """
+    basedir = temp_builds_dir.join("manifest_incremental_outdated").strpath
+    settings = build_structure(basedir)
+
+    sources = [
+        (
+            os.path.join(settings.SOURCES_PATH, name + ".scss"),
+            os.path.join(settings.TARGET_PATH, name + ".css"),
+        )
+        for name in ("main", "other")
+    ]
+
+    # First build compiles everything
+    assert compile_outdated(compiler, settings, sources) == [
+        "main.scss", "other.scss"
+    ]
+    assert os.path.exists(
+        os.path.join(settings.TARGET_PATH, BuildManifest.FILENAME)
+    )
+
+    # Nothing has changed
+    assert compile_outdated(compiler, settings, sources) == []
+
+    # Change on a library file included from a partial
+    with io.open(os.path.join(basedir, "lib/_mixins.scss"), "w") as f:
+        f.write("""/* Changed mixins */""")
+    assert compile_outdated(compiler, settings, sources) == ["main.scss"]
+
+    # Removed output
+    os.remove(os.path.join(settings.TARGET_PATH, "other.css"))
+    assert compile_outdated(compiler, settings, sources) == ["other.scss"]
+
+    # Changed setting
+    settings.update({"OUTPUT_STYLES": "expanded"})
+    assert compile_outdated(compiler, settings, sources) == [
+        "main.scss", "other.scss"
+    ]
+
+
+def test_unresolvable(compiler, temp_builds_dir):
+    """
+    Source with an unresolvable closure is allways outdated
+    """
+    basedir = temp_builds_dir.join("manifest_incremental_unresolvable").strpath
+    settings = build_structure(basedir)
+
+    src = os.path.join(settings.SOURCES_PATH, "main.scss")
+    dst = os.path.join(settings.TARGET_PATH, "main.css")
+
+    os.remove(os.path.join(basedir, "lib/_mixins.scss"))
+
+    manifest = BuildManifest(settings)
+    manifest.entries[src] = {"destination": dst, "closure": None}
+
+    assert manifest.closure_digest(src) is None
+    assert manifest.is_outdated(src, dst) is True
+
+
+def test_compressed(compiler, temp_builds_dir):
+    """
+    Enabling compression, changing its level or removing a compressed file
+    should make sources outdated and compressed files refreshed
+    """
+    basedir = temp_builds_dir.join("manifest_incremental_compressed").strpath
+    settings = build_structure(basedir)
+
+    sources = [
+        (
+            os.path.join(settings.SOURCES_PATH, name + ".scss"),
+            os.path.join(settings.TARGET_PATH, name + ".css"),
+        )
+        for name in ("main", "other")
+    ]
+    gzipped = os.path.join(settings.TARGET_PATH, "other.css.gz")
+
+    def compile_compressed():
+        manifest = BuildManifest(settings)
+        manifest.load()
+
+        compiled = []
+        for src, dst in sources:
+            if manifest.is_outdated(src, dst):
+                manifest.discard_compressed(src)
+                success, message = compiler.safe_compile(settings, src, dst)
+                assert success is True
+                manifest.update(src, dst)
+                compiled.append(os.path.basename(src))
+
+        manifest.save()
+
+        return compiled
+
+    assert compile_compressed() == ["main.scss", "other.scss"]
+    assert os.path.exists(gzipped) is False
+
+    # Enabled compression
+    settings.update({"COMPRESS": True})
+    assert compile_compressed() == ["main.scss", "other.scss"]
+    assert os.path.exists(gzipped) is True
+
+    assert compile_compressed() == []
+
+    # Removed compressed file
+    os.remove(gzipped)
+    assert compile_compressed() == ["other.scss"]
+    assert os.path.exists(gzipped) is True
+
+    # Changed compression level
+    settings.update({"COMPRESS_LEVEL": 1})
+    assert compile_compressed() == ["main.scss", "other.scss"]
+
+    with io.open(os.path.join(settings.TARGET_PATH, "other.css"), "rb") as f:
+        css = f.read()
+    with io.open(gzipped, "rb") as f:
+        assert f.read() == gzip_compress(css, 1)
+
+
+def test_atomic_save(compiler, temp_builds_dir, monkeypatch):
+    """
+    An interrupted save should keep the previous manifest file
+    """
+    basedir = temp_builds_dir.join("manifest_incremental_atomic").strpath
+    settings = build_structure(basedir)
+
+    src = os.path.join(settings.SOURCES_PATH, "other.scss")
+    dst = os.path.join(settings.TARGET_PATH, "other.css")
+
+    assert compile_outdated(compiler, settings, [(src, dst)]) == ["other.scss"]
+
+    def interrupted(*args):
+        raise OSError("Interrupted")
+
+    monkeypatch.setattr(cache_module.os, "replace", interrupted)
+
+    manifest = BuildManifest(settings)
+    manifest.load()
+    manifest.discard(src)
+    with pytest.raises(OSError):
+        manifest.save()
+
+    monkeypatch.undo()
+
+    manifest = BuildManifest(settings)
+    assert list(manifest.load().keys()) == [src]
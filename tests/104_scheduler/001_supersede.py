@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from boussole.compiler import SassCompileHelper
+from boussole.conf.model import Settings
+from boussole.finder import CONTENT_HASH
+from boussole.manifest import AssetManifest
+from boussole.scheduler import CompileScheduler
+
+
+class DummyCompiler(SassCompileHelper):
+    """
+    Compiler which does not compile anything and record writes. The first
+    compile waits until released.
+    """
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.compiled = []
+        self.written = []
+
+    def compile_content(self, settings, sourcepath, destination):
+        if not self.compiled:
+            self.compiled.append(sourcepath)
+            self.started.set()
+            self.release.wait(5)
+        else:
+            self.compiled.append(sourcepath)
+
+        return True, "{}#{}".format(sourcepath, len(self.compiled)), None
+
+    def write_outputs(self, destination, content, sourcemap=None,
+                      skip_unchanged=False, compress_level=None,
+                      compressed=None):
+        self.written.append((destination, content))
+        return True
+
+
+def test_supersede(caplog):
+    """
+    Only the latest requested compile of a source should be written, queued
+    compiles are cancelled and running ones are discarded
+    """
+    caplog.set_level(logging.INFO, logger="boussole")
+    executor = ThreadPoolExecutor(max_workers=1)
+    scheduler = CompileScheduler(Settings(), executor)
+    scheduler.compiler = DummyCompiler()
+
+    try:
+        # Running until released
+        scheduler.submit([("a.scss", "a.css")])
+        assert scheduler.compiler.started.wait(5)
+        # Queued behind it
+        scheduler.submit([("b.scss", "b.css"), ("a.scss", "a.css")])
+        # Cancel the queued compile of 'b'
+        scheduler.submit([("b.scss", "b.css")])
+
+        assert scheduler.generations == {"a.scss": 2, "b.scss": 2}
+
+        scheduler.compiler.release.set()
+        scheduler.wait()
+    finally:
+        executor.shutdown()
+
+    assert scheduler.compiler.compiled == ["a.scss", "a.scss", "b.scss"]
+    assert scheduler.compiler.written == [
+        ("a.css", "a.scss#2"),
+        ("b.css", "b.scss#3"),
+    ]
+    assert scheduler.superseded == 2
+
+    outputs = [
+        msg for name, level, msg in caplog.record_tuples
+        if msg.startswith("Output: ")
+    ]
+    assert outputs == ["Output: a.css", "Output: b.css"]
+
+
+def test_errors(caplog):
+    """
+    Compile errors should be logged and nothing written
+    """
+    class FailingCompiler(DummyCompiler):
+        def compile_content(self, settings, sourcepath, destination):
+            return False, "Invalid CSS", None
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    scheduler = CompileScheduler(Settings(), executor)
+    scheduler.compiler = FailingCompiler()
+
+    try:
+        scheduler.submit([("a.scss", "a.css")])
+        scheduler.wait()
+    finally:
+        executor.shutdown()
+
+    assert scheduler.compiler.written == []
+    assert ("boussole", 40, "Invalid CSS") in caplog.record_tuples
+
+
+def test_write_unlocked():
+    """
+    Compiles can be requested while outputs are written
+    """
+    class WritingCompiler(DummyCompiler):
+        def write_outputs(self, *args, **kwargs):
+            # Request another compile from another thread during write
+            if not self.written:
+                thread = threading.Thread(
+                    target=scheduler.submit,
+                    args=([("b.scss", "b.css")],)
+                )
+                thread.start()
+                thread.join(5)
+                self.requested = not thread.is_alive()
+
+            return super(WritingCompiler, self).write_outputs(*args, **kwargs)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    scheduler = CompileScheduler(Settings(), executor)
+    scheduler.compiler = WritingCompiler()
+    scheduler.compiler.release.set()
+
+    try:
+        scheduler.submit([("a.scss", "a.css")])
+        scheduler.wait()
+    finally:
+        executor.shutdown()
+
+    assert scheduler.compiler.requested is True
+    assert [dst for dst, content in scheduler.compiler.written] == [
+        "a.css", "b.css",
+    ]
+
+
+def test_content_hash(temp_builds_dir):
+    """
+    With content hash, outputs should be written to hashed filenames and
+    registered in the asset manifest
+    """
+    basedir = temp_builds_dir.join("scheduler_content_hash").strpath
+    os.makedirs(basedir)
+
+    settings = Settings(initial={
+        "SOURCES_PATH": basedir,
+        "TARGET_PATH": os.path.join(basedir, "css"),
+        "HASH_SUFFIX": CONTENT_HASH,
+    })
+    src = os.path.join(basedir, "app.scss")
+    with open(src, "w") as fp:
+        fp.write("#content{ color: red; }")
+
+    assets = AssetManifest(settings)
+    executor = ThreadPoolExecutor(max_workers=1)
+    scheduler = CompileScheduler(settings, executor, assets=assets)
+
+    try:
+        scheduler.submit([(src, os.path.join(basedir, "css", "app.css"))])
+        scheduler.wait()
+    finally:
+        executor.shutdown()
+
+    with open(assets.filepath) as fp:
+        paths = json.load(fp)
+
+    assert paths == assets.paths
+    assert paths["app.css"].startswith("app.")
+    assert paths["app.css"] != "app.css"
+    assert os.path.exists(os.path.join(basedir, "css", paths["app.css"]))
+    assert not os.path.exists(os.path.join(basedir, "css", "app.css"))
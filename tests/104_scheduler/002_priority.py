@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from boussole.scheduler import CompilePriority
+
+
+@pytest.mark.parametrize("patterns,touched,expected", [
+    # Alphabetical order by default
+    (
+        [],
+        [],
+        ["/src/a.scss", "/src/b.scss", "/src/pages/c.scss", "/src/pages/d.scss"],
+    ),
+    # Most recently touched first
+    (
+        [],
+        ["/src/b.scss", "/src/pages/d.scss"],
+        ["/src/pages/d.scss", "/src/b.scss", "/src/a.scss", "/src/pages/c.scss"],
+    ),
+    # Pinned first in patterns order, even before touched ones
+    (
+        ["pages/d.scss", "pages/*"],
+        ["/src/b.scss", "/src/pages/c.scss"],
+        ["/src/pages/d.scss", "/src/pages/c.scss", "/src/b.scss", "/src/a.scss"],
+    ),
+    # Touched order applies within pinned ones
+    (
+        ["pages/*"],
+        ["/src/pages/d.scss", "/src/pages/c.scss"],
+        ["/src/pages/c.scss", "/src/pages/d.scss", "/src/a.scss", "/src/b.scss"],
+    ),
+])
+def test_sort(patterns, touched, expected):
+    """
+    Entrypoints are ordered from pinned ones, then most recently touched ones,
+    then alphabetically
+    """
+    priority = CompilePriority(patterns=patterns, basedir="/src")
+
+    for path in touched:
+        priority.touch(path)
+
+    assert priority.sort([
+        "/src/pages/c.scss",
+        "/src/b.scss",
+        "/src/pages/d.scss",
+        "/src/a.scss",
+    ]) == expected
@@ -498,3 +498,244 @@ def test_success_hash(caplog, options, filename, dumper):
             "main.dummy-hash.css",
             "main.dummy-hash.map",
         ]
+
+
+@pytest.mark.parametrize("options", [
+    ["--jobs=1"],
+    ["--jobs=4"],
+])
+def test_jobs(caplog, options):
+    """
+    Testing compile with parallel jobs keeps logs in source order and return
+    an error exit code when a source has failed
+    """
+    runner = CliRunner()
+
+    # Temporary isolated current dir
+    with runner.isolated_filesystem():
+        test_cwd = os.getcwd()
+
+        # Write a minimal config file
+        with open(JSON_FILENAME, "w") as f:
+            f.write(json.dumps({
+                "SOURCES_PATH": ".",
+                "TARGET_PATH": "./css",
+                "OUTPUT_STYLES": "compact",
+            }, indent=4))
+
+        # Create needed dirs
+        os.makedirs(os.path.join(test_cwd, "css"))
+
+        # Write some sources where one is invalid
+        for name in ("a", "b", "c", "d"):
+            with open("{}.scss".format(name), "w") as f:
+                if name == "c":
+                    f.write("""#{}{{ color: red;""".format(name))
+                else:
+                    f.write("""#{}{{ color: red; }}""".format(name))
+
+        result = runner.invoke(cli_frontend, ["compile"] + options)
+
+        assert result.exit_code == 1
+        assert "Aborted!" in result.output
+
+        # Only messages from compile, ignore their content for errors
+        assert [
+            (level, msg if level == 20 else None)
+            for name, level, msg in caplog.record_tuples[1:]
+        ] == [
+            (20, "Output: {}/css/a.css".format(test_cwd)),
+            (20, "Output: {}/css/b.css".format(test_cwd)),
+            (40, None),
+            (20, "Output: {}/css/d.css".format(test_cwd)),
+        ]
+
+        results = os.listdir(os.path.join(test_cwd, "css"))
+        results.sort()
+        assert results == ["a.css", "b.css", "d.css"]
+
+
+@pytest.mark.parametrize("extra", [
+    [],
+    ["--inspect-workers=4"],
+])
+def test_incremental(caplog, monkeypatch, extra):
+    """
+    Testing incremental compile only build changed sources unless forced
+    """
+    runner = CliRunner()
+
+    # Temporary isolated current dir
+    with runner.isolated_filesystem():
+        test_cwd = os.getcwd()
+        monkeypatch.setenv("BOUSSOLE_CACHE_DIR", os.path.join(test_cwd, "cache"))
+
+        # Write a minimal config file
+        with open(JSON_FILENAME, "w") as f:
+            f.write(json.dumps({
+                "SOURCES_PATH": ".",
+                "TARGET_PATH": "./css",
+                "OUTPUT_STYLES": "compact",
+            }, indent=4))
+
+        # Create needed dirs
+        os.makedirs(os.path.join(test_cwd, "css"))
+
+        with open("main.scss", "w") as f:
+            f.write("""@import "vars";\n#main{ color: $color; }""")
+        with open("other.scss", "w") as f:
+            f.write("""#other{ color: red; }""")
+        with open("_vars.scss", "w") as f:
+            f.write("""$color: red;""")
+
+        def outputs(options):
+            caplog.clear()
+            result = runner.invoke(cli_frontend, ["compile"] + options)
+            assert result.exit_code == 0
+            return [
+                msg for name, level, msg in caplog.record_tuples
+                if msg.startswith("Output: ")
+            ]
+
+        options = ["--incremental", "--jobs=1"] + extra
+
+        assert outputs(options) == [
+            "Output: {}/css/main.css".format(test_cwd),
+            "Output: {}/css/other.css".format(test_cwd),
+        ]
+
+        assert outputs(options) == []
+
+        with open("_vars.scss", "w") as f:
+            f.write("""$color: blue;""")
+
+        assert outputs(options) == [
+            "Output: {}/css/main.css".format(test_cwd),
+        ]
+
+        assert outputs(options + ["--force"]) == [
+            "Output: {}/css/main.css".format(test_cwd),
+            "Output: {}/css/other.css".format(test_cwd),
+        ]
+
+        # Forcing implies an incremental build which writes its manifest
+        os.remove(os.path.join(test_cwd, "css", ".boussole-manifest.json"))
+        assert outputs(["--force", "--jobs=1"] + extra) == [
+            "Output: {}/css/main.css".format(test_cwd),
+            "Output: {}/css/other.css".format(test_cwd),
+        ]
+        assert outputs(options) == []
+
+
+def test_cache(caplog, monkeypatch):
+    """
+    Testing compile cache is used for sources already compiled, even from
+    another project
+    """
+    runner = CliRunner()
+
+    # Temporary isolated current dir
+    with runner.isolated_filesystem():
+        test_cwd = os.getcwd()
+        monkeypatch.setenv("BOUSSOLE_CACHE_DIR", os.path.join(test_cwd, "cache"))
+
+        for name in ("first", "second"):
+            os.makedirs(os.path.join(test_cwd, name, "css"))
+
+            with open(os.path.join(name, JSON_FILENAME), "w") as f:
+                f.write(json.dumps({
+                    "SOURCES_PATH": ".",
+                    "TARGET_PATH": "./css",
+                    "OUTPUT_STYLES": "compact",
+                }, indent=4))
+
+            with open(os.path.join(name, "main.scss"), "w") as f:
+                f.write("""@import "vars";\n#main{ color: $color; }""")
+            with open(os.path.join(name, "_vars.scss"), "w") as f:
+                f.write("""$color: red;""")
+
+        def counters(name):
+            caplog.clear()
+            os.chdir(os.path.join(test_cwd, name))
+            try:
+                result = runner.invoke(cli_frontend, [
+                    "-v", "5", "compile", "--cache", "--jobs=1"
+                ])
+            finally:
+                os.chdir(test_cwd)
+            assert result.exit_code == 0
+            return [
+                msg for name, level, msg in caplog.record_tuples
+                if msg.startswith("Compile cache: ") and "hits" in msg
+            ]
+
+        assert counters("first") == ["Compile cache: 0 hits, 1 misses"]
+        assert counters("second") == ["Compile cache: 1 hits, 0 misses"]
+
+        with open(os.path.join(test_cwd, "second", "css", "main.css")) as f:
+            assert f.read() == "#main { color: red; }\n"
+
+
+def test_content_hash(caplog, monkeypatch):
+    """
+    Testing content hash keeps filenames of unchanged stylesheets and
+    publishes them in asset manifest
+    """
+    runner = CliRunner()
+
+    # Temporary isolated current dir
+    with runner.isolated_filesystem():
+        test_cwd = os.getcwd()
+        monkeypatch.setenv("BOUSSOLE_CACHE_DIR", os.path.join(test_cwd, "cache"))
+
+        # Write a minimal config file
+        with open(JSON_FILENAME, "w") as f:
+            f.write(json.dumps({
+                "SOURCES_PATH": ".",
+                "TARGET_PATH": "./css",
+                "OUTPUT_STYLES": "compact",
+                "SOURCE_MAP": True,
+                "HASH_SUFFIX": ":content",
+            }, indent=4))
+
+        # Create needed dirs
+        os.makedirs(os.path.join(test_cwd, "css"))
+
+        with open("main.scss", "w") as f:
+            f.write("""#main{ color: red; }""")
+        with open("other.scss", "w") as f:
+            f.write("""#other{ color: red; }""")
+
+        def build(options=[]):
+            caplog.clear()
+            result = runner.invoke(cli_frontend, ["compile"] + options)
+            assert result.exit_code == 0
+            with open(os.path.join("css", "manifest.json")) as f:
+                return json.load(f), [
+                    msg for name, level, msg in caplog.record_tuples
+                    if msg.startswith("Output: ")
+                ]
+
+        assets, outputs = build()
+        assert sorted(assets.keys()) == [
+            "main.css", "main.map", "other.css", "other.map"
+        ]
+        assert outputs == [
+            "Output: {}/css/{}".format(test_cwd, assets["main.css"]),
+            "Output: {}/css/{}".format(test_cwd, assets["other.css"]),
+        ]
+        assert assets["main.css"][:-4] == assets["main.map"][:-4]
+
+        # Same content gives the same filenames
+        assert build()[0] == assets
+
+        with open("main.scss", "w") as f:
+            f.write("""#main{ color: blue; }""")
+        os.remove("other.scss")
+
+        new_assets, outputs = build(["--incremental"])
+        assert sorted(new_assets.keys()) == ["main.css", "main.map"]
+        assert new_assets["main.css"] != assets["main.css"]
+
+        # Hashed outputs are checked by incremental build
+        assert build(["--incremental"]) == (new_assets, [])
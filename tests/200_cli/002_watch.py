@@ -5,3 +5,32 @@ Watch commandline is not tested because of some limitations with
 won't be able to send interrupt with "CTRL+C" to stop watching at the end of
 tests.
 """
+import click
+import pytest
+
+from boussole.cli.watch import parse_duration
+
+
+@pytest.mark.parametrize("value,expected", [
+    (None, 0),
+    ("0", 0),
+    ("150", 0.15),
+    ("150ms", 0.15),
+    (" 150MS ", 0.15),
+    ("0.5s", 0.5),
+    ("2s", 2),
+])
+def test_parse_duration(value, expected):
+    """
+    Duration is converted to seconds
+    """
+    assert parse_duration(None, None, value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", ["foo", "ms", "-10ms"])
+def test_parse_duration_error(value):
+    """
+    Invalid duration raises a click error
+    """
+    with pytest.raises(click.BadParameter):
+        parse_duration(None, None, value)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import os
+
+from click.testing import CliRunner
+
+from boussole.cache import CompileCache
+from boussole.cli.console_script import cli_frontend
+
+
+def test_stats(caplog, monkeypatch):
+    """
+    Testing compile cache statistics and clear
+    """
+    runner = CliRunner()
+
+    # Temporary isolated current dir
+    with runner.isolated_filesystem():
+        test_cwd = os.getcwd()
+        monkeypatch.setenv("BOUSSOLE_CACHE_DIR", os.path.join(test_cwd, "cache"))
+
+        cache = CompileCache()
+        cache.set("aa01", "#main { color: red; }")
+        assert cache.get("aa01") is not None
+        assert cache.get("bb02") is None
+        assert cache.get("cc03") is None
+        cache.save()
+
+        result = runner.invoke(cli_frontend, ["cache"])
+        assert result.exit_code == 0
+
+        messages = [msg for name, level, msg in caplog.record_tuples]
+        assert "Entries: 1" in messages
+        assert "Hits: 1" in messages
+        assert "Misses: 2" in messages
+        assert "Hit rate: 33.3%" in messages
+
+        result = runner.invoke(cli_frontend, ["cache", "--clear"])
+        assert result.exit_code == 0
+        assert cache.stats()["entries"] == 0
+        assert not os.path.exists(os.path.join(test_cwd, "cache", "compile"))
@@ -135,6 +135,10 @@ def sample_project_settings():
         "SOURCE_COMMENTS": False,
         "SOURCE_MAP": False,
         "EXCLUDES": [],
+        "SKIP_UNCHANGED": False,
+        "COMPRESS": False,
+        "COMPRESS_LEVEL": 9,
+        "JOBS": None,
     }
 
 
@@ -166,4 +170,8 @@ def custom_project_settings():
             "main_twins_*.scss",
             "*/twin_*.scss"
         ],
+        "SKIP_UNCHANGED": False,
+        "COMPRESS": False,
+        "COMPRESS_LEVEL": 9,
+        "JOBS": None,
     }